@@ -0,0 +1,177 @@
+"""Tests for core/blob_store.py — workspace-level content-addressed blobs."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from vlm_ocr_doc_reader.core.blob_store import BlobStore
+from vlm_ocr_doc_reader.core.reader import DocumentReader
+from vlm_ocr_doc_reader.core.state import StateManager, WorkspaceBackend, WorkspaceStorage
+from vlm_ocr_doc_reader.core.vlm_agent import VLMAgent
+from vlm_ocr_doc_reader.schemas.common import PageInfo
+
+from .test_reader import FakeScanClient
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"cover-sheet" * 20
+
+
+def _workspace(tmp_path, name: str, content: bytes) -> WorkspaceStorage:
+    pdf = tmp_path / name
+    pdf.write_bytes(content)
+    ws = WorkspaceStorage.from_pdf(pdf, tmp_path / "ws")
+    ws.ensure_initialized()
+    return ws
+
+
+def _objects(tmp_path):
+    return sorted(p for p in (tmp_path / "ws" / "blobs" / "objects").rglob("*") if p.is_file())
+
+
+class TestBlobStore:
+    def test_put_dedups_by_content(self, tmp_path):
+        store = BlobStore(tmp_path)
+        d1 = store.put(PNG)
+        d2 = store.put(PNG)
+
+        assert d1 == d2 == BlobStore.digest(PNG)
+        assert store.get(d1) == PNG
+        assert store.exists(d1)
+        assert (store.stores, store.hits) == (1, 1)
+        assert store.get("0" * 64) is None
+
+    def test_memo_roundtrip(self, tmp_path):
+        store = BlobStore(tmp_path)
+        key = BlobStore.digest(b"request")
+        assert store.get_memo(key) is None
+        store.put_memo(key, {"text": "ответ"})
+        assert store.get_memo(key) == {"text": "ответ"}
+
+    def test_rejects_non_hex_keys(self, tmp_path):
+        store = BlobStore(tmp_path)
+        with pytest.raises(ValueError):
+            store.get("../../etc/passwd")
+
+
+class TestWorkspaceBlobs:
+    def test_duplicate_pages_stored_once(self, tmp_path):
+        ws_a = _workspace(tmp_path, "a.pdf", b"%PDF-1.4 a")
+        ws_b = _workspace(tmp_path, "b.pdf", b"%PDF-1.4 b")
+        a = WorkspaceBackend(ws_a, blobs="pages")
+        b = WorkspaceBackend(ws_b, blobs="pages")
+
+        a.save("pages/page_001", PNG)
+        b.save("pages/page_001", PNG)
+        b.save("pages/page_002", b"other")
+
+        assert len(_objects(tmp_path)) == 2
+        assert a.load("pages/page_001") == PNG
+        assert b.load("pages/page_002") == b"other"
+        assert b.exists("pages/page_002") and not b.exists("pages/page_003")
+        assert not list(ws_a.paths.pages_dir.glob("*.png"))
+        refs = (ws_b.paths.document_dir / "blob_refs.jsonl").read_text().splitlines()
+        assert [json.loads(line)["key"] for line in refs] == ["pages/page_001", "pages/page_002"]
+
+    def test_refs_written_by_another_backend_become_visible(self, tmp_path):
+        ws = _workspace(tmp_path, "a.pdf", b"%PDF-1.4 a")
+        first = WorkspaceBackend(ws, blobs="pages")
+        second = WorkspaceBackend(ws, blobs="pages")
+        first.save("pages/page_001", PNG)
+        assert second.load("pages/page_001") == PNG  # refs loaded here
+
+        first.save("pages/page_002", b"later")
+        first.save("pages/page_001", b"re-rendered")
+        assert second.exists("pages/page_002")
+        assert second.load("pages/page_002") == b"later"
+        assert second.load("pages/page_001") == b"re-rendered"
+
+    def test_all_mode_stores_vlm_responses(self, tmp_path):
+        ws = _workspace(tmp_path, "a.pdf", b"%PDF-1.4 a")
+        backend = WorkspaceBackend(ws, blobs="all")
+        backend.save("vlm_responses/scan_1", {"text": "x"})
+
+        assert backend.load("vlm_responses/scan_1") == {"text": "x"}
+        assert not list((ws.paths.document_dir / "vlm_responses").glob("*"))
+
+    def test_refs_honoured_when_blobs_off(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("WORKSPACE_BLOBS", raising=False)
+        ws = _workspace(tmp_path, "a.pdf", b"%PDF-1.4 a")
+        WorkspaceBackend(ws, blobs="pages").save("pages/page_001", PNG)
+
+        reopened = WorkspaceBackend(ws)
+        assert reopened.load("pages/page_001") == PNG
+        reopened.save("pages/page_001", b"re-rendered")
+        assert WorkspaceBackend(ws).load("pages/page_001") == b"re-rendered"
+
+    def test_scan_reuses_memo_across_documents(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("VLM_SCAN_BATCH_SIZE", "2")
+        client = FakeScanClient()
+        readers = []
+        for name in ("a.pdf", "b.pdf"):
+            ws = _workspace(tmp_path, name, f"%PDF-1.4 {name}".encode())
+            sm = StateManager(WorkspaceBackend(ws, blobs="pages"))
+            pages = [PageInfo(index=i, image=PNG + bytes([i])) for i in (1, 2)]
+            for p in pages:
+                sm.save_page(p.index, p.image)
+            processor = SimpleNamespace(
+                pages=pages,
+                num_pages=2,
+                vlm_agent=VLMAgent(client),
+                ocr_tool=None,
+                ensure_pages=lambda page_nums: None,
+            )
+            readers.append(
+                DocumentReader(pdf_path=name, workspace=None, state_manager=sm, processor=processor)
+            )
+
+        for reader in readers:
+            reader.scan()
+
+        assert len(client.calls) == 1
+        first, second = (r.get_document_data() for r in readers)
+        assert second.text == first.text == "page 1 page 2"
+        assert len(readers[1].pending_entities()) == 2
+
+    def test_scan_memo_ignores_page_marker(self, tmp_path, monkeypatch):
+        """One page image stamped at two page numbers in two documents hits the memo."""
+        import fitz
+
+        from vlm_ocr_doc_reader.preprocessing.renderer import PDFRenderer, RenderConfig
+
+        monkeypatch.setenv("VLM_SCAN_BATCH_SIZE", "1")
+        client = FakeScanClient()
+        readers = []
+        for name, texts in (("a.pdf", ["shared"]), ("b.pdf", ["intro", "terms", "shared"])):
+            pdf = tmp_path / name
+            doc = fitz.open()
+            for text in texts:
+                doc.new_page(width=300, height=300).insert_text((60, 150), text, fontsize=20)
+            doc.save(pdf)
+            doc.close()
+            ws = WorkspaceStorage.from_pdf(pdf, tmp_path / "ws")
+            ws.ensure_initialized()
+            sm = StateManager(WorkspaceBackend(ws, blobs="pages"))
+            rendered = PDFRenderer(RenderConfig(dpi=72)).render_pdf(pdf)
+            pages = [PageInfo(index=n, image=img) for n, img in rendered]
+            for p in pages:
+                sm.save_page(p.index, p.image)
+            processor = SimpleNamespace(
+                pages=pages,
+                num_pages=len(pages),
+                vlm_agent=VLMAgent(client),
+                ocr_tool=None,
+                ensure_pages=lambda page_nums: None,
+            )
+            readers.append(
+                DocumentReader(pdf_path=name, workspace=None, state_manager=sm, processor=processor)
+            )
+
+        for reader in readers:
+            reader.scan()
+
+        assert len(client.calls) == 3  # b.pdf page 3 reuses a.pdf page 1
+        assert readers[1].last_scan_stats[2]["cached"] is True
+        data = readers[1].get_document_data()
+        assert [h["page"] for h in data.structure["headers"]] == [1, 2, 3]
+        assert sorted(e.page_num for e in readers[1].pending_entities()) == [1, 2, 3]
+
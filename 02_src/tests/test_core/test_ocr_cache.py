@@ -0,0 +1,36 @@
+"""Tests for core/ocr_cache.py — disk-backed LRU cache of OCR responses."""
+
+from vlm_ocr_doc_reader.core.ocr_cache import OCRResponseCache
+
+RESULTS = [{"status": "ok", "value": "42", "context": "ctx", "explanation": "ок"}]
+
+
+class TestOCRResponseCache:
+    def test_miss_then_hit(self, tmp_path):
+        cache = OCRResponseCache(tmp_path, max_bytes=1 << 20)
+        assert cache.get("k") is None
+        cache.put("k", RESULTS)
+        assert cache.get("k") == RESULTS
+        assert cache.stats() == {"hits": 1, "misses": 1, "stores": 1, "evictions": 0}
+
+    def test_persists_across_instances(self, tmp_path):
+        OCRResponseCache(tmp_path, max_bytes=1 << 20).put("k", RESULTS)
+        assert OCRResponseCache(tmp_path, max_bytes=1 << 20).get("k") == RESULTS
+
+    def test_lru_eviction_by_size(self, tmp_path):
+        cache = OCRResponseCache(tmp_path, max_bytes=1 << 20)
+        cache.put("probe", RESULTS)
+        entry_size = cache._conn.execute("SELECT size FROM entries").fetchone()[0]
+        cache.close()
+
+        cache = OCRResponseCache(tmp_path / "lru", max_bytes=2 * entry_size)
+        cache.put("a", RESULTS)
+        cache.put("b", RESULTS)
+        cache.get("a")  # b becomes least recently used
+        cache.put("c", RESULTS)
+
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == RESULTS
+        assert cache.get("c") == RESULTS
+        assert cache.stats()["evictions"] == 1
@@ -0,0 +1,187 @@
+"""Tests for core/ocr_chunking.py — adaptive OCR chunk sizing."""
+
+import json
+from types import SimpleNamespace
+from typing import List
+
+from vlm_ocr_doc_reader.core.ocr_chunking import TUNING_FILENAME, AdaptiveChunker
+from vlm_ocr_doc_reader.core.ocr_client import QwenClientError
+from vlm_ocr_doc_reader.core.retry import CircuitBreaker, CircuitOpenError
+from vlm_ocr_doc_reader.core.state import OCRRegistryEntry
+
+from .test_reader import FakeOCRClient, FakeScanClient, _make_reader
+
+SHORT = ["ИНН"] * 12
+
+
+class TestAdaptiveChunker:
+    def test_grows_on_clean_full_chunks(self):
+        chunker = AdaptiveChunker(initial_size=3, max_size=5)
+        for _ in range(4):
+            chunker.observe(SHORT[:chunker.chunk_size(SHORT)], latency_s=1.0, missing=0)
+        assert chunker.chunk_size(SHORT) == 5
+
+    def test_shrinks_on_missing_blocks_and_slow_calls(self):
+        chunker = AdaptiveChunker(initial_size=8)
+        chunker.observe(SHORT[:8], latency_s=1.0, missing=2)
+        assert chunker.chunk_size(SHORT) == 5
+        chunker.observe(SHORT[:5], latency_s=120.0, missing=0)
+        assert chunker.chunk_size(SHORT) == 4
+
+    def test_prompt_token_budget_caps_size(self):
+        chunker = AdaptiveChunker(initial_size=10, max_prompt_tokens=300)
+        long_prompts = ["x" * 300] * 10  # ~100 tokens each
+        assert chunker.chunk_size(long_prompts) == 3
+        assert chunker.chunk_size(SHORT) == 10
+
+    def test_split_is_balanced(self):
+        chunker = AdaptiveChunker(initial_size=5)
+        chunks = chunker.split(list(range(12)), SHORT)
+        assert [len(c) for c in chunks] == [4, 4, 4]
+        assert [x for c in chunks for x in c] == list(range(12))
+
+    def test_state_persists(self, tmp_path):
+        path = tmp_path / TUNING_FILENAME
+        chunker = AdaptiveChunker(model="m", initial_size=8, path=path)
+        chunker.observe(SHORT[:8], latency_s=1.0, missing=4)
+        chunker.save()
+
+        assert json.loads(path.read_text())["buckets"]["m|short"]["missing"] == 4
+        assert AdaptiveChunker(model="m", initial_size=8, path=path).chunk_size(SHORT) == 5
+        assert AdaptiveChunker(model="other", initial_size=8, path=path).chunk_size(SHORT) == 8
+
+
+class DroppingOCRClient(FakeOCRClient):
+    """Loses every task after the third one in a request (like a dense page)."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.chunk_sizes: List[int] = []
+
+    def extract_batch(self, image, prompts, page_num, use_cache=True):
+        self.chunk_sizes.append(len(prompts))
+        results = super().extract_batch(image, prompts, page_num, use_cache)
+        for res in results[3:]:
+            res.update(status="error", value="")
+        return results
+
+
+class FailingOCRClient(FakeOCRClient):
+    """Times out on every request with more than two tasks."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.chunk_sizes: List[int] = []
+
+    def extract_batch(self, image, prompts, page_num, use_cache=True):
+        self.chunk_sizes.append(len(prompts))
+        if len(prompts) > 2:
+            raise TimeoutError("read timed out")
+        return super().extract_batch(image, prompts, page_num, use_cache)
+
+
+class CachedOCRClient(FakeOCRClient):
+    """Serves every request from a (fast) response cache."""
+
+    def extract_batch(self, image, prompts, page_num, use_cache=True):
+        return [{**r, "cached": True} for r in super().extract_batch(image, prompts, page_num)]
+
+
+class BreakerOCRClient(FakeOCRClient):
+    """Fails fast on every request: the shared circuit breaker is open."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.circuit = CircuitBreaker(failure_threshold=1, reset_timeout_s=60)
+        self.circuit.record_failure()
+
+    def extract_batch(self, image, prompts, page_num, use_cache=True):
+        try:
+            self.circuit.before_request()
+        except CircuitOpenError as exc:
+            raise QwenClientError(f"Qwen request failed: {exc}") from exc
+        return super().extract_batch(image, prompts, page_num, use_cache)
+
+
+def _adaptive_reader(monkeypatch, tmp_path, pages: int, per_page: int):
+    monkeypatch.setenv("OCR_CHUNK_SIZE", "auto")
+    reader = _make_reader(pages, FakeScanClient())
+    reader._workspace = tmp_path
+    reader._state_manager.upsert_ocr_entries(
+        [
+            OCRRegistryEntry(page_num=p, entity_id=f"p{p}e{i}", prompt=f"поле {i}")
+            for p in range(1, pages + 1)
+            for i in range(per_page)
+        ]
+    )
+    return reader
+
+
+class TestResolveAdaptive:
+    def test_resolve_learns_chunk_size(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("OCR_CHUNK_SIZE", "auto")
+        reader = _make_reader(4, FakeScanClient())
+        reader._workspace = tmp_path
+        reader._state_manager.upsert_ocr_entries(
+            [
+                OCRRegistryEntry(page_num=p, entity_id=f"p{p}e{i}", prompt=f"поле {i}")
+                for p in range(1, 5)
+                for i in range(12)
+            ]
+        )
+        client = DroppingOCRClient()
+        reader._processor.ocr_tool = SimpleNamespace(ocr_client=client)
+
+        reader.resolve(max_workers=1)
+
+        # Page 1 is split by the default size, later pages by the learned one
+        assert client.chunk_sizes[:3] == [4, 4, 4]
+        assert max(client.chunk_sizes[3:]) <= 3
+        assert len(reader.pending_entities()) == 3
+        saved = json.loads((tmp_path / TUNING_FILENAME).read_text())["buckets"]
+        assert all(b["size"] < 5 for b in saved.values())
+
+    def test_explicit_chunk_size_stays_fixed(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("OCR_CHUNK_SIZE", "auto")
+        reader = _make_reader(1, FakeScanClient())
+        reader._workspace = tmp_path
+        reader._state_manager.upsert_ocr_entries(
+            [OCRRegistryEntry(page_num=1, entity_id=f"e{i}", prompt="поле") for i in range(6)]
+        )
+        client = DroppingOCRClient()
+        reader._processor.ocr_tool = SimpleNamespace(ocr_client=client)
+
+        reader.resolve(chunk_size=2, max_workers=1)
+
+        assert client.chunk_sizes == [2, 2, 2]
+        assert not (tmp_path / TUNING_FILENAME).exists()
+
+    def test_failed_calls_shrink_chunk_size(self, monkeypatch, tmp_path):
+        reader = _adaptive_reader(monkeypatch, tmp_path, pages=4, per_page=6)
+        client = FailingOCRClient()
+        reader._processor.ocr_tool = SimpleNamespace(ocr_client=client)
+
+        reader.resolve(max_workers=1)
+
+        assert client.chunk_sizes[:2] == [3, 3]
+        assert max(client.chunk_sizes[2:5]) <= 2  # page 2 uses the shrunk size
+        saved = json.loads((tmp_path / TUNING_FILENAME).read_text())["buckets"]
+        assert all(b["missing"] >= 6 for b in saved.values())
+
+    def test_cache_hits_are_not_observed(self, monkeypatch, tmp_path):
+        reader = _adaptive_reader(monkeypatch, tmp_path, pages=2, per_page=10)
+        reader._processor.ocr_tool = SimpleNamespace(ocr_client=CachedOCRClient())
+
+        reader.resolve(max_workers=1)
+
+        saved = json.loads((tmp_path / TUNING_FILENAME).read_text())["buckets"]
+        assert all(b["calls"] == 0 and b["size"] == 5 for b in saved.values())
+
+    def test_open_circuit_is_not_observed(self, monkeypatch, tmp_path):
+        reader = _adaptive_reader(monkeypatch, tmp_path, pages=2, per_page=10)
+        reader._processor.ocr_tool = SimpleNamespace(ocr_client=BreakerOCRClient())
+
+        reader.resolve(max_workers=1)
+
+        saved = json.loads((tmp_path / TUNING_FILENAME).read_text())["buckets"]
+        assert all(b["calls"] == 0 and b["size"] == 5 for b in saved.values())
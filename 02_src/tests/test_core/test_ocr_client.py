@@ -68,6 +68,12 @@ class TestOCRConfig:
         assert config.max_retries == 3
         assert config.backoff_base == 1.5
 
+    def test_config_image_encoding_from_env(self, monkeypatch):
+        """OCR_IMAGE_* env selects the OCR payload encoding."""
+        monkeypatch.setenv("OCR_IMAGE_FORMAT", "webp")
+        config = OCRConfig(api_key="k")
+        assert config.image_encoding.mime == "image/webp"
+
     def test_config_from_env(self, monkeypatch):
         """Test config loads API key from environment (DASHSCOPE first, QWEN fallback)."""
         monkeypatch.delenv("DASHSCOPE_API_KEY", raising=False)
@@ -109,6 +115,144 @@ class TestQwenOCRClient:
         except Exception:
             pytest.fail("Invalid base64 string")
 
+    def test_payload_default_png(self, qwen_client, sample_image):
+        """Without an encoding the stored PNG is sent as image/png."""
+        b64, mime = qwen_client._encode_image(sample_image)
+        payload = qwen_client._build_payload(b64, ["q"], 1, mime=mime)
+        url = payload["messages"][1]["content"][0]["image_url"]["url"]
+        assert url.startswith("data:image/png;base64,")
+
+    def test_payload_jpeg_encoding(self, sample_image):
+        """Configured JPEG encoding changes bytes and data-URL MIME type."""
+        from vlm_ocr_doc_reader.preprocessing.encoding import ImageEncoding
+
+        client = QwenOCRClient(
+            OCRConfig(api_key="k", image_encoding=ImageEncoding(format="JPEG", quality=60))
+        )
+        b64, mime = client._encode_image(sample_image)
+        payload = client._build_payload(b64, ["q"], 1, mime=mime)
+        url = payload["messages"][1]["content"][0]["image_url"]["url"]
+        assert url.startswith("data:image/jpeg;base64,")
+        import base64
+        assert base64.b64decode(b64)[:3] == b"\xff\xd8\xff"
+
+    def test_png_passed_through_untouched(self, qwen_client, sample_image):
+        """Stored PNG bytes are base64-encoded as is, without a PIL round trip."""
+        import base64
+        b64, mime = qwen_client._encode_image(sample_image)
+        assert base64.b64decode(b64) == sample_image
+        assert mime == "image/png"
+
+    def test_encoded_image_cached_by_hash(self, qwen_client, sample_image):
+        """Equal page bytes are encoded once, even from several threads."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        with patch(
+            "vlm_ocr_doc_reader.core.ocr_client.encode_image",
+            side_effect=lambda img, enc: (img, "image/png"),
+        ) as spy:
+            first = qwen_client._encode_image(sample_image)
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                results = list(
+                    pool.map(qwen_client._encode_image, [bytes(sample_image)] * 8)
+                )
+        assert spy.call_count == 1
+        assert all(r == first for r in results)
+
+    def test_encoded_cache_is_bounded(self, sample_image):
+        """Least recently used pages are evicted past encoded_cache_size."""
+        client = QwenOCRClient(OCRConfig(api_key="k", encoded_cache_size=2))
+        images = [sample_image + bytes([i]) for i in range(3)]
+        for img in images:
+            client._encode_image(img)
+        assert len(client._encoded) == 2
+        with patch("vlm_ocr_doc_reader.core.ocr_client.encode_image") as spy:
+            spy.return_value = (images[0], "image/png")
+            client._encode_image(images[0])
+        assert spy.call_count == 1
+
+    def test_response_cache_hit_skips_request(self, tmp_path, sample_image):
+        """A repeated (image, prompts) call is served from the disk cache."""
+        client = QwenOCRClient(OCRConfig(api_key="k", cache_dir=tmp_path, repair_retries=0))
+        ok = Mock(status_code=200)
+        ok.json.return_value = {
+            "choices": [{"message": {"content": "[ЗАДАЧА 1]\nЗНАЧЕНИЕ: 7\nКОНТЕКСТ: c\nПОЯСНЕНИЕ: e"}}]
+        }
+        with patch(
+            "vlm_ocr_doc_reader.core.transport.HTTPTransport.post", return_value=ok
+        ) as mock_post:
+            first = client.extract_batch(sample_image, ["q"], 1)
+            second = client.extract_batch(sample_image, ["q"], 1)
+            other_chunk = client.extract_batch(sample_image, ["q", "q2"], 1)
+            bypass = client.extract_batch(sample_image, ["q"], 1, use_cache=False)
+
+        assert first == bypass
+        assert second == [{**r, "cached": True} for r in first]
+        assert other_chunk[0]["value"] == "7"
+        # second is a hit; other chunk composition and bypass go to the API
+        assert mock_post.call_count == 3
+        assert client.cache.stats()["hits"] == 1
+
+    def test_response_cache_skips_error_results(self, tmp_path, sample_image):
+        """Responses with missing task blocks are not cached."""
+        client = QwenOCRClient(OCRConfig(api_key="k", cache_dir=tmp_path, repair_retries=0))
+        partial = Mock(status_code=200)
+        partial.json.return_value = {
+            "choices": [{"message": {"content": "[ЗАДАЧА 1]\nЗНАЧЕНИЕ: 7"}}]
+        }
+        with patch(
+            "vlm_ocr_doc_reader.core.transport.HTTPTransport.post", return_value=partial
+        ) as mock_post:
+            client.extract_batch(sample_image, ["a", "b"], 1)
+            client.extract_batch(sample_image, ["a", "b"], 1)
+        assert mock_post.call_count == 2
+        assert len(client.cache) == 0
+
+    def test_missing_blocks_are_re_asked(self, sample_image):
+        """Only tasks without a [ЗАДАЧА N] block go into the follow-up request."""
+        client = QwenOCRClient(OCRConfig(api_key="k", repair_retries=2))
+        partial = Mock(status_code=200)
+        partial.json.return_value = {
+            "choices": [{"message": {"content": "[ЗАДАЧА 1]\nЗНАЧЕНИЕ: 7\n\n[ЗАДАЧА 3]\nЗНАЧЕНИЕ: 9"}}]
+        }
+        repair = Mock(status_code=200)
+        repair.json.return_value = {
+            "choices": [{"message": {"content": "[ЗАДАЧА 1]\nЗНАЧЕНИЕ: 8"}}]
+        }
+        with patch(
+            "vlm_ocr_doc_reader.core.transport.HTTPTransport.post",
+            side_effect=[partial, repair],
+        ) as mock_post:
+            results = client.extract_batch(sample_image, ["a", "b", "c"], 1)
+
+        assert [r["value"] for r in results] == ["7", "8", "9"]
+        assert mock_post.call_count == 2
+        repair_text = mock_post.call_args.kwargs["json"]["messages"][1]["content"][1]["text"]
+        assert "1. b" in repair_text
+        assert "1. a" not in repair_text and "2." not in repair_text
+
+    def test_repair_budget_is_bounded(self, sample_image, monkeypatch):
+        monkeypatch.setenv("OCR_REPAIR_RETRIES", "1")
+        client = QwenOCRClient(OCRConfig(api_key="k"))
+        partial = Mock(status_code=200)
+        partial.json.return_value = {
+            "choices": [{"message": {"content": "[ЗАДАЧА 1]\nЗНАЧЕНИЕ: 7"}}]
+        }
+        empty = Mock(status_code=200)
+        empty.json.return_value = {"choices": [{"message": {"content": "[ЗАДАЧА 5]"}}]}
+        with patch(
+            "vlm_ocr_doc_reader.core.transport.HTTPTransport.post",
+            side_effect=[partial, empty, empty],
+        ) as mock_post:
+            results = client.extract_batch(sample_image, ["a", "b", "c"], 1)
+
+        assert [r["status"] for r in results] == ["ok", "error", "error"]
+        assert mock_post.call_count == 2
+
+    def test_response_cache_disabled_by_default(self, qwen_client, monkeypatch):
+        monkeypatch.delenv("OCR_CACHE_DIR", raising=False)
+        assert QwenOCRClient(OCRConfig(api_key="k")).cache is None
+
     def test_parse_qwen_response_success(self):
         """Test parsing successful Qwen response."""
         response_text = """
@@ -144,7 +288,7 @@ class TestQwenOCRClient:
         assert result["value"] == "1234567890123"
         assert "fallback" in result["explanation"]
 
-    @patch("vlm_ocr_doc_reader.core.ocr_client.requests.post")
+    @patch("vlm_ocr_doc_reader.core.transport.HTTPTransport.post")
     def test_extract_success(self, mock_post, qwen_client, sample_image):
         """Test successful extraction."""
         # Mock successful API response
@@ -199,7 +343,7 @@ class TestQwenOCRClient:
         real_resp.headers["Content-Type"] = "application/json"  # no charset
 
         with patch(
-            "vlm_ocr_doc_reader.core.ocr_client.requests.post",
+            "vlm_ocr_doc_reader.core.transport.HTTPTransport.post",
             return_value=real_resp,
         ):
             result = qwen_client.extract(sample_image, "найди банк", 1)
@@ -209,7 +353,7 @@ class TestQwenOCRClient:
         assert "�" not in result["value"]
         assert "�" not in (result.get("context") or "")
 
-    @patch("vlm_ocr_doc_reader.core.ocr_client.requests.post")
+    @patch("vlm_ocr_doc_reader.core.transport.HTTPTransport.post")
     def test_extract_retry_on_429(self, mock_post, qwen_client, sample_image):
         """Test retry logic on rate limit (429)."""
         # First call returns 429, second succeeds
@@ -236,7 +380,7 @@ class TestQwenOCRClient:
         assert result["status"] == "ok"
         assert mock_post.call_count == 2
 
-    @patch("vlm_ocr_doc_reader.core.ocr_client.requests.post")
+    @patch("vlm_ocr_doc_reader.core.transport.HTTPTransport.post")
     def test_extract_retry_on_500(self, mock_post, qwen_client, sample_image):
         """Test retry logic on server error (500)."""
         mock_response_500 = Mock()
@@ -262,7 +406,7 @@ class TestQwenOCRClient:
         assert result["status"] == "ok"
         assert mock_post.call_count == 2
 
-    @patch("vlm_ocr_doc_reader.core.ocr_client.requests.post")
+    @patch("vlm_ocr_doc_reader.core.transport.HTTPTransport.post")
     def test_extract_max_retries_exceeded(self, mock_post, qwen_client, sample_image):
         """Test failure after max retries."""
         mock_response = Mock()
@@ -278,7 +422,7 @@ class TestQwenOCRClient:
         # Should be called max_retries times
         assert mock_post.call_count == qwen_client.config.max_retries
 
-    @patch("vlm_ocr_doc_reader.core.ocr_client.requests.post")
+    @patch("vlm_ocr_doc_reader.core.transport.HTTPTransport.post")
     def test_extract_http_error_retries(self, mock_post, qwen_client, sample_image):
         """Test that HTTP errors are retried (implementation retries all errors)."""
         mock_response = Mock()
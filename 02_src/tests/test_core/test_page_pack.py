@@ -0,0 +1,108 @@
+"""Tests for core/page_pack.py — single-file mmap page store."""
+
+import base64
+import mmap
+
+import pytest
+
+from vlm_ocr_doc_reader.core.ocr_client import QwenOCRClient
+from vlm_ocr_doc_reader.core.page_pack import PagePack
+from vlm_ocr_doc_reader.core.state import StateManager, WorkspaceBackend, WorkspaceStorage
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"page-one" * 10
+
+
+class TestPagePack:
+    def test_roundtrip_zero_copy(self, tmp_path):
+        pack = PagePack(tmp_path)
+        pack.append(1, PNG)
+        pack.append(2, b"second")
+
+        view = pack.read(1)
+        assert isinstance(view, memoryview)
+        assert isinstance(view.obj, mmap.mmap)
+        assert view == PNG
+        assert pack.read(2) == b"second"
+        assert pack.read(3) is None
+        assert pack.pages() == [1, 2]
+
+    def test_resave_latest_wins_and_old_views_stay_valid(self, tmp_path):
+        pack = PagePack(tmp_path)
+        pack.append(1, b"v1")
+        old = pack.read(1)
+        pack.append(1, b"v2-longer")  # pack grows -> remapped
+
+        assert pack.read(1) == b"v2-longer"
+        assert old == b"v1"
+        assert PagePack(tmp_path).read(1) == b"v2-longer"
+
+    def test_torn_and_dangling_index_lines_ignored(self, tmp_path):
+        pack = PagePack(tmp_path)
+        pack.append(1, PNG)
+        with pack.index_path.open("a", encoding="utf-8") as f:
+            f.write('{"page": 2, "offset": 0, "length": 99999}\n{"page": 3, "off')
+
+        reopened = PagePack(tmp_path)
+        assert reopened.pages() == [1]
+        assert reopened.read(1) == PNG
+
+    def test_pages_appended_by_another_writer_become_visible(self, tmp_path):
+        a, b = PagePack(tmp_path), PagePack(tmp_path)
+        a.append(1, PNG)
+        assert a.read(2) is None  # index loaded before b writes
+
+        b.append(2, b"from-b")
+        assert 2 in a
+        assert a.read(2) == b"from-b"
+        a.append(3, b"from-a")
+        assert b.pages() == [1, 2, 3]
+        assert b.read(1) == PNG and a.read(3) == b"from-a"
+
+    def test_partial_batch_is_indexed(self, tmp_path):
+        def pages():
+            yield 1, b"one"
+            raise RuntimeError("render failed")
+
+        pack = PagePack(tmp_path)
+        with pytest.raises(RuntimeError):
+            pack.append_many(pages())
+        assert PagePack(tmp_path).read(1) == b"one"
+
+
+class TestWorkspacePackStore:
+    @pytest.fixture
+    def workspace(self, tmp_path) -> WorkspaceStorage:
+        pdf = tmp_path / "doc.pdf"
+        pdf.write_bytes(b"%PDF-1.4 test")
+        ws = WorkspaceStorage.from_pdf(pdf, tmp_path / "ws")
+        ws.ensure_initialized()
+        return ws
+
+    def test_pages_go_to_pack(self, workspace):
+        backend = WorkspaceBackend(workspace, page_store="pack")
+        manager = StateManager(backend)
+        manager.save_pages([(1, PNG), (2, b"two")])
+
+        pages_dir = workspace.paths.pages_dir
+        assert sorted(p.name for p in pages_dir.iterdir()) == ["pages.idx.jsonl", "pages.pack"]
+        image = StateManager(WorkspaceBackend(workspace)).load_page(1)
+        assert isinstance(image, memoryview) and image == PNG
+        assert base64.b64decode(QwenOCRClient._image_to_base64(image)) == PNG
+
+    def test_existing_pack_is_detected(self, workspace, monkeypatch):
+        monkeypatch.delenv("PAGE_STORE", raising=False)
+        WorkspaceBackend(workspace, page_store="pack").save("pages/001", PNG)
+        backend = WorkspaceBackend(workspace)
+        assert backend.page_pack is not None
+        assert backend.exists("pages/001")
+
+    def test_legacy_png_files_still_read(self, workspace):
+        WorkspaceBackend(workspace, page_store="files").save("pages/001", PNG)
+        assert (workspace.paths.pages_dir / "page_001.png").exists()
+
+        backend = WorkspaceBackend(workspace, page_store="pack")
+        assert backend.exists("pages/001")
+        assert backend.load("pages/001") == PNG
+        backend.save("pages/002", b"two")
+        assert backend.load("pages/002") == b"two"
+        assert not (workspace.paths.pages_dir / "page_002.png").exists()
@@ -10,7 +10,10 @@ from pathlib import Path
 import pytest
 
 from vlm_ocr_doc_reader.core.processor import DocumentProcessor
-from vlm_ocr_doc_reader.core.state import MemoryStorage, StateManager
+from vlm_ocr_doc_reader.core.state import MemoryStorage, StateManager, open_document
+from vlm_ocr_doc_reader.preprocessing.renderer import PDFRenderer
+from vlm_ocr_doc_reader.schemas.common import LazyPageInfo
+from vlm_ocr_doc_reader.schemas.config import ProcessorConfig
 
 _DUMMY_KEYS = frozenset({"test", "test-key", "test-api-key-123"})
 
@@ -34,7 +37,7 @@ class TestDocumentProcessorReal:
     """Real API tests for DocumentProcessor."""
 
     def test_init_from_pdf(self):
-        """Test processor initialization from PDF renders pages and saves to state."""
+        """Test processor renders pages on first access and saves them to state."""
         storage = MemoryStorage()
         sm = StateManager(storage)
 
@@ -45,6 +48,7 @@ class TestDocumentProcessorReal:
         )
 
         assert processor.num_pages > 0
+        assert not storage.exists("pages/001")
         assert len(processor.pages) == processor.num_pages
 
         # Pages should be saved in storage
@@ -78,3 +82,125 @@ class TestDocumentProcessorReal:
 
         assert result["text"] is not None
         assert len(result["text"]) > 10
+
+
+@pytest.fixture
+def sample_pdf(tmp_path):
+    """Create a 4-page PDF."""
+    import fitz
+
+    pdf_path = tmp_path / "lazy.pdf"
+    doc = fitz.open()
+    for i in range(4):
+        page = doc.new_page(width=200, height=200)
+        page.insert_text((20, 50), f"Page {i + 1}", fontsize=12)
+    doc.save(pdf_path)
+    doc.close()
+    return pdf_path
+
+
+class TestLazyRendering:
+    """Pages are rendered on demand, not in __init__ (no API needed)."""
+
+    def _processor(self, pdf_path, sm):
+        return DocumentProcessor(source=pdf_path, vlm_agent=object(), state_manager=sm)
+
+    def test_init_does_not_render(self, sample_pdf, monkeypatch):
+        calls = []
+        monkeypatch.setattr(
+            PDFRenderer, "iter_render_pdf", lambda *a, **k: calls.append(a) or iter([])
+        )
+        sm = StateManager(MemoryStorage())
+
+        processor = self._processor(sample_pdf, sm)
+
+        assert processor.num_pages == 4
+        assert calls == []
+        assert not sm.has_page(1)
+
+    def test_load_page_renders_on_demand(self, sample_pdf):
+        sm = StateManager(MemoryStorage())
+        self._processor(sample_pdf, sm)
+
+        image = sm.load_page(3)
+
+        assert image.startswith(b"\x89PNG")
+        assert sm.has_page(3)
+        assert not sm.has_page(1)
+        assert sm.load_page(99) is None
+
+    def test_ensure_pages_renders_only_missing(self, sample_pdf, monkeypatch):
+        sm = StateManager(MemoryStorage())
+        processor = self._processor(sample_pdf, sm)
+        processor.ensure_pages([1, 2])
+
+        rendered = []
+        original = PDFRenderer.iter_render_pdf
+
+        def spy(self, pdf_path, page_indices=None):
+            rendered.append(list(page_indices))
+            return original(self, pdf_path, page_indices)
+
+        monkeypatch.setattr(PDFRenderer, "iter_render_pdf", spy)
+        processor.ensure_pages([1, 2, 3, 4])
+
+        assert rendered == [[2, 3]]
+
+    def test_reopen_reuses_workspace_pages(self, sample_pdf, tmp_path, monkeypatch):
+        sm, _ = open_document(sample_pdf, tmp_path / "ws")
+        self._processor(sample_pdf, sm).ensure_pages([1, 2, 3, 4])
+
+        monkeypatch.setattr(
+            PDFRenderer, "render_page",
+            lambda *a, **k: pytest.fail("page should come from workspace"),
+        )
+        sm2, existed = open_document(sample_pdf, tmp_path / "ws")
+        processor = self._processor(sample_pdf, sm2)
+
+        assert existed
+        assert [p.index for p in processor.pages] == [1, 2, 3, 4]
+
+    def test_reopen_with_new_dpi_rerenders_only_requested(self, sample_pdf, tmp_path):
+        sm, _ = open_document(sample_pdf, tmp_path / "ws")
+        self._processor(sample_pdf, sm).ensure_pages([1, 2, 3, 4])
+
+        sm2, _ = open_document(sample_pdf, tmp_path / "ws")
+        processor = DocumentProcessor(
+            source=sample_pdf,
+            vlm_agent=object(),
+            state_manager=sm2,
+            config=ProcessorConfig(render_dpi=100),
+        )
+        assert not sm2.has_page(1)
+
+        processor.ensure_pages([2])
+
+        assert sm2.has_page(2)
+        assert not sm2.has_page(3)
+
+
+class TestBoundedPageMemory:
+    """Storage owns page images; PageInfo and state.pages do not pin them."""
+
+    def test_pages_are_lazy(self, sample_pdf):
+        sm = StateManager(MemoryStorage(), page_cache_bytes=0)
+        processor = DocumentProcessor(source=sample_pdf, vlm_agent=object(), state_manager=sm)
+
+        pages = processor.pages
+
+        assert [p.index for p in pages] == [1, 2, 3, 4]
+        assert all(isinstance(p, LazyPageInfo) and "image" not in vars(p) for p in pages)
+        assert repr(pages[0]) == "LazyPageInfo(index=1)"
+        assert pages[1].image.startswith(b"\x89PNG")
+        assert len(sm.state.pages) == 0
+
+    def test_png_array_owned_by_storage(self):
+        storage = MemoryStorage()
+        sm = StateManager(storage)
+        images = [b"\x89PNG-one", b"\x89PNG-two"]
+        processor = DocumentProcessor(source=images, vlm_agent=object(), state_manager=sm)
+
+        pages = processor.pages
+        assert [p.image for p in pages] == images
+        assert "image" not in vars(pages[0])
+        assert storage.load("pages/002") == images[1]
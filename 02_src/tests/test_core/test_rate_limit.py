@@ -0,0 +1,134 @@
+"""Tests for core/rate_limit.py — shared thread-safe request pacing."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from vlm_ocr_doc_reader.core.ocr_client import OCRConfig, QwenOCRClient
+from vlm_ocr_doc_reader.core.qwen_vlm_client import QwenVLMClient
+from vlm_ocr_doc_reader.core.rate_limit import (
+    RateGate,
+    TokenBucketLimiter,
+    estimate_payload_tokens,
+    get_rate_gate,
+    get_rate_limiter,
+    parse_retry_after,
+)
+from vlm_ocr_doc_reader.schemas.config import VLMConfig
+
+
+class TestRateGate:
+    def test_first_call_does_not_wait(self):
+        gate = RateGate(1.0)
+        assert gate.wait() == 0
+
+    def test_concurrent_callers_are_spaced(self):
+        gate = RateGate(0.02)
+        starts = []
+
+        def call(_):
+            gate.wait()
+            starts.append(time.monotonic())
+
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            list(pool.map(call, range(5)))
+
+        starts.sort()
+        gaps = [b - a for a, b in zip(starts, starts[1:])]
+        assert all(g >= 0.015 for g in gaps)
+
+    def test_zero_interval_never_waits(self):
+        gate = RateGate(0)
+        assert all(gate.wait() == 0 for _ in range(3))
+
+
+class TestGetRateGate:
+    def test_same_name_shares_gate(self):
+        a = get_rate_gate("test:shared", 0.5)
+        b = get_rate_gate("test:shared", 0.25)
+        assert a is b
+        assert a.min_interval_s == 0.25
+
+    def test_different_names_are_independent(self):
+        assert get_rate_gate("test:a", 0.1) is not get_rate_gate("test:b", 0.1)
+
+
+class TestTokenBucketLimiter:
+    def test_unlimited_never_waits(self):
+        limiter = TokenBucketLimiter()
+        assert all(limiter.acquire(10_000) == 0 for _ in range(5))
+        assert limiter.stats()["waits"] == 0
+
+    def test_request_rate_spaces_calls_after_burst(self):
+        limiter = TokenBucketLimiter(requests_per_s=50)  # burst of 50, then 20ms apart
+        for _ in range(50):
+            limiter.acquire()
+        waits = [limiter.acquire() for _ in range(3)]
+        assert all(0 < w <= 0.03 for w in waits)
+        stats = limiter.stats()
+        assert stats["requests"] == 53 and stats["waits"] == 3
+
+    def test_token_budget_and_usage_correction(self):
+        limiter = TokenBucketLimiter(tokens_per_min=6000)  # 100 tokens/s
+        assert limiter.acquire(5990) == 0
+        limiter.record_usage(estimated=5990, actual=6000)
+        waited = limiter.acquire(5)
+        assert 0 < waited <= 0.1
+
+    def test_429_slows_down_pauses_and_recovers(self):
+        limiter = TokenBucketLimiter(requests_per_s=100, recovery_step=0.25, cooldown_s=0.05)
+        limiter.on_throttled()
+        assert limiter.scale == 0.5
+        assert limiter.acquire() >= 0.04  # shared pause
+        limiter.on_throttled(retry_after=0.02)
+        assert limiter.scale == 0.25
+        for _ in range(3):
+            limiter.on_success()
+        assert limiter.scale == 1.0
+        assert limiter.stats()["throttled"] == 2
+
+    def test_scale_has_floor(self):
+        limiter = TokenBucketLimiter(requests_per_s=10, min_scale=0.1, cooldown_s=0)
+        for _ in range(10):
+            limiter.on_throttled()
+        assert limiter.scale == 0.1
+
+
+class TestHelpers:
+    def test_parse_retry_after(self):
+        assert parse_retry_after(SimpleNamespace(headers={"Retry-After": "2"})) == 2.0
+        assert parse_retry_after(SimpleNamespace(headers={})) is None
+        assert parse_retry_after(SimpleNamespace(headers={"Retry-After": "soon"})) is None
+        assert parse_retry_after(object()) is None
+
+    def test_estimate_payload_tokens(self):
+        payload = {
+            "messages": [
+                {"role": "system", "content": "x" * 30},
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "image_url", "image_url": {"url": "data:..."}},
+                        {"type": "text", "text": "y" * 30},
+                    ],
+                },
+            ]
+        }
+        assert estimate_payload_tokens(payload, image_tokens=100) == 120
+
+
+class TestSharedLimiter:
+    def test_env_limits(self, monkeypatch):
+        monkeypatch.setenv("RATE_LIMIT_RPS", "4")
+        monkeypatch.setenv("RATE_LIMIT_TPM", "bad")
+        limiter = get_rate_limiter("test:env-limits")
+        assert limiter.requests_per_s == 4
+        assert limiter.tokens_per_min is None
+        assert get_rate_limiter("test:env-limits") is limiter
+
+    def test_vlm_and_ocr_clients_share_key_budget(self):
+        vlm = QwenVLMClient(VLMConfig(api_key="shared-key"))
+        ocr = QwenOCRClient(OCRConfig(api_key="shared-key"))
+        other = QwenOCRClient(OCRConfig(api_key="other-key"))
+        assert vlm.rate_limiter is ocr.rate_limiter
+        assert other.rate_limiter is not ocr.rate_limiter
@@ -0,0 +1,271 @@
+"""Unit tests for DocumentReader with fake VLM/OCR clients (no network)."""
+
+import json
+import re
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from vlm_ocr_doc_reader.core.reader import DocumentReader
+from vlm_ocr_doc_reader.core.state import MemoryStorage, StateManager
+from vlm_ocr_doc_reader.core.vlm_agent import VLMAgent
+from vlm_ocr_doc_reader.core.vlm_client import BaseVLMClient
+from vlm_ocr_doc_reader.schemas.common import PageInfo
+
+
+class FakeScanClient(BaseVLMClient):
+    """Returns a scan JSON for whichever pages the user prompt lists."""
+
+    def __init__(self) -> None:
+        self.calls: List[List[Dict[str, Any]]] = []
+
+    def invoke(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
+        self.calls.append(messages)
+        user = messages[-1]["content"]
+        images = [p for p in user if p["type"] == "image_url"]
+        text = user[0]["text"]
+        pages = json.loads(re.search(r"списка (\[[\d, ]+\])", text).group(1))
+        payload = {
+            "text": " ".join(f"page {p}" for p in pages),
+            "structure": {"headers": [{"level": 1, "title": f"H{p}", "page": p} for p in pages]},
+            "ocr_registry": [
+                {"page_num": p, "prompt": f"найди номер на странице {p}", "context": "ctx"}
+                for p in pages
+            ],
+        }
+        return {
+            "message": {"role": "assistant", "content": json.dumps(payload), "tool_calls": None},
+            "usage": {"prompt_tokens": 100 * len(images), "completion_tokens": 10},
+        }
+
+
+def _make_reader(num_pages: int, client: BaseVLMClient) -> DocumentReader:
+    sm = StateManager(MemoryStorage())
+    pages = [PageInfo(index=i, image=f"img{i}".encode() * 100) for i in range(1, num_pages + 1)]
+    for p in pages:
+        sm.save_page(p.index, p.image)
+    processor = SimpleNamespace(
+        pages=pages,
+        num_pages=num_pages,
+        vlm_agent=VLMAgent(client),
+        ocr_tool=None,
+        ensure_pages=lambda page_nums: None,
+    )
+    return DocumentReader(
+        pdf_path="doc.pdf", workspace=None, state_manager=sm, processor=processor
+    )
+
+
+class TestScan:
+    def test_batches_are_independent_single_turn(self, monkeypatch):
+        monkeypatch.setenv("VLM_SCAN_BATCH_SIZE", "2")
+        client = FakeScanClient()
+        reader = _make_reader(6, client)
+
+        reader.scan()
+
+        assert len(client.calls) == 3
+        for messages in client.calls:
+            assert [m["role"] for m in messages] == ["system", "user"]
+        assert reader._processor.vlm_agent.messages == [
+            {"role": "system", "content": client.calls[0][0]["content"]}
+        ]
+
+    def test_request_size_stays_flat(self, monkeypatch):
+        monkeypatch.setenv("VLM_SCAN_BATCH_SIZE", "2")
+        reader = _make_reader(8, FakeScanClient())
+
+        reader.scan()
+
+        sizes = [s["request_bytes"] for s in reader.last_scan_stats]
+        assert len(sizes) == 4
+        assert max(sizes) - min(sizes) < 16
+        assert all(s["prompt_tokens"] == 200 for s in reader.last_scan_stats)
+
+    def test_merges_results_and_marks_pages(self, monkeypatch):
+        monkeypatch.setenv("VLM_SCAN_BATCH_SIZE", "2")
+        reader = _make_reader(3, FakeScanClient())
+
+        reader.scan()
+
+        data = reader.get_document_data()
+        assert data.text == "page 1 page 2\n\npage 3"
+        assert [h["page"] for h in data.structure["headers"]] == [1, 2, 3]
+        assert reader.page_status() == {1: "scan", 2: "scan", 3: "scan"}
+        assert len(reader.pending_entities()) == 3
+
+    def test_concurrent_matches_sequential(self, monkeypatch):
+        monkeypatch.setenv("VLM_SCAN_BATCH_SIZE", "1")
+
+        class JitteryClient(FakeScanClient):
+            def invoke(self, messages, tools=None):
+                # Later pages finish first to shuffle completion order
+                time.sleep(0.002 * (10 - len(self.calls) % 10))
+                return super().invoke(messages, tools)
+
+        sequential = _make_reader(10, FakeScanClient())
+        sequential.scan(max_workers=1)
+        concurrent = _make_reader(10, JitteryClient())
+        concurrent.scan(max_workers=4)
+
+        assert concurrent.get_document_data() == sequential.get_document_data()
+        assert (
+            concurrent._state_manager.load_ocr_registry()
+            == sequential._state_manager.load_ocr_registry()
+        )
+        assert [s["pages"] for s in concurrent.last_scan_stats] == [[p] for p in range(1, 11)]
+
+    def test_scan_image_encoding_from_env(self, monkeypatch):
+        import io
+
+        from PIL import Image
+
+        monkeypatch.setenv("SCAN_IMAGE_FORMAT", "jpeg")
+        monkeypatch.setenv("SCAN_IMAGE_QUALITY", "70")
+        client = FakeScanClient()
+        reader = _make_reader(1, client)
+        buf = io.BytesIO()
+        Image.new("RGB", (64, 64), "white").save(buf, format="PNG")
+        reader._state_manager.save_page(1, buf.getvalue())
+
+        reader.scan()
+
+        parts = client.calls[0][-1]["content"]
+        urls = [p["image_url"]["url"] for p in parts if p["type"] == "image_url"]
+        assert urls and urls[0].startswith("data:image/jpeg;base64,")
+
+    def test_vlm_calls_run_outside_state_batch(self, monkeypatch):
+        monkeypatch.setenv("VLM_SCAN_BATCH_SIZE", "1")
+        depths: List[int] = []
+
+        class Recording(FakeScanClient):
+            def invoke(self, messages, tools=None):
+                depths.append(reader._state_manager._batch_depth)
+                return super().invoke(messages, tools)
+
+        reader = _make_reader(3, Recording())
+        reader.scan(max_workers=2)
+
+        assert depths == [0, 0, 0]
+        assert reader._state_manager.page_status() == {1: "scan", 2: "scan", 3: "scan"}
+
+    def test_failed_batch_keeps_finished_page_states(self, monkeypatch):
+        monkeypatch.setenv("VLM_SCAN_BATCH_SIZE", "1")
+
+        class FailsOnPage2(FakeScanClient):
+            def invoke(self, messages, tools=None):
+                if "[2]" in messages[-1]["content"][0]["text"]:
+                    raise RuntimeError("boom")
+                return super().invoke(messages, tools)
+
+        reader = _make_reader(3, FailsOnPage2())
+        with pytest.raises(RuntimeError):
+            reader.scan()
+        assert reader._state_manager.page_status() == {1: "scan"}
+        assert reader.pending_entities() == []
+
+    def test_vlm_error_raises(self, monkeypatch):
+        class Failing(BaseVLMClient):
+            def invoke(self, messages, tools=None):
+                raise RuntimeError("boom")
+
+        reader = _make_reader(1, Failing())
+        with pytest.raises(RuntimeError, match="scan failed"):
+            reader.scan()
+
+
+class FakeOCRClient:
+    """Answers every task with a fixed value and records use_cache flags."""
+
+    def __init__(self) -> None:
+        self.use_cache_flags: List[bool] = []
+
+    def extract_batch(self, image, prompts, page_num, use_cache=True):
+        self.use_cache_flags.append(use_cache)
+        return [
+            {"status": "ok", "value": f"v{page_num}", "context": "c", "explanation": ""}
+            for _ in prompts
+        ]
+
+
+class TestOCRCacheBypass:
+    def test_resolve_uses_cache_verify_bypasses(self, monkeypatch):
+        monkeypatch.setenv("VLM_SCAN_BATCH_SIZE", "2")
+        reader = _make_reader(2, FakeScanClient())
+        reader.scan()
+        ocr = FakeOCRClient()
+        reader._processor.ocr_tool = SimpleNamespace(ocr_client=ocr)
+
+        reader.resolve(max_workers=1)
+        resolve_flags = list(ocr.use_cache_flags)
+        reader.verify(axes=[1, 2], max_workers=1)
+
+        assert resolve_flags and all(resolve_flags)
+        verify_flags = ocr.use_cache_flags[len(resolve_flags):]
+        assert verify_flags and not any(verify_flags)
+
+
+class InterruptingOCRClient(FakeOCRClient):
+    """Raises KeyboardInterrupt on call number `interrupt_at` (1-based)."""
+
+    def __init__(self, interrupt_at: int) -> None:
+        super().__init__()
+        self.interrupt_at = interrupt_at
+        self.prompts: List[str] = []
+
+    def extract_batch(self, image, prompts, page_num, use_cache=True):
+        if len(self.use_cache_flags) + 1 == self.interrupt_at:
+            raise KeyboardInterrupt
+        self.prompts.extend(prompts)
+        return super().extract_batch(image, prompts, page_num, use_cache)
+
+
+class TestResolveIncremental:
+    def test_interrupted_resolve_keeps_finished_chunks(self, monkeypatch):
+        monkeypatch.setenv("VLM_SCAN_BATCH_SIZE", "3")
+        reader = _make_reader(3, FakeScanClient())
+        reader.scan()
+        reader._processor.ocr_tool = SimpleNamespace(ocr_client=InterruptingOCRClient(3))
+
+        with pytest.raises(KeyboardInterrupt):
+            reader.resolve(chunk_size=1, max_workers=1)
+
+        assert reader.page_status() == {1: "resolved", 2: "resolved", 3: "scan"}
+        assert [e.page_num for e in reader.pending_entities()] == [3]
+
+        rerun = InterruptingOCRClient(0)
+        reader._processor.ocr_tool = SimpleNamespace(ocr_client=rerun)
+        reader.resolve(chunk_size=1, max_workers=1)
+        assert rerun.prompts == ["найди номер на странице 3"]
+        assert reader.pending_entities() == []
+
+    def test_chunks_persist_in_completion_order(self, monkeypatch):
+        monkeypatch.setenv("VLM_SCAN_BATCH_SIZE", "2")
+        reader = _make_reader(2, FakeScanClient())
+        reader.scan()
+
+        class SlowFirstPage(FakeOCRClient):
+            def extract_batch(self, image, prompts, page_num, use_cache=True):
+                if page_num == 1:
+                    time.sleep(0.2)
+                return super().extract_batch(image, prompts, page_num, use_cache)
+
+        reader._processor.ocr_tool = SimpleNamespace(ocr_client=SlowFirstPage())
+        order: List[int] = []
+        set_page = reader._state_manager.set_page_resolution
+        monkeypatch.setattr(
+            reader._state_manager,
+            "set_page_resolution",
+            lambda page_num, status: (order.append(page_num), set_page(page_num, status)),
+        )
+
+        reader.resolve(chunk_size=1, max_workers=2)
+
+        assert order == [2, 1]
+        assert reader.pending_entities() == []
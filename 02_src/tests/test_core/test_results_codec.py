@@ -0,0 +1,79 @@
+"""Tests for core/results_codec.py — pluggable codecs for results/* keys."""
+
+import pytest
+import yaml
+
+from vlm_ocr_doc_reader.core import results_codec
+from vlm_ocr_doc_reader.core.results_codec import ResultsCodec, read_result, write_result
+from vlm_ocr_doc_reader.core.state import DiskStorage, WorkspaceBackend, WorkspaceStorage
+
+RESULT = {
+    "text": "Договор № 42\n" * 10,
+    "structure": {"headers": [{"level": 1, "title": "Раздел 1", "page": 1}]},
+    "tables": [],
+}
+
+
+class TestResultsCodec:
+    @pytest.mark.parametrize(
+        "spec,ext",
+        [("json", ".json"), ("json+gzip", ".json.gz"), ("yaml", ".yaml"), ("yaml+gzip", ".yaml.gz")],
+    )
+    def test_roundtrip(self, tmp_path, spec, ext):
+        codec = ResultsCodec.parse(spec)
+        path = write_result(tmp_path / "full_description", RESULT, codec)
+        assert path.name == f"full_description{ext}"
+        assert ResultsCodec.for_path(path) == codec
+        assert read_result(tmp_path / "full_description", codec) == RESULT
+
+    def test_json_is_compact(self):
+        assert ResultsCodec().dumps({"a": [1, 2]}) == b'{"a":[1,2]}'
+
+    @pytest.mark.parametrize("spec", ["xml", "json+lz4"])
+    def test_invalid_spec(self, spec):
+        with pytest.raises(ValueError):
+            ResultsCodec.parse(spec)
+
+    def test_missing_optional_dependency(self, monkeypatch):
+        monkeypatch.setattr(results_codec, "msgpack", None)
+        with pytest.raises(ImportError):
+            ResultsCodec(format="msgpack")
+        monkeypatch.setenv("RESULTS_CODEC", "msgpack")
+        assert ResultsCodec.from_env("json") == ResultsCodec()
+
+    def test_reads_other_codec_and_replaces_it(self, tmp_path):
+        write_result(tmp_path / "scan", RESULT, ResultsCodec(format="yaml"))
+        json_codec = ResultsCodec()
+        assert read_result(tmp_path / "scan", json_codec) == RESULT
+
+        write_result(tmp_path / "scan", {"v": 2}, json_codec)
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["scan.json"]
+        assert read_result(tmp_path / "scan", ResultsCodec(format="yaml")) == {"v": 2}
+
+
+class TestBackendsResultsCodec:
+    def test_workspace_defaults_to_json_and_reads_legacy_yaml(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("RESULTS_CODEC", raising=False)
+        pdf = tmp_path / "doc.pdf"
+        pdf.write_bytes(b"%PDF-1.4 test")
+        ws = WorkspaceStorage.from_pdf(pdf, tmp_path / "ws")
+        ws.ensure_initialized()
+        results_dir = ws.paths.document_dir / "results"
+        with (results_dir / "full_description.yaml").open("w", encoding="utf-8") as f:
+            yaml.dump(RESULT, f, allow_unicode=True)
+
+        backend = WorkspaceBackend(ws)
+        assert backend.exists("results/full_description")
+        assert backend.load("results/full_description") == RESULT
+
+        backend.save("results/full_description", RESULT)
+        assert [p.name for p in results_dir.iterdir()] == ["full_description.json"]
+        assert backend.load("results/full_description") == RESULT
+        assert backend.load("results/missing", default={}) == {}
+
+    def test_disk_storage_codec_from_env(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("RESULTS_CODEC", "json+gzip")
+        storage = DiskStorage(tmp_path / "state")
+        storage.save("results/analysis", RESULT)
+        assert (storage.results_dir / "analysis.json.gz").exists()
+        assert storage.load("results/analysis") == RESULT
@@ -0,0 +1,156 @@
+"""Tests for core/retry.py — jittered retries and the shared circuit breaker."""
+
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from vlm_ocr_doc_reader.core.ocr_client import OCRConfig, QwenClientError, QwenOCRClient
+from vlm_ocr_doc_reader.core.qwen_vlm_client import QwenVLMClient
+from vlm_ocr_doc_reader.core.retry import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    get_circuit_breaker,
+)
+from vlm_ocr_doc_reader.schemas.config import VLMConfig
+
+FAST = RetryPolicy(base_s=0.01, cap_s=0.02)
+
+
+class TestRetryPolicy:
+    def test_delays_are_jittered_and_capped(self):
+        policy = RetryPolicy(base_s=1.0, factor=3.0, cap_s=5.0)
+        delays = []
+        prev = None
+        for _ in range(50):
+            prev = policy.next_delay(prev)
+            delays.append(prev)
+        assert all(1.0 <= d <= 5.0 for d in delays)
+        assert len({round(d, 6) for d in delays}) > 1
+
+    def test_retry_after_is_a_lower_bound(self):
+        policy = RetryPolicy(base_s=0.1, factor=1.5, max_retry_after_s=10.0)
+        assert policy.next_delay(None, retry_after=7.0) == 7.0
+        assert policy.next_delay(None, retry_after=600.0) == 10.0
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold_and_fails_fast(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout_s=60)
+        breaker.record_failure()
+        breaker.before_request()
+        breaker.record_failure()
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+        assert breaker.stats()["rejected"] == 1
+
+    def test_success_resets_failure_count(self):
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == "closed"
+
+    def test_half_open_probe_closes_or_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout_s=0.02)
+        breaker.record_failure()
+        time.sleep(0.03)
+        assert breaker.state == "half_open"
+        breaker.before_request()  # the probe
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()  # others wait for the probe's outcome
+        breaker.record_failure()
+        assert breaker.state == "open"
+
+        time.sleep(0.03)
+        breaker.before_request()
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    def test_wait_mode_parks_until_probe_succeeds(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout_s=0.05, mode="wait")
+        breaker.record_failure()
+        parked = []
+
+        def worker():
+            parked.append(breaker.before_request())
+            breaker.record_success()
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=5)
+        assert len(parked) == 3
+        assert all(p >= 0.03 for p in parked)
+        assert breaker.state == "closed"
+
+    def test_off_mode_never_opens(self):
+        breaker = CircuitBreaker(failure_threshold=1, mode="off")
+        breaker.record_failure()
+        assert breaker.before_request() == 0.0
+
+    def test_env_settings(self, monkeypatch):
+        monkeypatch.setenv("CIRCUIT_BREAKER", "wait")
+        monkeypatch.setenv("CIRCUIT_FAILURES", "3")
+        monkeypatch.setenv("CIRCUIT_RESET_S", "oops")
+        breaker = get_circuit_breaker("test:env-breaker")
+        assert (breaker.mode, breaker.failure_threshold, breaker.reset_timeout_s) == ("wait", 3, 30.0)
+
+
+def _response(status, headers=None):
+    resp = Mock()
+    resp.status_code = status
+    resp.text = "error"
+    resp.headers = headers or {}
+    if status >= 400:
+        resp.raise_for_status.side_effect = requests.HTTPError(response=resp)
+    return resp
+
+
+class TestClientsUsePolicy:
+    @patch("vlm_ocr_doc_reader.core.transport.HTTPTransport.post")
+    def test_ocr_fails_fast_once_circuit_opens(self, mock_post, monkeypatch):
+        monkeypatch.setenv("CIRCUIT_FAILURES", "2")
+        client = QwenOCRClient(OCRConfig(api_key="breaker-ocr-key", max_retries=3))
+        client.retry_policy = FAST
+        mock_post.return_value = _response(503)
+
+        with pytest.raises(QwenClientError, match="circuit open"):
+            client.extract(b"img", "ИНН", 1)
+        assert mock_post.call_count == 2
+        with pytest.raises(QwenClientError, match="circuit open"):
+            client.extract(b"img", "ИНН", 2)
+        assert mock_post.call_count == 2
+
+    @patch("vlm_ocr_doc_reader.core.transport.HTTPTransport.post")
+    def test_ocr_honours_retry_after(self, mock_post):
+        client = QwenOCRClient(OCRConfig(api_key="retry-after-key", repair_retries=0))
+        client.retry_policy = FAST
+        ok = _response(200)
+        ok.json.return_value = {
+            "choices": [{"message": {"content": "ЗНАЧЕНИЕ: 1\nКОНТЕКСТ: -\nПОЯСНЕНИЕ: -"}}]
+        }
+        mock_post.side_effect = [_response(429, {"Retry-After": "0.2"}), ok]
+
+        start = time.monotonic()
+        assert client.extract(b"img", "ИНН", 1)["status"] == "ok"
+        assert time.monotonic() - start >= 0.2
+
+    @patch("vlm_ocr_doc_reader.core.transport.HTTPTransport.post")
+    def test_vlm_shares_breaker_with_ocr(self, mock_post, monkeypatch):
+        monkeypatch.setenv("CIRCUIT_FAILURES", "1")
+        ocr = QwenOCRClient(OCRConfig(api_key="breaker-shared-key", max_retries=1))
+        vlm = QwenVLMClient(VLMConfig(api_key="breaker-shared-key", min_interval_s=0))
+        assert vlm.circuit is ocr.circuit
+        mock_post.return_value = _response(500)
+
+        with pytest.raises(QwenClientError):
+            ocr.extract(b"img", "ИНН", 1)
+        with pytest.raises(Exception, match="circuit open"):
+            vlm.invoke([{"role": "user", "content": "hi"}])
+        assert mock_post.call_count == 1
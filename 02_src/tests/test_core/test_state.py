@@ -1,18 +1,28 @@
 """Tests for State Manager and storage backends."""
 
 import json
+import multiprocessing
 from pathlib import Path
 from typing import Any, Dict
 
 import pytest
 import yaml
 
+from vlm_ocr_doc_reader.core import state as state_module
+from vlm_ocr_doc_reader.core.file_lock import FileLock
 from vlm_ocr_doc_reader.core.state import (
     DocumentState,
     DiskStorage,
     MemoryStorage,
+    OCRRegistryEntry,
+    PageImageCache,
+    SQLiteWorkspaceBackend,
     StateManager,
     StorageBackend,
+    WorkspaceBackend,
+    WorkspaceStorage,
+    compute_content_hash,
+    open_document,
 )
 
 
@@ -348,3 +358,634 @@ class TestStateManager:
         assert (disk_storage.pages_dir / "page_001.png").exists()
         assert (disk_storage.pages_dir / "page_010.png").exists()
         assert (disk_storage.pages_dir / "page_100.png").exists()
+
+
+class TestPageRenderCache:
+    """Render manifest: stored pages count only if rendered with same params."""
+
+    def test_manifest_written_for_rendered_pages(self, tmp_path: Path) -> None:
+        storage = DiskStorage(tmp_path)
+        manager = StateManager(storage)
+        manager.set_page_source(lambda n: b"img", render_info={"dpi": 150})
+
+        manager.save_pages([(1, b"p1"), (2, b"p2")])
+
+        manifest = json.loads((storage.pages_dir / "manifest.json").read_text())
+        assert manifest == {"pages": {"1": {"dpi": 150}, "2": {"dpi": 150}}}
+
+    def test_matching_params_reuse_stored_page(self, tmp_path: Path) -> None:
+        storage = DiskStorage(tmp_path)
+        first = StateManager(storage)
+        first.set_page_source(lambda n: b"new", render_info={"dpi": 150})
+        first.save_page(1, b"cached")
+
+        second = StateManager(storage)
+        second.set_page_source(lambda n: b"new", render_info={"dpi": 150})
+
+        assert second.has_page(1)
+        assert second.load_page(1) == b"cached"
+
+    def test_changed_params_rerender(self, tmp_path: Path) -> None:
+        storage = DiskStorage(tmp_path)
+        first = StateManager(storage)
+        first.set_page_source(lambda n: b"old", render_info={"dpi": 150})
+        first.save_pages([(1, b"old1"), (2, b"old2")])
+
+        second = StateManager(storage)
+        second.set_page_source(lambda n: f"new{n}".encode(), render_info={"dpi": 200})
+
+        assert not second.has_page(1)
+        assert second.load_page(1) == b"new1"
+        assert second.has_page(1)
+        assert not second.has_page(2)
+
+    def test_pages_without_manifest_are_stale(self, tmp_path: Path) -> None:
+        storage = DiskStorage(tmp_path)
+        StateManager(storage).save_page(1, b"legacy")
+
+        manager = StateManager(storage)
+        assert manager.has_page(1)
+        manager.set_page_source(lambda n: b"fresh", render_info={"dpi": 150})
+        assert not manager.has_page(1)
+        assert manager.load_page(1) == b"fresh"
+
+
+def _entry(n: int, page: int = 1, resolution: int = 0, value=None) -> OCRRegistryEntry:
+    return OCRRegistryEntry(
+        page_num=page, entity_id=f"e{n}", prompt=f"p{n}", resolution=resolution, value=value
+    )
+
+
+class TestStateJournal:
+    """Registry/page-state changes go to an append-only journal, then compact."""
+
+    @pytest.fixture
+    def workspace(self, tmp_path: Path) -> WorkspaceStorage:
+        pdf = tmp_path / "doc.pdf"
+        pdf.write_bytes(b"%PDF-1.4 test")
+        ws = WorkspaceStorage.from_pdf(pdf, tmp_path / "ws")
+        ws.ensure_initialized()
+        return ws
+
+    def _journal_path(self, ws: WorkspaceStorage) -> Path:
+        return ws.paths.document_dir / "state.journal.jsonl"
+
+    def test_changes_append_without_rewriting_state(self, workspace) -> None:
+        manager = StateManager(WorkspaceBackend(workspace))
+        manager.upsert_ocr_entries([_entry(i) for i in range(3)])
+        before = workspace.paths.state_json.read_text()
+
+        manager.upsert_ocr_entries([_entry(1, resolution=1, value="v")])
+        manager.set_page_resolution(1, "resolved")
+
+        assert workspace.paths.state_json.read_text() == before
+        lines = self._journal_path(workspace).read_text().splitlines()
+        assert [json.loads(l)["op"] for l in lines] == ["upsert", "upsert", "page"]
+        # Only the changed entry is written
+        assert len(json.loads(lines[1])["entries"]) == 1
+
+    def test_replay_on_load(self, workspace) -> None:
+        first = StateManager(WorkspaceBackend(workspace))
+        first.upsert_ocr_entries([_entry(1), _entry(2, page=2)])
+        first.upsert_ocr_entries([_entry(2, page=2, resolution=1, value="x")])
+        first.set_page_resolution(2, "resolved")
+
+        second = StateManager(WorkspaceBackend(workspace))
+        state = second.load_document_state()
+
+        assert [e.entity_id for e in state.ocr_registry] == ["e1", "e2"]
+        assert state.ocr_registry[1].value == "x"
+        assert state.page_states == {2: "resolved"}
+        assert [e.entity_id for e in second.pending_entities()] == ["e1"]
+
+    def test_compact_folds_journal_into_state(self, workspace) -> None:
+        manager = StateManager(WorkspaceBackend(workspace))
+        manager.upsert_ocr_entries([_entry(1)])
+        manager.set_page_resolution(1, "scan")
+
+        manager.close()
+
+        data = json.loads(workspace.paths.state_json.read_text())
+        assert data["page_states"] == {"1": "scan"}
+        assert [e["entity_id"] for e in data["ocr_registry"]] == ["e1"]
+        assert json.loads(workspace.paths.registry_json.read_text())[0]["entity_id"] == "e1"
+        assert self._journal_path(workspace).read_text() == ""
+
+    def test_periodic_compaction(self, workspace) -> None:
+        manager = StateManager(WorkspaceBackend(workspace), journal_compact_every=3)
+        for i in range(4):
+            manager.upsert_ocr_entries([_entry(i)])
+
+        data = json.loads(workspace.paths.state_json.read_text())
+        assert len(data["ocr_registry"]) == 3
+        assert len(self._journal_path(workspace).read_text().splitlines()) == 1
+
+    def test_torn_last_line_is_ignored(self, workspace) -> None:
+        manager = StateManager(WorkspaceBackend(workspace))
+        manager.upsert_ocr_entries([_entry(1)])
+        with self._journal_path(workspace).open("a", encoding="utf-8") as f:
+            f.write('{"op": "page", "page_nu')
+
+        state = StateManager(WorkspaceBackend(workspace)).load_document_state()
+        assert [e.entity_id for e in state.ocr_registry] == ["e1"]
+        assert state.page_states == {}
+
+    def test_memory_storage_has_no_journal(self) -> None:
+        storage = MemoryStorage()
+        manager = StateManager(storage)
+        manager.upsert_ocr_entries([_entry(1)])
+        manager.set_page_resolution(1, "scan")
+
+        assert storage.load("document_state/state")["page_states"] == {"1": "scan"}
+        assert not storage.exists("state_journal/journal")
+
+
+class TestStateBatch:
+    """batch() buffers registry/page-state changes and writes them once."""
+
+    class CountingMemory(MemoryStorage):
+        def __init__(self) -> None:
+            super().__init__()
+            self.saves = 0
+
+        def save(self, key: str, value: Any) -> None:
+            self.saves += 1
+            super().save(key, value)
+
+    @pytest.fixture
+    def backend(self, tmp_path: Path) -> WorkspaceBackend:
+        pdf = tmp_path / "doc.pdf"
+        pdf.write_bytes(b"%PDF-1.4 test")
+        ws = WorkspaceStorage.from_pdf(pdf, tmp_path / "ws")
+        ws.ensure_initialized()
+        backend = WorkspaceBackend(ws)
+        backend.appends = 0
+        original = backend.append
+
+        def counting_append(key, records):
+            backend.appends += 1
+            original(key, records)
+
+        backend.append = counting_append
+        return backend
+
+    def test_single_journal_append(self, backend) -> None:
+        manager = StateManager(backend)
+        with manager.batch():
+            for page in range(1, 6):
+                manager.upsert_ocr_entries([_entry(page, page=page)])
+                manager.set_page_resolution(page, "resolved")
+            assert backend.appends == 0
+
+        assert backend.appends == 1
+        state = StateManager(backend).load_document_state()
+        assert len(state.ocr_registry) == 5
+        assert set(state.page_states.values()) == {"resolved"}
+
+    def test_single_snapshot_without_journal(self) -> None:
+        storage = self.CountingMemory()
+        manager = StateManager(storage)
+        with manager.batch():
+            for page in range(1, 6):
+                manager.upsert_ocr_entries([_entry(page, page=page)])
+                manager.set_page_resolution(page, "scan")
+
+        # state.json + registry.json, once
+        assert storage.saves == 2
+        assert len(storage.load("document_state/state")["page_states"]) == 5
+
+    def test_partial_flush_on_error(self, backend) -> None:
+        manager = StateManager(backend)
+        with pytest.raises(RuntimeError):
+            with manager.batch():
+                manager.set_page_resolution(1, "resolved")
+                raise RuntimeError("boom")
+
+        assert StateManager(backend).load_document_state().page_states == {1: "resolved"}
+
+    def test_rollback_on_error(self, backend) -> None:
+        manager = StateManager(backend)
+        manager.set_page_resolution(1, "scan")
+        with pytest.raises(RuntimeError):
+            with manager.batch(rollback_on_error=True):
+                manager.set_page_resolution(1, "resolved")
+                manager.upsert_ocr_entries([_entry(1)])
+                raise RuntimeError("boom")
+
+        assert manager.page_status() == {1: "scan"}
+        assert manager.pending_entities() == []
+        assert StateManager(backend).load_document_state().page_states == {1: "scan"}
+
+    def test_nested_batches_flush_once(self, backend) -> None:
+        manager = StateManager(backend)
+        with manager.batch():
+            manager.set_page_resolution(1, "scan")
+            with manager.batch():
+                manager.set_page_resolution(2, "scan")
+            assert backend.appends == 0
+        assert backend.appends == 1
+
+    def test_concurrent_batches_from_threads(self, backend) -> None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        manager = StateManager(backend, journal_compact_every=7)
+
+        def write(page: int) -> None:
+            with manager.batch():
+                manager.upsert_ocr_entries([_entry(page * 10 + i, page=page) for i in range(3)])
+                manager.set_page_resolution(page, "resolved")
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(write, range(1, 41)))
+
+        assert backend.appends == 40
+        state = StateManager(backend).load_document_state()
+        assert len(state.ocr_registry) == 120
+        assert state.page_states == {n: "resolved" for n in range(1, 41)}
+
+
+class TestSQLiteWorkspaceBackend:
+    """Page states and OCR registry in state.sqlite3, queried via indexes."""
+
+    @pytest.fixture
+    def workspace(self, tmp_path: Path) -> WorkspaceStorage:
+        pdf = tmp_path / "doc.pdf"
+        pdf.write_bytes(b"%PDF-1.4 test")
+        ws = WorkspaceStorage.from_pdf(pdf, tmp_path / "ws")
+        ws.ensure_initialized(create_state_files=False)
+        return ws
+
+    def test_upsert_and_indexed_queries(self, workspace) -> None:
+        manager = StateManager(SQLiteWorkspaceBackend(workspace))
+        manager.upsert_ocr_entries([_entry(3, page=2), _entry(1), _entry(2, page=2)])
+        manager.upsert_ocr_entries([_entry(3, page=2, resolution=1, value="v")])
+        manager.set_page_resolution(2, "resolved")
+
+        assert [e.entity_id for e in manager.load_ocr_registry()] == ["e3", "e1", "e2"]
+        assert [e.entity_id for e in manager.pending_entities()] == ["e1", "e2"]
+        assert [e.entity_id for e in manager.pending_entities(page_num=2)] == ["e2"]
+        assert [e.entity_id for e in manager.entries_for_pages([2])] == ["e3", "e2"]
+        assert manager.entries_for_pages([2])[0].value == "v"
+        assert manager.page_status() == {2: "resolved"}
+        assert not workspace.paths.state_json.exists()
+
+    def test_loads_see_later_indexed_writes(self, workspace) -> None:
+        manager = StateManager(SQLiteWorkspaceBackend(workspace))
+        manager.upsert_ocr_entries([_entry(1)])
+        assert [e.resolution for e in manager.load_ocr_registry()] == [0]
+        assert manager.load_document_state().page_states == {}
+
+        manager.upsert_ocr_entries([_entry(1, resolution=1, value="v"), _entry(2)])
+        manager.set_page_resolution(1, "resolved")
+
+        registry = manager.load_ocr_registry()
+        assert [(e.entity_id, e.resolution) for e in registry] == [("e1", 1), ("e2", 0)]
+        assert manager.load_document_state().page_states == {1: "resolved"}
+
+    def test_persists_across_reopen(self, workspace) -> None:
+        first = StateManager(SQLiteWorkspaceBackend(workspace))
+        first.upsert_ocr_entries([_entry(1)])
+        first.set_page_resolution(1, "scan")
+        first.close()
+
+        state = StateManager(SQLiteWorkspaceBackend(workspace)).load_document_state()
+        assert [e.entity_id for e in state.ocr_registry] == ["e1"]
+        assert state.page_states == {1: "scan"}
+
+    def test_migrates_json_state_and_journal(self, workspace) -> None:
+        workspace.ensure_initialized()
+        json_manager = StateManager(WorkspaceBackend(workspace))
+        json_manager.upsert_ocr_entries([_entry(1), _entry(2)])
+        json_manager.compact()
+        json_manager.set_page_resolution(1, "resolved")  # left in the journal
+
+        manager = StateManager(SQLiteWorkspaceBackend(workspace))
+
+        assert [e.entity_id for e in manager.load_ocr_registry()] == ["e1", "e2"]
+        assert manager.page_status() == {1: "resolved"}
+        doc_dir = workspace.paths.document_dir
+        assert not workspace.paths.state_json.exists()
+        assert (doc_dir / "state.json.migrated").exists()
+        assert (doc_dir / "state.journal.jsonl.migrated").exists()
+
+    def test_batch_rollback_and_partial_commit(self, workspace) -> None:
+        manager = StateManager(SQLiteWorkspaceBackend(workspace))
+        manager.set_page_resolution(1, "scan")
+        with pytest.raises(RuntimeError):
+            with manager.batch(rollback_on_error=True):
+                manager.set_page_resolution(1, "resolved")
+                manager.upsert_ocr_entries([_entry(1)])
+                raise RuntimeError("boom")
+        assert manager.page_status() == {1: "scan"}
+        assert manager.pending_entities() == []
+
+        with pytest.raises(RuntimeError):
+            with manager.batch():
+                with manager.batch():
+                    manager.set_page_resolution(2, "scan")
+                raise RuntimeError("boom")
+        assert manager.page_status() == {1: "scan", 2: "scan"}
+
+    def test_open_document_selects_backend(self, tmp_path, monkeypatch) -> None:
+        pdf = tmp_path / "doc.pdf"
+        pdf.write_bytes(b"%PDF-1.4 test")
+        monkeypatch.setenv("WORKSPACE_BACKEND", "sqlite")
+        manager, existed = open_document(pdf, tmp_path / "ws")
+        assert isinstance(manager.storage, SQLiteWorkspaceBackend)
+        assert not existed
+        manager.upsert_ocr_entries([_entry(1)])
+        manager.close()
+
+        # An existing state.sqlite3 wins over the env default
+        monkeypatch.delenv("WORKSPACE_BACKEND")
+        manager, existed = open_document(pdf, tmp_path / "ws")
+        assert isinstance(manager.storage, SQLiteWorkspaceBackend)
+        assert existed
+        assert [e.entity_id for e in manager.load_ocr_registry()] == ["e1"]
+
+
+class TestRegistryIndexes:
+    """Live registry indexes and change-token-validated reloads."""
+
+    @pytest.fixture
+    def backend(self, tmp_path: Path) -> WorkspaceBackend:
+        pdf = tmp_path / "doc.pdf"
+        pdf.write_bytes(b"%PDF-1.4 test")
+        ws = WorkspaceStorage.from_pdf(pdf, tmp_path / "ws")
+        ws.ensure_initialized()
+        backend = WorkspaceBackend(ws)
+        backend.state_loads = 0
+        original = backend.load
+
+        def counting_load(key, default=None):
+            if key == "document_state/state":
+                backend.state_loads += 1
+            return original(key, default)
+
+        backend.load = counting_load
+        return backend
+
+    def test_queries_follow_upserts(self, backend) -> None:
+        manager = StateManager(backend)
+        manager.upsert_ocr_entries([_entry(1), _entry(2, page=2), _entry(3, page=2)])
+        manager.upsert_ocr_entries([_entry(2, page=2, resolution=1, value="v")])
+
+        assert [e.entity_id for e in manager.pending_entities()] == ["e1", "e3"]
+        assert [e.entity_id for e in manager.pending_entities(page_num=2)] == ["e3"]
+        assert [e.entity_id for e in manager.entries_for_pages([2, 5])] == ["e2", "e3"]
+        assert manager.get_ocr_entry("e2").value == "v"
+        assert manager.get_ocr_entry("missing") is None
+
+    def test_unchanged_state_is_not_reparsed(self, backend) -> None:
+        manager = StateManager(backend)
+        manager.upsert_ocr_entries([_entry(1)])
+        manager.set_page_resolution(1, "scan")
+        loads = backend.state_loads
+
+        for _ in range(3):
+            manager.load_ocr_registry()
+            manager.pending_entities()
+            manager.page_status()
+        manager.compact()
+        manager.load_ocr_registry()
+
+        assert backend.state_loads == loads
+
+    def test_external_change_triggers_reload(self, backend) -> None:
+        manager = StateManager(backend)
+        manager.upsert_ocr_entries([_entry(1)])
+        manager.load_ocr_registry()
+
+        other = StateManager(backend)
+        other.upsert_ocr_entries([_entry(2, page=3)])
+
+        assert [e.entity_id for e in manager.load_ocr_registry()] == ["e1", "e2"]
+        assert [e.entity_id for e in manager.entries_for_pages([3])] == ["e2"]
+
+    def test_rollback_rebuilds_index(self, backend) -> None:
+        manager = StateManager(backend)
+        manager.upsert_ocr_entries([_entry(1)])
+        with pytest.raises(RuntimeError):
+            with manager.batch(rollback_on_error=True):
+                manager.upsert_ocr_entries([_entry(1, resolution=1), _entry(2)])
+                raise RuntimeError("boom")
+
+        assert [e.entity_id for e in manager.pending_entities()] == ["e1"]
+        assert manager.get_ocr_entry("e2") is None
+
+    def test_memory_storage_change_token(self) -> None:
+        storage = MemoryStorage()
+        manager = StateManager(storage)
+        manager.upsert_ocr_entries([_entry(1)])
+        assert storage.stat("document_state/state") is not None
+
+        StateManager(storage).upsert_ocr_entries([_entry(2)])
+        assert [e.entity_id for e in manager.pending_entities()] == ["e1", "e2"]
+
+
+class TestContentHashCache:
+    """Workspace-level content hash cache keyed by file stat."""
+
+    @pytest.fixture
+    def pdf(self, tmp_path: Path) -> Path:
+        path = tmp_path / "doc.pdf"
+        path.write_bytes(b"%PDF-1.4 test")
+        return path
+
+    @pytest.fixture
+    def hash_calls(self, monkeypatch) -> list:
+        calls = []
+        original = state_module.compute_content_hash
+
+        def counting(path, algorithm="sha256"):
+            calls.append(algorithm)
+            return original(path, algorithm)
+
+        monkeypatch.setattr(state_module, "compute_content_hash", counting)
+        return calls
+
+    def test_unchanged_file_is_not_rehashed(self, pdf, tmp_path, hash_calls) -> None:
+        (tmp_path / "ws").mkdir()
+        first = WorkspaceStorage.from_pdf(pdf, tmp_path / "ws")
+        second = WorkspaceStorage.from_pdf(pdf, tmp_path / "ws")
+
+        assert hash_calls == ["sha256"]
+        assert first.paths.document_dir == second.paths.document_dir
+        digest = compute_content_hash(pdf)
+        assert first.paths.document_dir.name == f"doc_{digest[:6]}"
+
+    def test_modified_file_is_rehashed(self, pdf, tmp_path, hash_calls) -> None:
+        (tmp_path / "ws").mkdir()
+        first = WorkspaceStorage.from_pdf(pdf, tmp_path / "ws")
+        pdf.write_bytes(b"%PDF-1.4 changed content")
+        second = WorkspaceStorage.from_pdf(pdf, tmp_path / "ws")
+
+        assert len(hash_calls) == 2
+        assert first.paths.document_dir != second.paths.document_dir
+
+    def test_no_cache_without_workspace_root(self, pdf, tmp_path, hash_calls) -> None:
+        WorkspaceStorage.from_pdf(pdf, tmp_path / "missing")
+        assert not (tmp_path / "missing").exists()
+
+    def test_blake2b_keeps_layout(self, pdf, tmp_path, monkeypatch) -> None:
+        monkeypatch.setenv("WORKSPACE_HASH", "blake2b")
+        ws = WorkspaceStorage.from_pdf(pdf, tmp_path / "ws")
+        digest = compute_content_hash(pdf, "blake2b")
+
+        assert len(digest) == 64
+        assert digest != compute_content_hash(pdf)
+        assert ws.paths.document_dir.name == f"doc_{digest[:6]}"
+
+    def test_unknown_algorithm(self, pdf) -> None:
+        with pytest.raises(ValueError):
+            compute_content_hash(pdf, "crc32")
+
+
+class TestPageImageCache:
+    """Byte-bounded LRU behind StateManager.state.pages."""
+
+    def test_evicts_least_recently_used_by_bytes(self) -> None:
+        cache = PageImageCache(max_bytes=10)
+        cache[1] = b"aaaa"
+        cache[2] = b"bbbb"
+        assert cache[1] == b"aaaa"  # page 2 becomes LRU
+        cache[3] = b"cccc"
+
+        assert sorted(cache) == [1, 3]
+        assert cache.nbytes == 8
+
+    def test_oversized_and_disabled(self) -> None:
+        cache = PageImageCache(max_bytes=4)
+        cache[1] = b"12345"
+        assert 1 not in cache
+        disabled = PageImageCache(max_bytes=0)
+        disabled[1] = b"x"
+        assert len(disabled) == 0
+
+    def test_load_page_served_from_cache_and_bounded(self) -> None:
+        class CountingMemory(MemoryStorage):
+            loads = 0
+
+            def load(self, key, default=None):
+                if key.startswith("pages/"):
+                    CountingMemory.loads += 1
+                return super().load(key, default)
+
+        storage = CountingMemory()
+        for n in range(1, 6):
+            storage.save(f"pages/{n:03d}", bytes(100))
+        manager = StateManager(storage, page_cache_bytes=250)
+
+        for _ in range(3):
+            manager.load_page(1)
+        assert CountingMemory.loads == 1
+        for n in range(1, 6):
+            manager.load_page(n)
+        assert manager.state.pages.nbytes <= 250
+        assert len(manager.state.pages) == 2
+
+    def test_budget_from_env(self, monkeypatch) -> None:
+        monkeypatch.setenv("PAGE_CACHE_MB", "3")
+        assert StateManager(MemoryStorage()).state.pages.max_bytes == 3 * 1024 * 1024
+
+
+def _resolve_page_range(pdf: str, workspace: str, pages: list) -> None:
+    """Worker process: upsert entries and page states for its own pages."""
+    ws = WorkspaceStorage.from_pdf(Path(pdf), Path(workspace))
+    manager = StateManager(WorkspaceBackend(ws), journal_compact_every=4)
+    for page in pages:
+        with manager.batch():
+            manager.upsert_ocr_entries([_entry(page * 10 + i, page=page, resolution=1) for i in range(3)])
+            manager.set_page_resolution(page, "resolved")
+    manager.close()
+
+
+class TestSharedWorkspace:
+    """Several processes/managers on one workspace document."""
+
+    @pytest.fixture
+    def workspace(self, tmp_path: Path) -> WorkspaceStorage:
+        pdf = tmp_path / "doc.pdf"
+        pdf.write_bytes(b"%PDF-1.4 test")
+        ws = WorkspaceStorage.from_pdf(pdf, tmp_path / "ws")
+        ws.ensure_initialized()
+        return ws
+
+    def test_file_lock_is_reentrant_and_exclusive(self, tmp_path: Path) -> None:
+        lock = FileLock(tmp_path / "state.lock")
+        other = FileLock(tmp_path / "state.lock", timeout=0.05)
+        with lock:
+            with lock:
+                assert lock.locked
+            with pytest.raises(TimeoutError):
+                other.acquire()
+        assert not lock.locked
+        with other:
+            assert other.locked
+
+    def test_compact_keeps_other_managers_changes(self, workspace) -> None:
+        first = StateManager(WorkspaceBackend(workspace))
+        second = StateManager(WorkspaceBackend(workspace))
+        first.load_document_state()
+        second.load_document_state()
+
+        first.upsert_ocr_entries([_entry(1, page=1)])
+        first.set_page_resolution(1, "resolved")
+        second.upsert_ocr_entries([_entry(2, page=2)])
+        second.set_page_resolution(2, "resolved")
+        first.close()
+        second.close()
+
+        data = json.loads(workspace.paths.state_json.read_text())
+        assert data["page_states"] == {"1": "resolved", "2": "resolved"}
+        assert sorted(e["entity_id"] for e in data["ocr_registry"]) == ["e1", "e2"]
+        assert len(json.loads(workspace.paths.registry_json.read_text())) == 2
+
+    def test_snapshot_merges_unseen_state(self, workspace) -> None:
+        stale = StateManager(WorkspaceBackend(workspace))
+        stale.load_document_state()
+        writer = StateManager(WorkspaceBackend(workspace))
+        writer.upsert_ocr_entries([_entry(1, page=1)])
+        writer.close()
+
+        stale.save_ocr_registry([_entry(2, page=2)])
+
+        assert [e.entity_id for e in StateManager(WorkspaceBackend(workspace)).load_ocr_registry()] == [
+            "e2",
+            "e1",
+        ]
+        assert stale.get_ocr_entry("e1") is not None
+
+    def test_page_manifest_merges_other_renders(self, workspace) -> None:
+        info = {"dpi": 150}
+        first = StateManager(WorkspaceBackend(workspace))
+        second = StateManager(WorkspaceBackend(workspace))
+        first.set_page_source(None, render_info=info)
+        second.set_page_source(None, render_info=info)
+        first.has_page(1)
+        second.has_page(2)
+
+        first.save_page(1, b"one")
+        second.save_page(2, b"two")
+
+        third = StateManager(WorkspaceBackend(workspace))
+        third.set_page_source(None, render_info=info)
+        assert third.has_page(1) and third.has_page(2)
+
+    def test_parallel_processes_on_disjoint_pages(self, workspace, tmp_path: Path) -> None:
+        ctx = multiprocessing.get_context("spawn")
+        args = (str(tmp_path / "doc.pdf"), str(tmp_path / "ws"))
+        procs = [
+            ctx.Process(target=_resolve_page_range, args=(*args, pages))
+            for pages in (list(range(1, 11)), list(range(11, 21)))
+        ]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join(timeout=120)
+            assert p.exitcode == 0
+
+        state = StateManager(WorkspaceBackend(workspace)).load_document_state()
+        assert state.page_states == {n: "resolved" for n in range(1, 21)}
+        assert len(state.ocr_registry) == 60
+        assert all(e.resolution == 1 for e in state.ocr_registry)
@@ -0,0 +1,131 @@
+"""Tests for core/transport.py — pooled keep-alive HTTP transport."""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from vlm_ocr_doc_reader.core.ocr_client import OCRConfig, QwenOCRClient
+from vlm_ocr_doc_reader.core.qwen_vlm_client import QwenVLMClient
+from vlm_ocr_doc_reader.core.transport import HTTPTransport, get_transport
+from vlm_ocr_doc_reader.schemas.config import VLMConfig
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def _reply(self, body: bytes) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self.server.peers.add(self.client_address)
+        self._reply(json.dumps({"ok": True}).encode())
+
+    def do_HEAD(self):
+        self.server.peers.add(self.client_address)
+        self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    srv.daemon_threads = True
+    srv.peers = set()
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _url(srv, path="/v1/chat/completions"):
+    return f"http://127.0.0.1:{srv.server_address[1]}{path}"
+
+
+class TestHTTPTransport:
+    def test_sequential_posts_reuse_one_connection(self, server):
+        transport = HTTPTransport()
+        for _ in range(5):
+            resp = transport.post(_url(server), json={"a": 1}, headers={}, timeout=5)
+            assert resp.json() == {"ok": True}
+        assert len(server.peers) == 1
+
+    def test_concurrent_posts_bounded_by_pool(self, server):
+        transport = HTTPTransport(pool_size=2)
+        transport.ensure_pool_size(4)
+
+        def call(_):
+            return transport.post(_url(server), json={}, headers={}, timeout=5).status_code
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            for _ in range(3):
+                assert list(pool.map(call, range(4))) == [200] * 4
+        assert transport.pool_size == 4
+        assert len(server.peers) <= 4
+
+    def test_growth_waits_for_requests_in_flight(self):
+        transport = HTTPTransport(pool_size=2)
+        adapter = transport._session.get_adapter("https://x/")
+        with transport._request():
+            transport.ensure_pool_size(6)
+            assert transport.pool_size == 2
+            assert transport._session.get_adapter("https://x/") is adapter
+        assert transport.pool_size == 6
+
+    def test_process_pool_sized_from_worker_env(self, monkeypatch):
+        from vlm_ocr_doc_reader.core import transport as transport_mod
+
+        monkeypatch.setenv("OCR_MAX_WORKERS", "24")
+        monkeypatch.setenv("VLM_SCAN_MAX_WORKERS", "oops")
+        assert transport_mod._pool_size_from_env() == 24
+        monkeypatch.setenv("OCR_MAX_WORKERS", "3")
+        assert transport_mod._pool_size_from_env() == transport_mod.DEFAULT_POOL_SIZE
+
+    def test_pool_never_shrinks(self):
+        transport = HTTPTransport(pool_size=8)
+        transport.ensure_pool_size(2)
+        assert transport.pool_size == 8
+
+    def test_preconnect_warms_pool(self, server):
+        transport = HTTPTransport()
+        assert transport.preconnect(_url(server)) is True
+        transport.post(_url(server), json={}, headers={}, timeout=5)
+        assert len(server.peers) == 1
+
+    def test_preconnect_failure_is_swallowed(self):
+        transport = HTTPTransport(connect_timeout_sec=0.5)
+        assert transport.preconnect("http://127.0.0.1:9/") is False
+
+    def test_clients_share_process_transport(self):
+        vlm = QwenVLMClient(VLMConfig(api_key="k"))
+        ocr = QwenOCRClient(OCRConfig(api_key="k"))
+        assert vlm.transport is ocr.transport is get_transport()
+
+    def test_connect_and_read_timeouts_passed_separately(self):
+        seen = {}
+
+        class Recording(HTTPTransport):
+            def post(self, url, json, headers, timeout):
+                seen["timeout"] = timeout
+                raise RuntimeError("stop")
+
+        client = QwenVLMClient(
+            VLMConfig(api_key="k", timeout_sec=90, connect_timeout_sec=3, max_retries=1),
+            transport=Recording(),
+        )
+        with pytest.raises(RuntimeError):
+            client._post_with_retry({"model": "m"})
+        assert seen["timeout"] == (3, 90)
@@ -129,3 +129,68 @@ class TestVLMAgentReal:
         )
         assert result2["text"] is not None
         assert "банан" in result2["text"].lower()
+
+
+class _RecordingClient:
+    """Fake VLM client that records the messages it was sent."""
+
+    def __init__(self):
+        self.calls = []
+
+    def invoke(self, messages, tools=None):
+        self.calls.append(messages)
+        return {
+            "message": {"role": "assistant", "content": "ok", "tool_calls": None},
+            "usage": {"prompt_tokens": 42, "completion_tokens": 1},
+        }
+
+
+class TestVLMAgentStateless:
+    """invoke_stateless sends system + one user turn and keeps history intact."""
+
+    def test_history_not_accumulated(self):
+        client = _RecordingClient()
+        agent = VLMAgent(client)
+        agent.set_system_prompt("sys")
+
+        first = agent.invoke_stateless("a", [b"img1"])
+        second = agent.invoke_stateless("b", [b"img2"])
+
+        assert [m["role"] for m in client.calls[0]] == ["system", "user"]
+        assert [m["role"] for m in client.calls[1]] == ["system", "user"]
+        assert agent.messages == [{"role": "system", "content": "sys"}]
+        assert first["request_bytes"] == second["request_bytes"]
+        assert first["usage"] == {"prompt_tokens": 42, "completion_tokens": 1}
+
+    def test_request_bytes_counts_text_and_images(self):
+        client = _RecordingClient()
+        agent = VLMAgent(client)
+        agent.set_system_prompt("сис")
+
+        result = agent.invoke_stateless("ab", [b"\x89PNG-img"])
+
+        url = client.calls[0][1]["content"][1]["image_url"]["url"]
+        assert result["request_bytes"] == len("сис".encode("utf-8")) + 2 + len(url)
+
+    def test_without_system_prompt(self):
+        client = _RecordingClient()
+        agent = VLMAgent(client)
+
+        result = agent.invoke_stateless("a", [])
+
+        assert client.calls[0] == [{"role": "user", "content": "a"}]
+        assert result["text"] == "ok"
+
+    def test_data_url_mime_follows_image_bytes(self):
+        client = _RecordingClient()
+        agent = VLMAgent(client)
+
+        agent.invoke_stateless("a", [b"\x89PNG\r\n", b"\xff\xd8\xff\xe0jpeg"])
+
+        urls = [
+            p["image_url"]["url"]
+            for p in client.calls[0][-1]["content"]
+            if p["type"] == "image_url"
+        ]
+        assert urls[0].startswith("data:image/png;base64,")
+        assert urls[1].startswith("data:image/jpeg;base64,")
@@ -0,0 +1,86 @@
+"""Tests for payload image encodings."""
+
+import io
+
+import pytest
+from PIL import Image, ImageDraw, ImageFilter
+
+from vlm_ocr_doc_reader.preprocessing.encoding import (
+    ImageEncoding,
+    encode_image,
+    image_mime,
+)
+
+
+@pytest.fixture
+def page_png() -> bytes:
+    """A scan-like RGB page (paper noise, soft text edges) encoded as PNG."""
+    img = Image.effect_noise((600, 800), 24).convert("RGB")
+    img = Image.blend(img, Image.new("RGB", img.size, (235, 230, 220)), 0.6)
+    draw = ImageDraw.Draw(img)
+    for y in range(20, 780, 18):
+        draw.text((20, y), "Lorem ipsum dolor sit amet 0123456789 " * 2, fill="black")
+    img = img.filter(ImageFilter.GaussianBlur(0.6))
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+class TestImageEncoding:
+    def test_format_normalized(self):
+        assert ImageEncoding(format="jpg").format == "JPEG"
+        assert ImageEncoding(format="webp").mime == "image/webp"
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [{"format": "gif"}, {"quality": 0}, {"png_compress_level": 10}],
+    )
+    def test_invalid_values(self, kwargs):
+        with pytest.raises(ValueError):
+            ImageEncoding(**kwargs)
+
+    def test_from_env_unset(self, monkeypatch):
+        for suffix in ("FORMAT", "QUALITY", "GRAYSCALE", "PNG_LEVEL"):
+            monkeypatch.delenv(f"SCAN_IMAGE_{suffix}", raising=False)
+        assert ImageEncoding.from_env("SCAN_IMAGE") is None
+
+    def test_from_env(self, monkeypatch):
+        monkeypatch.setenv("OCR_IMAGE_FORMAT", "jpeg")
+        monkeypatch.setenv("OCR_IMAGE_QUALITY", "70")
+        monkeypatch.setenv("OCR_IMAGE_GRAYSCALE", "1")
+        enc = ImageEncoding.from_env("OCR_IMAGE")
+        assert enc == ImageEncoding(format="JPEG", quality=70, grayscale=True)
+
+    def test_from_env_invalid_falls_back(self, monkeypatch):
+        monkeypatch.setenv("OCR_IMAGE_FORMAT", "bmp")
+        assert ImageEncoding.from_env("OCR_IMAGE") is None
+
+
+class TestEncodeImage:
+    def test_none_is_passthrough(self, page_png):
+        data, mime = encode_image(page_png, None)
+        assert data is page_png
+        assert mime == "image/png"
+
+    def test_default_png_is_passthrough(self, page_png):
+        data, _ = encode_image(page_png, ImageEncoding())
+        assert data is page_png
+
+    @pytest.mark.parametrize("fmt,mime", [("JPEG", "image/jpeg"), ("WEBP", "image/webp")])
+    def test_lossy_formats_smaller(self, page_png, fmt, mime):
+        data, out_mime = encode_image(page_png, ImageEncoding(format=fmt, quality=75))
+        assert out_mime == mime
+        assert image_mime(data) == mime
+        assert len(data) * 3 < len(page_png)
+        assert Image.open(io.BytesIO(data)).size == (600, 800)
+
+    def test_grayscale(self, page_png):
+        data, mime = encode_image(page_png, ImageEncoding(grayscale=True))
+        assert mime == "image/png"
+        assert Image.open(io.BytesIO(data)).mode == "L"
+
+    def test_png_compress_level(self, page_png):
+        fast, _ = encode_image(page_png, ImageEncoding(png_compress_level=1))
+        best, _ = encode_image(page_png, ImageEncoding(png_compress_level=9))
+        assert len(best) <= len(fast)
+        assert Image.open(io.BytesIO(best)).tobytes() == Image.open(io.BytesIO(page_png)).tobytes()
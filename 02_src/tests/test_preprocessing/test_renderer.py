@@ -179,6 +179,7 @@ def test_render_config_defaults() -> None:
     assert config.dpi == 150
     assert config.quality == 85
     assert config.format == "PNG"
+    assert config.workers == 1
 
 
 def test_render_config_custom() -> None:
@@ -187,3 +188,81 @@ def test_render_config_custom() -> None:
     assert config.dpi == 200
     assert config.quality == 90
     assert config.format == "JPEG"
+
+
+def test_render_pdf_parallel_matches_serial(tmp_path: Path) -> None:
+    """Process-pool rendering yields the same bytes, in page order."""
+    import fitz
+
+    pdf_path = tmp_path / "many.pdf"
+    doc = fitz.open()
+    for page_num in range(9):
+        page = doc.new_page(width=300, height=300)
+        page.insert_text((30, 60), f"Page {page_num + 1}", fontsize=18)
+    doc.save(pdf_path)
+    doc.close()
+
+    serial = PDFRenderer(RenderConfig(dpi=72)).render_pdf(pdf_path)
+    parallel = PDFRenderer(RenderConfig(dpi=72, workers=3)).render_pdf(pdf_path)
+
+    assert [n for n, _ in parallel] == list(range(1, 10))
+    assert parallel == serial
+
+
+def test_iter_render_pdf_respects_index_order(sample_pdf: Path) -> None:
+    """iter_render_pdf streams pages in the order of page_indices."""
+    renderer = PDFRenderer(RenderConfig(dpi=72, workers=2))
+    page_nums = [n for n, _ in renderer.iter_render_pdf(sample_pdf, [2, 0, 1])]
+    assert page_nums == [3, 1, 2]
+
+
+def test_iter_render_pdf_bounds_in_flight_ranges(tmp_path: Path, monkeypatch) -> None:
+    """At most 2 x workers ranges are submitted ahead of the consumer."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    import fitz
+
+    from vlm_ocr_doc_reader.preprocessing import renderer as renderer_mod
+
+    pdf_path = tmp_path / "many.pdf"
+    doc = fitz.open()
+    for _ in range(12):
+        doc.new_page(width=100, height=100)
+    doc.save(pdf_path)
+    doc.close()
+
+    submitted: List[int] = []
+
+    class RecordingPool(ThreadPoolExecutor):
+        def submit(self, fn, *args, **kwargs):
+            submitted.append(1)
+            return super().submit(fn, *args, **kwargs)
+
+    monkeypatch.setattr(renderer_mod, "ProcessPoolExecutor", RecordingPool)
+    monkeypatch.setattr(renderer_mod, "_PAGES_PER_TASK", 1)
+
+    pages = PDFRenderer(RenderConfig(dpi=72, workers=2)).iter_render_pdf(pdf_path)
+    assert next(pages)[0] == 1
+    assert len(submitted) == 5  # window of 4, plus one refill
+    pages.close()
+    assert len(submitted) == 5
+
+
+def test_pixmap_fast_path_matches_pil_stamp(sample_pdf: Path) -> None:
+    """Fast path is pixel-identical to stamping the full page with PIL."""
+    import fitz
+
+    renderer = PDFRenderer(RenderConfig(dpi=100))
+    fast = Image.open(io.BytesIO(renderer.render_page(sample_pdf, page_num=2)))
+
+    doc = fitz.open(sample_pdf)
+    try:
+        pix = doc.load_page(1).get_pixmap(dpi=100)
+        reference = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+        PDFRenderer._stamp_page_number(reference, 2, len(doc))
+    finally:
+        doc.close()
+
+    assert fast.mode == "RGB"
+    assert fast.size == reference.size
+    assert fast.tobytes() == reference.tobytes()
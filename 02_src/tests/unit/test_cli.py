@@ -164,7 +164,25 @@ class TestMainSubcommands:
 
         assert result == 0
         mock_reader_class.open.assert_called_once_with(mock_pdf_path, None)
-        mock_reader.scan.assert_called_once_with(pages=None)
+        mock_reader.scan.assert_called_once_with(pages=None, max_workers=None)
+
+    @patch("vlm_ocr_doc_reader.cli.load_dotenv")
+    @patch("vlm_ocr_doc_reader.cli.DocumentReader")
+    @patch("sys.argv", ["vlm-ocr-reader", "scan", "test.pdf", "--scan-workers", "4"])
+    def test_main_scan_workers(
+        self, mock_reader_class, mock_load_dotenv, mock_pdf_path, mock_env_with_api_key, monkeypatch
+    ):
+        """Test scan subcommand passes --scan-workers as max_workers."""
+        monkeypatch.setenv("DASHSCOPE_API_KEY", mock_env_with_api_key["DASHSCOPE_API_KEY"])
+        mock_reader = MagicMock()
+        mock_reader.page_status.return_value = {}
+        mock_reader_class.open.return_value = mock_reader
+
+        with patch("vlm_ocr_doc_reader.cli.Path", return_value=mock_pdf_path):
+            result = main()
+
+        assert result == 0
+        mock_reader.scan.assert_called_once_with(pages=None, max_workers=4)
 
     @patch("vlm_ocr_doc_reader.cli.load_dotenv")
     @patch("vlm_ocr_doc_reader.cli.DocumentReader")
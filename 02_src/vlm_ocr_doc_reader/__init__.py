@@ -24,8 +24,9 @@ from .operations.full_description import FullDescriptionOperation
 # Schemas - Config
 from .schemas.config import ProcessorConfig, VLMConfig, OCRConfig
 from .schemas.document import DocumentData, HeaderInfo, TableInfo
-from .schemas.common import PageInfo, ClusterInfo, TriageResult
+from .schemas.common import PageInfo, LazyPageInfo, ClusterInfo, TriageResult
 from .preprocessing.renderer import RenderConfig
+from .preprocessing.encoding import ImageEncoding
 
 # Resolution Levels types (ADR-001)
 from .core.state import PageResolution, OCRRegistryEntry, open_document
@@ -53,6 +54,7 @@ __all__ = [
     "VLMConfig",
     "OCRConfig",
     "RenderConfig",
+    "ImageEncoding",
 
     # Schemas - Document
     "DocumentData",
@@ -61,6 +63,7 @@ __all__ = [
 
     # Schemas - Common
     "PageInfo",
+    "LazyPageInfo",
     "ClusterInfo",
     "TriageResult",
 
@@ -174,7 +174,7 @@ def cmd_scan(args: argparse.Namespace) -> int:
     try:
         pages = parse_pages_arg(args.pages) if args.pages else None
         reader = DocumentReader.open(args.pdf_path, args.workspace)
-        reader.scan(pages=pages)
+        reader.scan(pages=pages, max_workers=args.scan_workers)
         status = reader.page_status()
         logger.info(f"scan: {len(status)} pages processed")
         print(f"Scan completed. Pages: {list(status.keys())}")
@@ -249,7 +249,7 @@ def cmd_full_description(args: argparse.Namespace) -> int:
 
     try:
         reader = DocumentReader.open(args.pdf_path, args.workspace)
-        reader.scan()
+        reader.scan(max_workers=args.scan_workers)
         reader.resolve()
         data = reader.get_document_data()
         logger.info("full-description completed")
@@ -295,6 +295,16 @@ def _add_pages_arg(parser: argparse.ArgumentParser) -> None:
     )
 
 
+def _add_scan_workers_arg(parser: argparse.ArgumentParser) -> None:
+    """Add --scan-workers argument for scan/full-description."""
+    parser.add_argument(
+        "--scan-workers",
+        type=int,
+        default=None,
+        help="Parallel VLM scan batches (default: env VLM_SCAN_MAX_WORKERS or 1)",
+    )
+
+
 def main() -> int:
     """Main CLI entry point. Subcommands: scan, resolve, verify, full-description."""
     ensure_utf8_stdio()
@@ -304,7 +314,7 @@ def main() -> int:
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
-  vlm-ocr-reader scan document.pdf --workspace ./ws
+  vlm-ocr-reader scan document.pdf --workspace ./ws --scan-workers 4
   vlm-ocr-reader resolve document.pdf -w ./ws --pages 1,3-5
   vlm-ocr-reader verify document.pdf
   vlm-ocr-reader full-description document.pdf
@@ -317,6 +327,7 @@ Examples:
     p_scan = subparsers.add_parser("scan", help="Level 0: VLM-only scan")
     _add_common_args(p_scan)
     _add_pages_arg(p_scan)
+    _add_scan_workers_arg(p_scan)
     p_scan.set_defaults(func=cmd_scan)
 
     # resolve
@@ -327,7 +338,10 @@ Examples:
         "--chunk-size",
         type=int,
         default=None,
-        help="OCR chunk size: number of prompts per request (default: env OCR_CHUNK_SIZE or 5)",
+        help=(
+            "OCR chunk size: number of prompts per request "
+            "(default: env OCR_CHUNK_SIZE or 5; OCR_CHUNK_SIZE=auto adapts per page)"
+        ),
     )
     p_resolve.add_argument(
         "--max-workers",
@@ -364,6 +378,7 @@ Examples:
         help="Scan + resolve all pages (backward compatibility)",
     )
     _add_common_args(p_full)
+    _add_scan_workers_arg(p_full)
     p_full.set_defaults(func=cmd_full_description)
 
     args = parser.parse_args()
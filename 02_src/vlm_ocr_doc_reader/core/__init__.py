@@ -5,6 +5,7 @@ from .state import (
     MemoryStorage,
     DiskStorage,
     DocumentState,
+    PageImageCache,
     StateManager,
     # Resolution Levels (ADR-001)
     ResolutionLevel,
@@ -17,6 +18,7 @@ from .state import (
     WorkspacePaths,
     WorkspaceStorage,
     compute_content_hash,
+    cached_content_hash,
     build_document_subdir_name,
     open_document,
 )
@@ -39,6 +41,7 @@ __all__ = [
     "MemoryStorage",
     "DiskStorage",
     "DocumentState",
+    "PageImageCache",
     "StateManager",
     # Resolution Levels (ADR-001)
     "ResolutionLevel",
@@ -51,6 +54,7 @@ __all__ = [
     "WorkspacePaths",
     "WorkspaceStorage",
     "compute_content_hash",
+    "cached_content_hash",
     "build_document_subdir_name",
     "open_document",
     # OCR
@@ -0,0 +1,111 @@
+"""Workspace-level content-addressed blob store shared by all documents.
+
+Workspaces hold many documents whose pages repeat (cover sheets, standard
+terms, form templates). BlobStore keeps each distinct payload once under
+{workspace}/blobs/objects/ab/cdef..., addressed by its SHA-256; documents
+keep only refs (see WorkspaceBackend). The same directory holds memoized
+results keyed by content (memo/), so a batch of pages already scanned in
+another document is not sent to the VLM again, and the OCR response cache
+(ocr_cache.sqlite3) shared across documents.
+
+Blobs are immutable and written atomically; concurrent writers of the same
+blob race harmlessly. Nothing is garbage-collected.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+BLOBS_DIRNAME = "blobs"
+
+
+class BlobStore:
+    """Immutable blobs by SHA-256 plus a small JSON memo namespace.
+
+    Args:
+        root: Store directory (normally {workspace}/blobs, created if missing)
+    """
+
+    def __init__(self, root: Union[Path, str]) -> None:
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.memo_dir = self.root / "memo"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.memo_dir.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.stores = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_workspace(cls, workspace: Union[Path, str]) -> "BlobStore":
+        return cls(Path(workspace) / BLOBS_DIRNAME)
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def _object_path(self, digest: str) -> Path:
+        if len(digest) < 3 or not all(c in "0123456789abcdef" for c in digest):
+            raise ValueError(f"Invalid blob digest: {digest!r}")
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+
+    def put(self, data: bytes) -> str:
+        """Store `data` (once) and return its digest."""
+        digest = self.digest(data)
+        path = self._object_path(digest)
+        if path.exists():
+            with self._lock:
+                self.hits += 1
+            return digest
+        self._write_atomic(path, bytes(data))
+        with self._lock:
+            self.stores += 1
+        return digest
+
+    def get(self, digest: str) -> Optional[bytes]:
+        path = self._object_path(digest)
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def exists(self, digest: str) -> bool:
+        return self._object_path(digest).exists()
+
+    # --- memo: results keyed by content (e.g. scan batch payloads) ---
+
+    def get_memo(self, key: str) -> Optional[Any]:
+        path = self._object_path_in(self.memo_dir, key)
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            logger.warning(f"BlobStore: unreadable memo {key}, ignoring")
+            return None
+
+    def put_memo(self, key: str, value: Any) -> None:
+        path = self._object_path_in(self.memo_dir, key)
+        self._write_atomic(path, json.dumps(value, ensure_ascii=False).encode("utf-8"))
+
+    def _object_path_in(self, base: Path, key: str) -> Path:
+        self._object_path(key)  # validates key
+        return base / key[:2] / f"{key[2:]}.json"
+
+
+__all__ = ["BlobStore", "BLOBS_DIRNAME"]
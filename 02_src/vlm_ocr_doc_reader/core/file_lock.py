@@ -0,0 +1,130 @@
+"""Advisory inter-process file lock for workspace documents.
+
+Several processes may work on one workspace document (e.g. `resolve
+--pages` on disjoint page ranges). FileLock serializes their
+read-modify-write of shared state files: fcntl.flock on POSIX,
+msvcrt.locking on Windows. The OS drops the lock when its holder exits,
+so a crashed process never leaves the document locked.
+
+The lock is reentrant within a process (nested `with` blocks on the same
+FileLock join the outer one) and also excludes other threads.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import IO, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+
+def _try_lock(f: IO[bytes]) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(f: IO[bytes]) -> None:
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class FileLock:
+    """Reentrant exclusive lock on `path` (created if missing).
+
+    Args:
+        path: Lock file (its content is irrelevant)
+        timeout: Seconds to wait for the lock; None waits indefinitely
+        poll_interval: Seconds between attempts while another process holds it
+    """
+
+    def __init__(
+        self,
+        path: Union[Path, str],
+        timeout: Optional[float] = None,
+        poll_interval: float = 0.01,
+    ) -> None:
+        self.path = Path(path)
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._file: Optional[IO[bytes]] = None
+
+    @property
+    def locked(self) -> bool:
+        """True while held by this process."""
+        return self._depth > 0
+
+    def acquire(self) -> None:
+        """Take the lock, waiting for other processes and threads.
+
+        Raises:
+            TimeoutError: If not acquired within `timeout` seconds
+        """
+        if not self._thread_lock.acquire(
+            timeout=-1 if self.timeout is None else self.timeout
+        ):
+            raise TimeoutError(f"Timed out waiting for lock {self.path}")
+        if self._depth:
+            self._depth += 1
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            f = self.path.open("a+b")
+            start = time.monotonic()
+            waited = False
+            while not _try_lock(f):
+                if self.timeout is not None and time.monotonic() - start >= self.timeout:
+                    f.close()
+                    raise TimeoutError(f"Timed out waiting for lock {self.path}")
+                if not waited:
+                    logger.debug(f"FileLock: waiting for {self.path}")
+                    waited = True
+                time.sleep(self.poll_interval)
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        self._file = f
+        self._depth = 1
+
+    def release(self) -> None:
+        """Release one level; the file lock is dropped by the outermost release."""
+        if not self._depth:
+            raise RuntimeError(f"FileLock {self.path} is not held")
+        self._depth -= 1
+        if not self._depth:
+            f, self._file = self._file, None
+            try:
+                _unlock(f)
+            finally:
+                f.close()
+        self._thread_lock.release()
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.release()
+
+
+__all__ = ["FileLock"]
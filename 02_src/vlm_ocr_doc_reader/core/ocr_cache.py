@@ -0,0 +1,130 @@
+"""Disk-backed, content-addressed cache of parsed OCR responses.
+
+The same (page image, prompts, model) request is sent again when resolve is
+rerun after a crash, when scripts/ocr_chunk_grid.py resets a workspace, and
+when template pages repeat across documents. OCRResponseCache stores the
+parsed per-task results of each successful extract_batch call in a single
+SQLite file and evicts least recently used entries past a byte budget.
+
+Keys are computed by the caller (see QwenOCRClient._cache_key) and cover
+everything that changes the answer: image hash, ordered prompt list (chunk
+composition), system-prompt version, model and payload encoding.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+_DB_NAME = "ocr_cache.sqlite3"
+
+
+class OCRResponseCache:
+    """Thread-safe LRU cache {key -> list of parsed task results} on disk.
+
+    Args:
+        root: Directory holding the cache database (created if missing)
+        max_bytes: Byte budget for stored results; oldest entries beyond it
+            are evicted on put()
+    """
+
+    def __init__(self, root: Union[Path, str], max_bytes: int) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max(0, int(max_bytes))
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.root / _DB_NAME), check_same_thread=False, timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_last_used ON entries(last_used)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return cached results for `key` (and mark them recently used)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, results: List[Dict[str, Any]]) -> None:
+        """Store results for `key`, then evict LRU entries over max_bytes."""
+        value = json.dumps(results, ensure_ascii=False)
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries(key, value, size, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, size, time.time()),
+            )
+            self.stores += 1
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT key, size FROM entries ORDER BY last_used ASC"
+        ).fetchall()
+        doomed = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
+        self.evictions += len(doomed)
+        logger.debug(f"OCR cache: evicted {len(doomed)} entries")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def stats(self) -> Dict[str, int]:
+        """Counters since this instance was created."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+__all__ = ["OCRResponseCache"]
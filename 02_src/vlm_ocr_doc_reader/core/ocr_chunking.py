@@ -0,0 +1,200 @@
+"""Adaptive chunk sizing for multi-question OCR requests.
+
+The best number of prompts per OCR call depends on the page and the prompts
+(see scripts/ocr_chunk_grid.py): short field lookups on a sparse form batch
+well, long prompts on a dense page make the model drop [ЗАДАЧА N] blocks.
+AdaptiveChunker learns a chunk size per (OCR model, prompt-length class)
+with additive increase / multiplicative decrease:
+
+- a chunk with too many missing blocks (before repair) shrinks the size; a
+  call that timed out or returned an unparseable/empty response counts as
+  all blocks missing (connection, auth, rate-limit and open-circuit errors
+  are not observed);
+- a chunk slower than the latency target shrinks it a little;
+- otherwise a full-size chunk grows it by `step`.
+
+A prompt-token budget caps every request regardless of the learned size.
+Responses served from the OCR response cache are not observed.
+Tuning state is saved to {workspace}/ocr_chunking.json, so later runs (and
+other documents in the workspace) start from the learned values.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, TypeVar
+
+logger = logging.getLogger(__name__)
+
+TUNING_FILENAME = "ocr_chunking.json"
+
+T = TypeVar("T")
+
+# Upper bounds (estimated tokens per prompt) of the prompt-length classes
+_PROMPT_CLASSES = (("short", 16), ("medium", 48), ("long", math.inf))
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~3 characters per token for Russian/English text)."""
+    return max(1, math.ceil(len(text) / 3))
+
+
+@dataclass
+class ChunkTuning:
+    """Learned state of one (model, prompt class) bucket."""
+
+    size: float
+    calls: int = 0
+    tasks: int = 0
+    missing: int = 0
+    latency_s: float = 0.0  # exponential moving average per call
+
+
+class AdaptiveChunker:
+    """Per-page chunk planner that learns from completed OCR calls (thread-safe).
+
+    Args:
+        model: OCR model name (part of the bucket key)
+        initial_size: Starting size for buckets without history
+        min_size: Smallest chunk size
+        max_size: Largest chunk size
+        target_missing_rate: Tolerated share of tasks missing from a response
+        target_latency_s: Calls slower than this shrink the chunk
+        max_prompt_tokens: Budget of prompt tokens per request
+        step: Additive increase after a clean full-size chunk
+        path: Tuning file to load from and save to (None = in memory only)
+    """
+
+    def __init__(
+        self,
+        model: str = "",
+        initial_size: int = 5,
+        min_size: int = 1,
+        max_size: int = 20,
+        target_missing_rate: float = 0.05,
+        target_latency_s: float = 30.0,
+        max_prompt_tokens: int = 1200,
+        step: float = 1.0,
+        path: Optional[Path] = None,
+    ) -> None:
+        self.model = model
+        self.initial_size = initial_size
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_missing_rate = target_missing_rate
+        self.target_latency_s = target_latency_s
+        self.max_prompt_tokens = max_prompt_tokens
+        self.step = step
+        self.path = Path(path) if path is not None else None
+        self._buckets: Dict[str, ChunkTuning] = {}
+        self._lock = threading.Lock()
+        if self.path is not None:
+            self._load()
+
+    # --- planning ---
+
+    @staticmethod
+    def prompt_class(prompts: Sequence[str]) -> str:
+        avg = sum(estimate_tokens(p) for p in prompts) / max(1, len(prompts))
+        return next(name for name, bound in _PROMPT_CLASSES if avg <= bound)
+
+    def _key(self, prompts: Sequence[str]) -> str:
+        return f"{self.model}|{self.prompt_class(prompts)}"
+
+    def _tuning(self, key: str) -> ChunkTuning:
+        tuning = self._buckets.get(key)
+        if tuning is None:
+            tuning = self._buckets[key] = ChunkTuning(size=float(self.initial_size))
+        return tuning
+
+    def chunk_size(self, prompts: Sequence[str]) -> int:
+        """Current size for a page with these prompts, capped by the token budget."""
+        with self._lock:
+            size = int(self._tuning(self._key(prompts)).size)
+        avg_tokens = sum(estimate_tokens(p) for p in prompts) / max(1, len(prompts))
+        by_budget = max(1, int(self.max_prompt_tokens // avg_tokens))
+        return max(self.min_size, min(size, by_budget, self.max_size))
+
+    def split(self, items: Sequence[T], prompts: Sequence[str]) -> List[List[T]]:
+        """Split one page's items into balanced chunks of at most chunk_size()."""
+        if not items:
+            return []
+        size = self.chunk_size(prompts)
+        n_chunks = math.ceil(len(items) / size)
+        base, extra = divmod(len(items), n_chunks)
+        chunks: List[List[T]] = []
+        start = 0
+        for i in range(n_chunks):
+            end = start + base + (1 if i < extra else 0)
+            chunks.append(list(items[start:end]))
+            start = end
+        return chunks
+
+    # --- learning ---
+
+    def observe(self, prompts: Sequence[str], latency_s: float, missing: int) -> None:
+        """Record one completed call: its prompts, latency and missing-block count."""
+        if not prompts:
+            return
+        n = len(prompts)
+        with self._lock:
+            tuning = self._tuning(self._key(prompts))
+            tuning.calls += 1
+            tuning.tasks += n
+            tuning.missing += missing
+            tuning.latency_s = (
+                latency_s if tuning.calls == 1 else 0.7 * tuning.latency_s + 0.3 * latency_s
+            )
+            before = tuning.size
+            if missing / n > self.target_missing_rate:
+                tuning.size = max(float(self.min_size), min(tuning.size, n) * 0.7)
+            elif latency_s > self.target_latency_s:
+                tuning.size = max(float(self.min_size), tuning.size * 0.85)
+            elif n >= int(tuning.size):
+                tuning.size = min(float(self.max_size), tuning.size + self.step)
+        if int(tuning.size) != int(before):
+            logger.debug(
+                f"AdaptiveChunker: {self._key(prompts)} size {before:.1f} -> {tuning.size:.1f} "
+                f"(tasks={n} missing={missing} latency={latency_s:.1f}s)"
+            )
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {key: asdict(t) for key, t in self._buckets.items()}
+
+    # --- persistence ---
+
+    def _load(self) -> None:
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except ValueError:
+            logger.warning(f"AdaptiveChunker: unreadable {self.path}, starting fresh")
+            return
+        for key, data in (raw.get("buckets") or {}).items():
+            try:
+                tuning = ChunkTuning(**data)
+            except TypeError:
+                continue
+            tuning.size = max(float(self.min_size), min(float(self.max_size), tuning.size))
+            self._buckets[key] = tuning
+
+    def save(self) -> None:
+        """Write the tuning file (atomic; no-op without a path)."""
+        if self.path is None:
+            return
+        payload = {"version": 1, "buckets": self.stats()}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        tmp.replace(self.path)
+
+
+__all__ = ["AdaptiveChunker", "ChunkTuning", "TUNING_FILENAME", "estimate_tokens"]
@@ -7,17 +7,26 @@ over extract_batch([prompt])[0] so single-prompt callers stay the same shape.
 from __future__ import annotations
 
 import base64
+import hashlib
+import json
 import logging
 import os
 import re
+import threading
 import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from dataclasses import dataclass
-from io import BytesIO
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
-from PIL import Image
+
+from ..preprocessing.encoding import ImageEncoding, encode_image
+from .ocr_cache import OCRResponseCache
+from .rate_limit import estimate_payload_tokens, get_rate_limiter, parse_retry_after
+from .retry import CircuitOpenError, RetryPolicy, get_circuit_breaker
+from .transport import DEFAULT_CONNECT_TIMEOUT_SEC, HTTPTransport, get_transport
 
 logger = logging.getLogger(__name__)
 
@@ -33,17 +42,54 @@ class OCRConfig:
     Attributes:
         api_key: DashScope API key (from env DASHSCOPE_API_KEY / QWEN_API_KEY)
         model: Model name (default: qwen-vl-ocr-2025-11-20)
-        timeout_sec: Request timeout in seconds
+        timeout_sec: Read timeout in seconds
+        connect_timeout_sec: TCP/TLS connect timeout in seconds
         max_retries: Maximum number of retry attempts
-        backoff_base: Base for exponential backoff calculation
+        backoff_base: Growth factor of the jittered backoff (each delay is at
+            most backoff_base x the previous one, see RetryPolicy)
+        image_encoding: Payload image encoding (from env OCR_IMAGE_* when
+            not given; None sends the stored PNG)
+        encoded_cache_size: Max pages whose encoded payload image is kept
+            for reuse across chunks, verify axes and threads
+        cache_dir: Directory of the opt-in disk cache of parsed responses
+            (from env OCR_CACHE_DIR when not given; None disables it)
+        cache_max_mb: Size budget of the response cache in MB (env
+            OCR_CACHE_MAX_MB, default 64); LRU entries beyond it are evicted
+        repair_retries: Follow-up requests per extract_batch that re-ask only
+            the tasks whose [ЗАДАЧА N] block was missing (env
+            OCR_REPAIR_RETRIES, default 2; 0 disables the repair pass)
     """
     api_key: Optional[str] = None
     model: str = "qwen-vl-ocr-2025-11-20"
     timeout_sec: int = 60
+    connect_timeout_sec: float = DEFAULT_CONNECT_TIMEOUT_SEC
     max_retries: int = 3
     backoff_base: float = 1.5
+    image_encoding: Optional[ImageEncoding] = None
+    encoded_cache_size: int = 16
+    cache_dir: Optional[Path] = None
+    cache_max_mb: Optional[int] = None
+    repair_retries: Optional[int] = None
 
     def __post_init__(self):
+        if self.cache_dir is None:
+            raw_dir = os.getenv("OCR_CACHE_DIR", "").strip()
+            self.cache_dir = Path(raw_dir) if raw_dir else None
+        if self.cache_max_mb is None:
+            raw = os.getenv("OCR_CACHE_MAX_MB", "64").strip()
+            try:
+                value = int(raw)
+                self.cache_max_mb = value if value > 0 else 64
+            except ValueError:
+                self.cache_max_mb = 64
+        if self.repair_retries is None:
+            raw = os.getenv("OCR_REPAIR_RETRIES", "2").strip()
+            try:
+                self.repair_retries = max(0, int(raw))
+            except ValueError:
+                self.repair_retries = 2
+        if self.image_encoding is None:
+            self.image_encoding = ImageEncoding.from_env("OCR_IMAGE")
         if self.api_key is None:
             self.api_key = os.getenv("DASHSCOPE_API_KEY") or os.getenv("QWEN_API_KEY")
         if not self.api_key:
@@ -62,11 +108,15 @@ class BaseOCRClient(ABC):
         image: bytes,
         prompts: List[str],
         page_num: int,
+        use_cache: bool = True,
     ) -> List[Dict[str, Any]]:
         """Extract multiple values from one image in a single request.
 
         Returns one result dict per prompt, in the same order. Each dict has
         keys: status ("ok"|"no_data"|"error"), value, context, explanation.
+        Results served from a response cache carry "cached": True.
+        use_cache=False forces a fresh request on clients with a response
+        cache (verify needs independent samples); others ignore it.
         """
         raise NotImplementedError
 
@@ -198,29 +248,97 @@ _SYSTEM_PROMPT = (
     "ПОЯСНЕНИЕ: Email на странице отсутствует"
 )
 
+# Part of the response-cache key. The leading number must be bumped when the
+# user-text template in _build_payload changes; the hash tracks _SYSTEM_PROMPT.
+_PROMPT_VERSION = "1-" + hashlib.blake2b(
+    _SYSTEM_PROMPT.encode("utf-8"), digest_size=6
+).hexdigest()
+
 
 class QwenOCRClient(BaseOCRClient):
     """Qwen VL OCR client (DashScope OpenAI-compatible endpoint, multi-question)."""
 
-    def __init__(self, config: OCRConfig) -> None:
+    def __init__(
+        self,
+        config: OCRConfig,
+        transport: Optional[HTTPTransport] = None,
+    ) -> None:
         self.config = config
         self.endpoint = "https://dashscope-intl.aliyuncs.com/compatible-mode/v1"
+        # Keep-alive pool shared with the VLM client (process-wide by default)
+        self.transport = transport or get_transport()
+        # Per-key quota budget shared with QwenVLMClient (requests/s, tokens/min)
+        self.rate_limiter = get_rate_limiter(f"dashscope:{config.api_key}")
+        self.circuit = get_circuit_breaker(f"dashscope:{config.api_key}")
+        self.retry_policy = RetryPolicy(factor=config.backoff_base)
+        # image hash -> (base64, mime), LRU-bounded by config.encoded_cache_size
+        self._encoded: "OrderedDict[bytes, Tuple[str, str]]" = OrderedDict()
+        self._encoded_lock = threading.Lock()
+        self.cache: Optional[OCRResponseCache] = None
+        if config.cache_dir is not None:
+            self.cache = OCRResponseCache(
+                config.cache_dir, config.cache_max_mb * 1024 * 1024
+            )
 
     def _build_url(self) -> str:
         return f"{self.endpoint}/chat/completions"
 
     @staticmethod
     def _image_to_base64(image_bytes: bytes) -> str:
-        img = Image.open(BytesIO(image_bytes))
-        buf = BytesIO()
-        img.save(buf, format="PNG")
-        return base64.b64encode(buf.getvalue()).decode("utf-8")
+        """Base64 of the image bytes as is (stored pages are already PNG)."""
+        return base64.b64encode(image_bytes).decode("utf-8")
+
+    @staticmethod
+    def _image_digest(image_bytes: bytes) -> bytes:
+        return hashlib.blake2b(image_bytes, digest_size=16).digest()
+
+    def _encode_image(
+        self,
+        image_bytes: bytes,
+        digest: Optional[bytes] = None,
+    ) -> Tuple[str, str]:
+        """Encode the page per config.image_encoding -> (base64, mime).
+
+        Results are cached by image hash, so chunks of the same page, verify
+        axes and concurrent workers encode each page once.
+        """
+        key = digest or self._image_digest(image_bytes)
+        with self._encoded_lock:
+            cached = self._encoded.get(key)
+            if cached is not None:
+                self._encoded.move_to_end(key)
+                return cached
+
+        data, mime = encode_image(image_bytes, self.config.image_encoding)
+        encoded = (self._image_to_base64(data), mime)
+
+        with self._encoded_lock:
+            self._encoded[key] = encoded
+            self._encoded.move_to_end(key)
+            while len(self._encoded) > self.config.encoded_cache_size:
+                self._encoded.popitem(last=False)
+        return encoded
+
+    def _cache_key(self, digest: bytes, prompts: List[str]) -> str:
+        """Response-cache key: image, ordered prompts, prompt version, model, encoding."""
+        material = json.dumps(
+            [
+                digest.hex(),
+                prompts,
+                _PROMPT_VERSION,
+                self.config.model,
+                repr(self.config.image_encoding),
+            ],
+            ensure_ascii=False,
+        )
+        return hashlib.blake2b(material.encode("utf-8"), digest_size=20).hexdigest()
 
     def _build_payload(
         self,
         image_b64: str,
         prompts: List[str],
         page_num: int,
+        mime: str = "image/png",
     ) -> Dict[str, Any]:
         if len(prompts) == 1:
             user_text = (
@@ -248,7 +366,7 @@ class QwenOCRClient(BaseOCRClient):
                     "content": [
                         {
                             "type": "image_url",
-                            "image_url": {"url": f"data:image/png;base64,{image_b64}"},
+                            "image_url": {"url": f"data:{mime};base64,{image_b64}"},
                         },
                         {"type": "text", "text": user_text},
                     ],
@@ -265,19 +383,41 @@ class QwenOCRClient(BaseOCRClient):
             "Authorization": f"Bearer {self.config.api_key}",
         }
         last_error: Optional[str] = None
+        est_tokens = estimate_payload_tokens(payload)
+        delay: Optional[float] = None
 
         for attempt in range(1, self.config.max_retries + 1):
+            try:
+                parked = self.circuit.before_request()
+            except CircuitOpenError as exc:
+                raise QwenClientError(f"Qwen request failed: {exc}") from exc
+            if parked > 0:
+                logger.info(f"Qwen OCR: parked {parked:.1f}s while the circuit was open")
+            retry_after: Optional[float] = None
+            waited = self.rate_limiter.acquire(est_tokens)
+            if waited > 0:
+                logger.debug(f"Qwen OCR rate limiter: waited {waited:.3f}s")
             start_time = time.time()
             try:
-                resp = requests.post(
-                    url, json=payload, headers=headers, timeout=self.config.timeout_sec
+                resp = self.transport.post(
+                    url,
+                    json=payload,
+                    headers=headers,
+                    timeout=(self.config.connect_timeout_sec, self.config.timeout_sec),
                 )
                 # DashScope responds with UTF-8 but without `charset` in Content-Type;
                 # requests then falls back to ISO-8859-1 per RFC 2616 and garbles Cyrillic.
                 resp.encoding = "utf-8"
                 latency_ms = int((time.time() - start_time) * 1000)
                 status = resp.status_code
+                if 500 <= status < 600:
+                    self.circuit.record_failure()
+                else:
+                    self.circuit.record_success()
 
+                if status == 429:
+                    retry_after = parse_retry_after(resp)
+                    self.rate_limiter.on_throttled(retry_after)
                 if status == 429 or (500 <= status < 600):
                     last_error = f"status={status}, body={resp.text[:400]}"
                     logger.warning(
@@ -285,12 +425,16 @@ class QwenOCRClient(BaseOCRClient):
                         f"status={status}, latency={latency_ms}ms, will retry"
                     )
                     if attempt < self.config.max_retries:
-                        time.sleep(self.config.backoff_base ** (attempt - 1))
+                        delay = self._sleep_before_retry(delay, retry_after)
                         continue
                     resp.raise_for_status()
 
                 resp.raise_for_status()
                 payload_json = resp.json()
+                self.rate_limiter.on_success()
+                usage = payload_json.get("usage")
+                if isinstance(usage, dict):
+                    self.rate_limiter.record_usage(est_tokens, usage.get("total_tokens"))
 
                 choices = payload_json.get("choices") or []
                 if not choices:
@@ -324,11 +468,12 @@ class QwenOCRClient(BaseOCRClient):
                     f"latency={latency_ms}ms, error={text[:200]}"
                 )
                 if attempt < self.config.max_retries:
-                    time.sleep(self.config.backoff_base ** (attempt - 1))
+                    delay = self._sleep_before_retry(delay, retry_after)
                     continue
                 raise QwenClientError(f"Qwen request failed: {text}") from exc
 
             except (requests.ConnectionError, requests.Timeout) as exc:
+                self.circuit.record_failure()
                 latency_ms = int((time.time() - start_time) * 1000)
                 last_error = str(exc)
                 logger.warning(
@@ -336,7 +481,7 @@ class QwenOCRClient(BaseOCRClient):
                     f"latency={latency_ms}ms, error={str(exc)[:200]}"
                 )
                 if attempt < self.config.max_retries:
-                    time.sleep(self.config.backoff_base ** (attempt - 1))
+                    delay = self._sleep_before_retry(delay, retry_after)
                     continue
                 raise QwenClientError(f"Qwen request failed: {exc}") from exc
 
@@ -344,28 +489,93 @@ class QwenOCRClient(BaseOCRClient):
             f"Qwen request failed after {self.config.max_retries} attempts: {last_error}"
         )
 
+    def _sleep_before_retry(self, prev: Optional[float], retry_after: Optional[float]) -> float:
+        """Sleep a jittered delay (at least Retry-After) and return it."""
+        delay = self.retry_policy.next_delay(prev, retry_after)
+        logger.info(f"Qwen API: retrying in {delay:.1f}s")
+        time.sleep(delay)
+        return delay
+
     def extract_batch(
         self,
         image: bytes,
         prompts: List[str],
         page_num: int,
+        use_cache: bool = True,
     ) -> List[Dict[str, Any]]:
         if not prompts:
             return []
 
-        img_b64 = self._image_to_base64(image)
-        payload = self._build_payload(img_b64, prompts, page_num)
+        digest = self._image_digest(image)
+        cache_key: Optional[str] = None
+        if self.cache is not None and use_cache:
+            cache_key = self._cache_key(digest, prompts)
+            cached = self.cache.get(cache_key)
+            if cached is not None and len(cached) == len(prompts):
+                logger.info(
+                    f"Qwen OCR page={page_num} | tasks={len(prompts)} | cache hit"
+                )
+                return [{**res, "cached": True} for res in cached]
+
+        img_b64, mime = self._encode_image(image, digest)
+        payload = self._build_payload(img_b64, prompts, page_num, mime=mime)
 
         start_time = time.time()
         response_text = self._post_with_retry(payload)
+        results = parse_multi_task_response(response_text, len(prompts))
+        repairs = self._repair_missing(img_b64, mime, prompts, page_num, results)
         latency_ms = int((time.time() - start_time) * 1000)
 
-        results = parse_multi_task_response(response_text, len(prompts))
         ok = sum(1 for r in results if r["status"] == "ok")
         no_data = sum(1 for r in results if r["status"] == "no_data")
         err = sum(1 for r in results if r["status"] == "error")
         logger.info(
             f"Qwen OCR page={page_num} | tasks={len(prompts)} | "
-            f"ok={ok} no_data={no_data} error={err} | latency={latency_ms}ms"
+            f"ok={ok} no_data={no_data} error={err} | repairs={repairs} | "
+            f"latency={latency_ms}ms"
         )
+        # Only fully parsed responses are cached: error blocks should be re-asked
+        if cache_key is not None and err == 0:
+            self.cache.put(cache_key, results)
         return results
+
+    def _repair_missing(
+        self,
+        image_b64: str,
+        mime: str,
+        prompts: List[str],
+        page_num: int,
+        results: List[Dict[str, Any]],
+    ) -> int:
+        """Re-ask only the tasks whose block is missing, updating `results` in place.
+
+        Each round sends the still-missing prompts (same page image, already
+        encoded) as a smaller request, up to config.repair_retries rounds.
+        Recovered results carry "repaired": True.
+        A failed repair request ends the pass; its tasks stay "error".
+
+        Returns:
+            Number of repair requests sent
+        """
+        rounds = 0
+        while rounds < self.config.repair_retries:
+            missing = [i for i, r in enumerate(results) if r["status"] == "error"]
+            if not missing:
+                break
+            rounds += 1
+            logger.info(
+                f"Qwen OCR page={page_num} | re-asking {len(missing)}/{len(prompts)} "
+                f"tasks (repair {rounds}/{self.config.repair_retries})"
+            )
+            retry_prompts = [prompts[i] for i in missing]
+            payload = self._build_payload(image_b64, retry_prompts, page_num, mime=mime)
+            try:
+                response_text = self._post_with_retry(payload)
+            except QwenClientError as exc:
+                logger.warning(f"Qwen OCR page={page_num} | repair request failed: {exc}")
+                break
+            repaired = parse_multi_task_response(response_text, len(retry_prompts))
+            for i, res in zip(missing, repaired):
+                if res["status"] != "error":
+                    results[i] = {**res, "repaired": True}
+        return rounds
@@ -0,0 +1,155 @@
+"""Single-file page store: page images appended to one pack, served via mmap.
+
+With one PNG per page, a 1,000-page document costs 1,000 open/stat calls
+per pass, which dominates on network storage. PagePack appends every page
+image to pages/pages.pack and records (page, offset, length) in the
+append-only index pages/pages.idx.jsonl. Reads return zero-copy memoryview
+slices of a read-only mmap of the pack.
+
+Index lines are written after the image bytes, so a crash mid-write leaves
+at most unreferenced bytes at the end of the pack. Re-saving a page appends
+a new copy; the latest index line wins.
+
+Other processes may append to the same pack (under the workspace lock). A
+lookup that misses reads index lines appended since the last read, so
+their pages are found instead of being rendered and appended again.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import mmap
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PACK_FILENAME = "pages.pack"
+INDEX_FILENAME = "pages.idx.jsonl"
+
+
+class PagePack:
+    """Append-only pack of page images with an offset index (thread-safe).
+
+    Args:
+        pages_dir: Directory holding pages.pack and pages.idx.jsonl
+    """
+
+    def __init__(self, pages_dir: Path) -> None:
+        self.pages_dir = Path(pages_dir)
+        self.pack_path = self.pages_dir / PACK_FILENAME
+        self.index_path = self.pages_dir / INDEX_FILENAME
+        self._lock = threading.RLock()
+        self._index: Optional[Dict[int, Tuple[int, int]]] = None
+        self._index_pos = 0  # bytes of the index file already parsed
+        self._mm: Optional[mmap.mmap] = None
+
+    @staticmethod
+    def exists_in(pages_dir: Path) -> bool:
+        """True if `pages_dir` already has a pack index."""
+        return (Path(pages_dir) / INDEX_FILENAME).exists()
+
+    def _load_index(self) -> Dict[int, Tuple[int, int]]:
+        if self._index is None:
+            self._index = {}
+            self._index_pos = 0
+            self._read_new_index_lines()
+        return self._index
+
+    def _read_new_index_lines(self) -> None:
+        """Parse complete index lines appended since the last read."""
+        try:
+            with self.index_path.open("rb") as f:
+                f.seek(self._index_pos)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        end = data.rfind(b"\n") + 1  # a torn last line is read next time
+        if not end:
+            return
+        size = self.pack_path.stat().st_size if self.pack_path.exists() else 0
+        for line in data[:end].splitlines():
+            try:
+                rec = json.loads(line)
+                page, offset, length = int(rec["page"]), int(rec["offset"]), int(rec["length"])
+            except (ValueError, KeyError, TypeError):
+                continue
+            if offset + length <= size:
+                self._index[page] = (offset, length)
+        self._index_pos += end
+
+    def _lookup(self, page_num: int) -> Optional[Tuple[int, int]]:
+        """Index entry of a page; on a miss, first picks up other writers' lines."""
+        index = self._load_index()
+        entry = index.get(page_num)
+        if entry is None:
+            self._read_new_index_lines()
+            entry = index.get(page_num)
+        return entry
+
+    def __contains__(self, page_num: int) -> bool:
+        with self._lock:
+            return self._lookup(page_num) is not None
+
+    def pages(self) -> List[int]:
+        with self._lock:
+            self._load_index()
+            self._read_new_index_lines()
+            return sorted(self._index)
+
+    def append(self, page_num: int, image: bytes) -> None:
+        """Append one page image."""
+        self.append_many([(page_num, image)])
+
+    def append_many(self, pages: Iterable[Tuple[int, bytes]]) -> int:
+        """Append page images, then their index lines in one write."""
+        with self._lock:
+            index = self._load_index()
+            self._read_new_index_lines()
+            self.pages_dir.mkdir(parents=True, exist_ok=True)
+            records = []
+            try:
+                with self.pack_path.open("ab") as f:
+                    offset = f.seek(0, 2)
+                    for page_num, image in pages:
+                        f.write(image)
+                        records.append({"page": page_num, "offset": offset, "length": len(image)})
+                        offset += len(image)
+            finally:
+                # Index what was fully written, even if `pages` raised
+                if records:
+                    lines = "".join(json.dumps(r) + "\n" for r in records).encode("utf-8")
+                    with self.index_path.open("ab") as f:
+                        f.write(lines)
+                        # Own lines need no re-parsing (appends are serialized by the caller)
+                        self._index_pos = f.tell()
+                    for r in records:
+                        index[r["page"]] = (r["offset"], r["length"])
+            logger.debug(f"PagePack: appended {len(records)} pages to {self.pack_path}")
+            return len(records)
+
+    def read(self, page_num: int) -> Optional[memoryview]:
+        """Zero-copy view of a page image, or None if not in the pack."""
+        with self._lock:
+            entry = self._lookup(page_num)
+            if entry is None:
+                return None
+            offset, length = entry
+            if length == 0:
+                return memoryview(b"")
+            if self._mm is None or offset + length > len(self._mm):
+                # Pack grew since it was mapped; views of the old map stay valid
+                with self.pack_path.open("rb") as f:
+                    self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return memoryview(self._mm)[offset:offset + length]
+
+    def close(self) -> None:
+        """Drop the mapping (it is unmapped once no views remain)."""
+        with self._lock:
+            self._mm = None
+            self._index = None
+
+
+__all__ = ["PagePack", "PACK_FILENAME", "INDEX_FILENAME"]
@@ -2,12 +2,13 @@
 
 import logging
 import os
+import threading
 from pathlib import Path
-from typing import List, Union, Optional
+from typing import Iterable, List, Union, Optional
 
 from dotenv import load_dotenv
 
-from ..schemas.common import PageInfo
+from ..schemas.common import LazyPageInfo, PageInfo
 from ..schemas.config import ProcessorConfig, VLMConfig
 from ..preprocessing.renderer import PDFRenderer, RenderConfig
 from .qwen_vlm_client import QwenVLMClient
@@ -15,6 +16,7 @@ from .state import StateManager, MemoryStorage, DiskStorage
 from .vlm_agent import VLMAgent
 from .ocr_client import BaseOCRClient, QwenOCRClient, OCRConfig
 from .ocr_tool import OCRTool
+from .transport import get_transport
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +37,7 @@ class DocumentProcessor:
     """Main class for document processing.
 
     Supports:
-    - PDF files with automatic rendering
+    - PDF files with lazy, on-demand rendering
     - PNG arrays (pre-rendered images)
 
     Features:
@@ -118,6 +120,9 @@ class DocumentProcessor:
             # Expose ocr_tool for Resolve (DocumentReader calls OCR directly)
             self.ocr_tool = ocr_tool
 
+            # Parallel tool calls share the keep-alive pool with OCR/scan workers
+            get_transport().ensure_pool_size(self.config.max_tool_workers)
+
             # Create VLM agent and register OCR tool if available
             vlm_agent = VLMAgent(
                 vlm_client,
@@ -137,6 +142,10 @@ class DocumentProcessor:
 
         # Initialize pages based on source type
         self._pages: List[PageInfo] = []
+        self._num_pages = 0
+        self._pdf_path: Optional[Path] = None
+        self._renderer: Optional[PDFRenderer] = None
+        self._render_lock = threading.Lock()
 
         if isinstance(source, Path):
             # PDF file - render pages
@@ -154,31 +163,61 @@ class DocumentProcessor:
                 "Expected Path or List[bytes]"
             )
 
-        logger.info(f"DocumentProcessor initialized with {len(self._pages)} pages")
+        logger.info(f"DocumentProcessor initialized with {self._num_pages} pages")
 
     def _init_from_pdf(self, pdf_path: Path) -> None:
-        """Initialize from PDF file by rendering pages.
+        """Initialize from PDF file without rendering.
+
+        Only the page count is read. Pages are rendered the first time they
+        are needed (ensure_pages(), load_page() via StateManager, or the
+        `pages` property) and reused from storage after that.
 
         Args:
             pdf_path: Path to PDF file
         """
-        # Create renderer with config DPI
-        render_config = RenderConfig(dpi=self.config.render_dpi)
-        renderer = PDFRenderer(render_config)
-
-        # Render all pages
-        rendered = renderer.render_pdf(pdf_path)
-
-        # Create PageInfo objects (1-based page numbers)
-        self._pages = [
-            PageInfo(index=page_num, image=img_bytes)
-            for page_num, img_bytes in rendered
-        ]
+        self._pdf_path = pdf_path
+        self._renderer = PDFRenderer(
+            RenderConfig(
+                dpi=self.config.render_dpi,
+                workers=self.config.render_workers,
+            )
+        )
+        self._num_pages = self._renderer.page_count(pdf_path)
+        # Stored pages rendered with other DPI/format/renderer are re-rendered
+        self.state_manager.set_page_source(
+            self._render_page, render_info=self._renderer.render_info()
+        )
+
+    def _render_page(self, page_num: int) -> Optional[bytes]:
+        """Page source for StateManager.load_page(): render one missing page."""
+        if not 1 <= page_num <= self._num_pages:
+            return None
+        with self._render_lock:
+            return self._renderer.render_page(self._pdf_path, page_num)
+
+    def ensure_pages(self, page_nums: Iterable[int]) -> None:
+        """Render pages that are not yet in storage, in one pass over the PDF.
+
+        No-op for PNG-array sources and for pages already stored (e.g. in the
+        workspace pages/ dir from an earlier run).
 
-        # Save pages to state if auto_save enabled
-        if self.auto_save:
-            for page_info in self._pages:
-                self.state_manager.save_page(page_info.index, page_info.image)
+        Args:
+            page_nums: 1-based page numbers
+        """
+        if self._renderer is None:
+            return
+        with self._render_lock:
+            missing = sorted(
+                n for n in set(page_nums)
+                if 1 <= n <= self._num_pages and not self.state_manager.has_page(n)
+            )
+            if not missing:
+                return
+            rendered = self._renderer.iter_render_pdf(
+                self._pdf_path, page_indices=[n - 1 for n in missing]
+            )
+            self.state_manager.save_pages(rendered)
+        logger.info(f"Rendered {len(missing)} pages on demand")
 
     def _init_from_png_array(self, png_array: List[bytes]) -> None:
         """Initialize from array of PNG bytes.
@@ -186,34 +225,52 @@ class DocumentProcessor:
         Args:
             png_array: List of PNG image bytes
         """
-        # Create PageInfo objects (1-based page numbers)
-        self._pages = [
-            PageInfo(index=i + 1, image=img_bytes)
-            for i, img_bytes in enumerate(png_array)
-        ]
+        self._num_pages = len(png_array)
 
-        # Save pages to state if auto_save enabled
+        # Save pages to state if auto_save enabled; storage then owns the
+        # images and PageInfo loads them lazily
         if self.auto_save:
-            for page_info in self._pages:
-                self.state_manager.save_page(page_info.index, page_info.image)
+            self.state_manager.save_pages(
+                (i + 1, img_bytes) for i, img_bytes in enumerate(png_array)
+            )
+            self._pages = [
+                LazyPageInfo(index=n, loader=self.state_manager.load_page)
+                for n in range(1, self._num_pages + 1)
+            ]
+        else:
+            # Create PageInfo objects (1-based page numbers)
+            self._pages = [
+                PageInfo(index=i + 1, image=img_bytes)
+                for i, img_bytes in enumerate(png_array)
+            ]
 
     @property
     def pages(self) -> List[PageInfo]:
         """Get list of all document pages.
 
+        For PDF sources this renders every page not yet in storage. Page
+        images are loaded lazily from the StateManager on `.image` access.
+
         Returns:
             List of PageInfo objects (1-based page numbers)
         """
-        return self._pages
+        if self._renderer is None:
+            return self._pages
+        page_nums = range(1, self._num_pages + 1)
+        self.ensure_pages(page_nums)
+        return [
+            LazyPageInfo(index=n, loader=self.state_manager.load_page)
+            for n in page_nums
+        ]
 
     @property
     def num_pages(self) -> int:
-        """Get number of pages in document.
+        """Get number of pages in document (does not render).
 
         Returns:
             Number of pages
         """
-        return len(self._pages)
+        return self._num_pages
 
     def save_state(self) -> None:
         """Explicitly save state.
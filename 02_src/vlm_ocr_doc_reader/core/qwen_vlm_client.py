@@ -14,6 +14,14 @@ from typing import Any, Dict, List, Optional
 import requests
 
 from ..schemas.config import VLMConfig
+from .rate_limit import (
+    estimate_payload_tokens,
+    get_rate_gate,
+    get_rate_limiter,
+    parse_retry_after,
+)
+from .retry import CircuitOpenError, RetryPolicy, get_circuit_breaker
+from .transport import HTTPTransport, get_transport
 from .vlm_client import BaseVLMClient
 
 logger = logging.getLogger(__name__)
@@ -28,19 +36,27 @@ class QwenVLMClient(BaseVLMClient):
         self,
         config: VLMConfig,
         endpoint: str = DEFAULT_ENDPOINT,
+        transport: Optional[HTTPTransport] = None,
     ) -> None:
         if not config.api_key:
             raise ValueError("DashScope API key is required for QwenVLMClient")
         self.config = config
         self.endpoint = endpoint
-        self._last_call_ts: Optional[float] = None
+        # Keep-alive pool shared with the OCR client (process-wide by default)
+        self.transport = transport or get_transport()
+        # Shared by every client on the same endpoint+key, safe across threads
+        self._rate_gate = get_rate_gate(
+            f"vlm:{endpoint}:{config.api_key}", config.min_interval_s
+        )
+        # Per-key quota budget shared with QwenOCRClient (requests/s, tokens/min)
+        self.rate_limiter = get_rate_limiter(f"dashscope:{config.api_key}")
+        self.circuit = get_circuit_breaker(f"dashscope:{config.api_key}")
+        self.retry_policy = RetryPolicy(factor=config.backoff_base)
 
     def _throttle(self) -> None:
-        if self._last_call_ts is None:
-            return
-        elapsed = time.monotonic() - self._last_call_ts
-        if elapsed < self.config.min_interval_s:
-            time.sleep(self.config.min_interval_s - elapsed)
+        waited = self._rate_gate.wait()
+        if waited > 0:
+            logger.debug(f"VLM throttle: waited {waited:.3f}s")
 
     def _post_with_retry(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         headers = {
@@ -48,28 +64,47 @@ class QwenVLMClient(BaseVLMClient):
             "Content-Type": "application/json",
         }
         last_error: Optional[str] = None
+        est_tokens = estimate_payload_tokens(payload)
+        delay: Optional[float] = None
 
         for attempt in range(1, self.config.max_retries + 1):
+            try:
+                parked = self.circuit.before_request()
+            except CircuitOpenError as exc:
+                raise requests.RequestException(f"DashScope request not sent: {exc}") from exc
+            if parked > 0:
+                logger.info(f"VLM: parked {parked:.1f}s while the circuit was open")
+            retry_after: Optional[float] = None
+            waited = self.rate_limiter.acquire(est_tokens)
+            if waited > 0:
+                logger.debug(f"VLM rate limiter: waited {waited:.3f}s")
             try:
                 logger.info(
                     f"VLM request attempt {attempt}/{self.config.max_retries} "
                     f"model={payload.get('model')}"
                 )
-                resp = requests.post(
+                resp = self.transport.post(
                     self.endpoint,
-                    headers=headers,
                     json=payload,
-                    timeout=self.config.timeout_sec,
+                    headers=headers,
+                    timeout=(self.config.connect_timeout_sec, self.config.timeout_sec),
                 )
                 # DashScope returns UTF-8 without `charset` in Content-Type;
                 # without this, requests falls back to ISO-8859-1 and garbles Cyrillic.
                 resp.encoding = "utf-8"
                 status = resp.status_code
                 is_retryable = status == 429 or (500 <= status < 600)
+                if 500 <= status < 600:
+                    self.circuit.record_failure()
+                else:
+                    self.circuit.record_success()
+                if status == 429:
+                    retry_after = parse_retry_after(resp)
+                    self.rate_limiter.on_throttled(retry_after)
 
                 if is_retryable and attempt < self.config.max_retries:
                     last_error = f"status={status}, body={resp.text[:400]}"
-                    sleep_s = self.config.backoff_base ** (attempt - 1)
+                    sleep_s = delay = self.retry_policy.next_delay(delay, retry_after)
                     logger.warning(
                         f"DashScope {status}, retry {attempt}/{self.config.max_retries} "
                         f"after {sleep_s:.1f}s"
@@ -91,7 +126,12 @@ class QwenVLMClient(BaseVLMClient):
                     logger.error(f"Response content: {resp.text[:800]}")
                     resp.raise_for_status()
 
-                return resp.json()
+                data = resp.json()
+                self.rate_limiter.on_success()
+                usage = data.get("usage") if isinstance(data, dict) else None
+                if isinstance(usage, dict):
+                    self.rate_limiter.record_usage(est_tokens, usage.get("total_tokens"))
+                return data
 
             except requests.exceptions.RequestException as e:
                 status_code = None
@@ -106,9 +146,11 @@ class QwenVLMClient(BaseVLMClient):
                     if status_code
                     else False
                 )
+                if is_net:
+                    self.circuit.record_failure()
                 if (is_net or is_status_retryable) and attempt < self.config.max_retries:
                     last_error = str(e)
-                    sleep_s = self.config.backoff_base ** (attempt - 1)
+                    sleep_s = delay = self.retry_policy.next_delay(delay, retry_after)
                     logger.warning(
                         f"DashScope request failed, retry "
                         f"{attempt}/{self.config.max_retries} after {sleep_s:.1f}s: {e}"
@@ -186,7 +228,6 @@ class QwenVLMClient(BaseVLMClient):
         t0 = time.monotonic()
         data = self._post_with_retry(payload)
         latency = time.monotonic() - t0
-        self._last_call_ts = time.monotonic()
         logger.info(f"Request completed in {latency:.3f}s")
 
         return self._parse_choice(data)
@@ -0,0 +1,275 @@
+"""Thread-safe request pacing shared across client instances.
+
+QwenVLMClient used to sleep based on a per-instance `_last_call_ts`, which
+races as soon as several threads share the client and does nothing across
+separate client instances. RateGate reserves start slots under a lock so
+concurrent callers are spaced at least `min_interval_s` apart.
+
+DashScope quotas are per API key (requests/s and tokens/min), shared by the
+VLM and OCR clients. TokenBucketLimiter paces both against one budget per
+key and adapts to 429s: each one halves the allowed rate and pauses every
+caller (for Retry-After when the server sends it); successes ramp the rate
+back up additively. Limits come from env RATE_LIMIT_RPS / RATE_LIMIT_TPM;
+without them the limiter only applies the shared 429 pauses.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RateGate:
+    """Minimum-interval gate between request starts (thread-safe).
+
+    Each wait() reserves the next free slot under the lock and sleeps until
+    it outside the lock, so N concurrent callers start at
+    t, t + interval, t + 2*interval, ...
+    """
+
+    def __init__(self, min_interval_s: float) -> None:
+        self.min_interval_s = max(0.0, float(min_interval_s))
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self) -> float:
+        """Block until this caller's slot. Returns seconds slept."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval_s
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+_gates: Dict[str, RateGate] = {}
+_gates_lock = threading.Lock()
+
+
+def get_rate_gate(name: str, min_interval_s: float) -> RateGate:
+    """Return the process-wide RateGate for `name`, creating it on first use.
+
+    The interval of an existing gate is tightened/relaxed to the latest
+    value so that config changes take effect.
+    """
+    with _gates_lock:
+        gate = _gates.get(name)
+        if gate is None:
+            gate = RateGate(min_interval_s)
+            _gates[name] = gate
+        else:
+            gate.min_interval_s = max(0.0, float(min_interval_s))
+        return gate
+
+
+class _Bucket:
+    """Token bucket that may go into debt: reserve() returns the wait instead of failing."""
+
+    def __init__(self, rate_per_s: float, capacity: float) -> None:
+        self.rate_per_s = rate_per_s
+        self.capacity = capacity
+        self.level = capacity
+        self._ts = time.monotonic()
+
+    def refill(self, now: float, scale: float) -> None:
+        self.level = min(
+            self.capacity, self.level + (now - self._ts) * self.rate_per_s * scale
+        )
+        self._ts = now
+
+    def reserve(self, amount: float, scale: float) -> float:
+        """Take `amount` (already refilled); returns seconds until the debt is repaid."""
+        self.level -= amount
+        return 0.0 if self.level >= 0 else -self.level / (self.rate_per_s * scale)
+
+
+class TokenBucketLimiter:
+    """Requests/s and tokens/min budget with 429-adaptive pacing (thread-safe).
+
+    acquire() reserves capacity under the lock and sleeps outside it, so
+    concurrent callers queue up in order. Token counts are estimates at
+    request time; record_usage() corrects the bucket with the real usage.
+
+    Args:
+        requests_per_s: Request rate limit (None = unlimited)
+        tokens_per_min: Token rate limit (None = unlimited)
+        burst_s: Seconds of request budget that may be spent at once
+        min_scale: Lowest fraction of the configured rates after 429s
+        recovery_step: Fraction of the rates regained per successful request
+        cooldown_s: Pause of all callers after a 429 without Retry-After
+        max_pause_s: Upper bound of a Retry-After pause
+    """
+
+    def __init__(
+        self,
+        requests_per_s: Optional[float] = None,
+        tokens_per_min: Optional[float] = None,
+        burst_s: float = 1.0,
+        min_scale: float = 0.05,
+        recovery_step: float = 0.05,
+        cooldown_s: float = 1.0,
+        max_pause_s: float = 60.0,
+    ) -> None:
+        self.requests_per_s = requests_per_s if requests_per_s and requests_per_s > 0 else None
+        self.tokens_per_min = tokens_per_min if tokens_per_min and tokens_per_min > 0 else None
+        self.min_scale = min_scale
+        self.recovery_step = recovery_step
+        self.cooldown_s = cooldown_s
+        self.max_pause_s = max_pause_s
+        self._requests = (
+            _Bucket(self.requests_per_s, max(1.0, self.requests_per_s * burst_s))
+            if self.requests_per_s
+            else None
+        )
+        self._tokens = (
+            _Bucket(self.tokens_per_min / 60.0, self.tokens_per_min)
+            if self.tokens_per_min
+            else None
+        )
+        self._scale = 1.0
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "waits": 0, "wait_s": 0.0, "throttled": 0}
+
+    @property
+    def scale(self) -> float:
+        """Current fraction of the configured rates (1.0 = no 429 slowdown)."""
+        return self._scale
+
+    def _refill(self, now: float) -> None:
+        for bucket in (self._requests, self._tokens):
+            if bucket is not None:
+                bucket.refill(now, self._scale)
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Block until one request of ~`tokens` tokens fits. Returns seconds slept."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            delay = max(0.0, self._paused_until - now)
+            if self._requests is not None:
+                delay = max(delay, self._requests.reserve(1, self._scale))
+            if self._tokens is not None and tokens > 0:
+                delay = max(delay, self._tokens.reserve(tokens, self._scale))
+            self._stats["requests"] += 1
+            if delay > 0:
+                self._stats["waits"] += 1
+                self._stats["wait_s"] += delay
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def record_usage(self, estimated: int, actual: Optional[int]) -> None:
+        """Charge the difference between the reserved estimate and real usage."""
+        if self._tokens is None or not actual:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens.level -= actual - estimated
+
+    def on_throttled(self, retry_after: Optional[float] = None) -> None:
+        """A 429 was received: halve the rates and pause every caller."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._scale = max(self.min_scale, self._scale * 0.5)
+            pause = self.cooldown_s if retry_after is None else min(retry_after, self.max_pause_s)
+            self._paused_until = max(self._paused_until, now + pause)
+            self._stats["throttled"] += 1
+            scale = self._scale
+        logger.warning(f"Rate limiter: 429, rate scale -> {scale:.2f}, pause {pause:.1f}s")
+
+    def on_success(self) -> None:
+        """A request succeeded: regain part of the configured rates."""
+        if self._scale >= 1.0:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self._scale = min(1.0, self._scale + self.recovery_step)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "scale": self._scale}
+
+
+def parse_retry_after(resp: Any) -> Optional[float]:
+    """Seconds from a response's Retry-After header (delta-seconds form), if any."""
+    headers = getattr(resp, "headers", None)
+    try:
+        value = float(headers.get("Retry-After"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+    return value if value >= 0 and math.isfinite(value) else None
+
+
+def estimate_payload_tokens(payload: Dict[str, Any], image_tokens: int = 1280) -> int:
+    """Rough prompt-token count of an OpenAI-style chat payload.
+
+    Text is counted at ~3 characters per token, every image as
+    `image_tokens` (the order of magnitude of a rendered page).
+    """
+    chars = 0
+    images = 0
+    for message in payload.get("messages") or []:
+        content = message.get("content")
+        if isinstance(content, str):
+            chars += len(content)
+            continue
+        for part in content or []:
+            if not isinstance(part, dict):
+                continue
+            if part.get("type") == "image_url":
+                images += 1
+            else:
+                chars += len(part.get("text") or "")
+    return max(1, math.ceil(chars / 3)) + images * image_tokens
+
+
+_limiters: Dict[str, TokenBucketLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def _env_rate(name: str) -> Optional[float]:
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return None
+    try:
+        value = float(raw)
+    except ValueError:
+        return None
+    return value if value > 0 else None
+
+
+def get_rate_limiter(name: str) -> TokenBucketLimiter:
+    """Return the process-wide limiter for `name` (e.g. one per API key).
+
+    Created on first use with limits from env RATE_LIMIT_RPS and
+    RATE_LIMIT_TPM (unset or invalid = unlimited).
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = TokenBucketLimiter(
+                requests_per_s=_env_rate("RATE_LIMIT_RPS"),
+                tokens_per_min=_env_rate("RATE_LIMIT_TPM"),
+            )
+            _limiters[name] = limiter
+        return limiter
+
+
+__all__ = [
+    "RateGate",
+    "TokenBucketLimiter",
+    "estimate_payload_tokens",
+    "get_rate_gate",
+    "get_rate_limiter",
+    "parse_retry_after",
+]
@@ -1,10 +1,15 @@
 """DocumentReader - Public API for document processing (ADR-001)."""
 
+import hashlib
 import logging
 import os
-from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, ThreadPoolExecutor, as_completed, wait
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar, Union
+
+import requests
 
 from .state import (
     StateManager,
@@ -14,12 +19,21 @@ from .state import (
     group_registry_by_page,
     apply_ocr_result,
 )
+from .blob_store import BlobStore
+from .ocr_cache import OCRResponseCache
+from .ocr_chunking import TUNING_FILENAME, AdaptiveChunker
 from .processor import DocumentProcessor
+from .qwen_vlm_client import DEFAULT_ENDPOINT
+from .retry import CircuitOpenError
+from .transport import get_transport
 from .voting import VoteSample, majority_vote
 from ..schemas.config import ProcessorConfig
+from ..preprocessing.encoding import ImageEncoding, encode_image
+from ..preprocessing.renderer import page_content_digest
 from ..schemas.document import DocumentData
 from ..operations.scan import (
     SCAN_PROMPT_TEXT,
+    ScanPayload,
     parse_scan_response,
     normalize_scan_registry,
 )
@@ -27,6 +41,75 @@ from ..operations.scan import (
 logger = logging.getLogger(__name__)
 
 
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def _completed_in_window(
+    pool: Executor,
+    fn: Callable[[T], R],
+    tasks: Iterable[T],
+    window: int,
+) -> Iterator[R]:
+    """Yield fn(task) results in completion order with at most `window` in flight.
+
+    Tasks are drawn from the iterable only when a slot frees up, so a lazy
+    planner sees the results of earlier tasks.
+    """
+    in_flight = set()
+    for task in tasks:
+        in_flight.add(pool.submit(fn, task))
+        if len(in_flight) >= window:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    for future in as_completed(in_flight):
+        yield future.result()
+
+
+def _renumber_scan_payload(payload: ScanPayload, mapping: Dict[Any, int]) -> ScanPayload:
+    """Rewrite page numbers of a reused scan payload to the current batch.
+
+    `mapping` maps the page numbers the memo was recorded with to the pages
+    at the same positions in this batch.
+    """
+    def renumber(item: Any, field: str) -> Any:
+        if isinstance(item, dict) and item.get(field) in mapping:
+            return {**item, field: mapping[item[field]]}
+        return item
+
+    structure = dict(payload.get("structure") or {})
+    structure["headers"] = [renumber(h, "page") for h in structure.get("headers") or []]
+    return ScanPayload(
+        text=payload.get("text", ""),
+        structure=structure,
+        ocr_registry=[renumber(e, "page_num") for e in payload.get("ocr_registry") or []],
+    )
+
+
+def _chunk_lost(exc: BaseException) -> bool:
+    """True if a failed OCR call hints that its chunk was too big.
+
+    Read timeouts and unparseable/empty responses count; connection, auth,
+    rate-limit (retries exhausted) and open-circuit errors say nothing about
+    chunk density.
+    """
+    from .ocr_client import QwenClientError
+
+    chain: List[BaseException] = []
+    while exc is not None and exc not in chain:
+        chain.append(exc)
+        exc = exc.__cause__
+    if any(isinstance(e, (requests.ReadTimeout, TimeoutError)) for e in chain):
+        return True
+    if any(isinstance(e, ValueError) for e in chain):  # incl. invalid JSON body
+        return True
+    if any(isinstance(e, (CircuitOpenError, requests.RequestException)) for e in chain):
+        return False
+    # QwenClientError raised by the client itself: no choices / empty content
+    return isinstance(chain[0], QwenClientError)
+
+
 class DocumentReader:
     """Public API for document lifecycle and Resolution Levels (ADR-001).
 
@@ -46,6 +129,9 @@ class DocumentReader:
         self._workspace = Path(workspace) if workspace is not None else None
         self._state_manager = state_manager
         self._processor = processor
+        self.last_scan_stats: List[Dict[str, Any]] = []
+        self._scan_encoding = ImageEncoding.from_env("SCAN_IMAGE")
+        self._chunker: Optional[AdaptiveChunker] = None
 
     @classmethod
     def open(
@@ -78,13 +164,23 @@ class DocumentReader:
         config = ProcessorConfig(
             state_dir=None,
             auto_save=True,
-            render_dpi=150,
+            render_dpi=cls._render_dpi(),
+            render_workers=cls._render_workers(),
         )
         processor = DocumentProcessor(
             source=path,
             state_manager=state_manager,
             config=config,
         )
+        cls._share_ocr_cache(processor, state_manager)
+        if cls._http_preconnect():
+            # Warm the keep-alive pool while the caller is still setting up
+            threading.Thread(
+                target=get_transport().preconnect,
+                args=(DEFAULT_ENDPOINT,),
+                name="http-preconnect",
+                daemon=True,
+            ).start()
 
         return cls(
             pdf_path=path,
@@ -109,11 +205,55 @@ class DocumentReader:
                 logger.warning(f"Invalid page value {p!r}, skipping")
         return sorted(set(result))
 
-    def _ensure_pages_rendered(self) -> None:
-        """Ensure pages are rendered. Processor renders on init."""
+    def _ensure_pages_rendered(self, page_list: List[int]) -> None:
+        """Render the given pages if they are not in storage yet (lazy rendering)."""
         if self._processor.num_pages == 0:
             logger.warning("Document has no pages")
-        # Pages are already rendered by DocumentProcessor during open()
+            return
+        self._processor.ensure_pages(page_list)
+
+    @staticmethod
+    def _render_dpi() -> int:
+        """Render DPI: env RENDER_DPI or 150."""
+        raw = os.getenv("RENDER_DPI", "150").strip()
+        try:
+            value = int(raw)
+            return value if value > 0 else 150
+        except ValueError:
+            return 150
+
+    @staticmethod
+    def _render_workers() -> int:
+        """Render worker processes: env RENDER_WORKERS or 1 (in-process)."""
+        raw = os.getenv("RENDER_WORKERS", "1").strip()
+        try:
+            value = int(raw)
+            return value if value > 0 else 1
+        except ValueError:
+            return 1
+
+    @staticmethod
+    def _share_ocr_cache(processor: DocumentProcessor, state_manager: StateManager) -> None:
+        """With a workspace blob store, keep OCR responses in it (if no OCR_CACHE_DIR).
+
+        The response cache is keyed by page image content, so duplicate pages
+        in other documents of the workspace reuse each other's OCR results.
+        """
+        blob_store: Optional[BlobStore] = getattr(state_manager.storage, "blob_store", None)
+        ocr_client = getattr(getattr(processor, "ocr_tool", None), "ocr_client", None)
+        if blob_store is None or ocr_client is None or not hasattr(ocr_client, "cache"):
+            return
+        if ocr_client.cache is None:
+            ocr_client.cache = OCRResponseCache(
+                blob_store.root, ocr_client.config.cache_max_mb * 1024 * 1024
+            )
+            logger.info(f"OCR response cache shared via blob store {blob_store.root}")
+
+    @staticmethod
+    def _http_preconnect() -> bool:
+        """Pre-connect to DashScope on open: env HTTP_PRECONNECT (default off)."""
+        raw = os.getenv("HTTP_PRECONNECT", "").strip().lower()
+        return raw in ("1", "true", "yes", "on")
 
     @staticmethod
     def _scan_batch_size() -> int:
@@ -125,81 +265,229 @@ class DocumentReader:
         except ValueError:
             return 2
 
-    def scan(self, pages: Optional[Iterable[int]] = None) -> None:
+    @staticmethod
+    def _scan_user_prompt(batch_pages: List[int]) -> str:
+        """Build the per-batch scan prompt mapping image positions to page numbers."""
+        image_to_page = ", ".join(
+            f"изображение #{i + 1} — страница {p}"
+            for i, p in enumerate(batch_pages)
+        )
+        return (
+            f"Тебе передано {len(batch_pages)} изображений в следующем порядке: "
+            f"{image_to_page}. Это и есть соответствие между позицией изображения "
+            "в запросе и номером страницы документа. Маркер [G{N}] в левом верхнем "
+            "углу каждой картинки — проверочный индикатор того же номера. "
+            "Для КАЖДОЙ записи в ocr_registry обязательно укажи page_num строго из "
+            f"списка {batch_pages}, соответствующий той картинке, на которой это "
+            "значение физически видно. Не приписывай сущности со второй картинки "
+            "первой и наоборот. Верни JSON в указанном формате."
+        )
+
+    def _scan_batch(
+        self,
+        batch_pages: List[int],
+    ) -> Tuple[ScanPayload, Dict[str, Any]]:
+        """Run one independent single-turn scan request for a batch of pages.
+
+        Each batch carries only the system prompt and its own images, so the
+        request size does not depend on how many batches ran before. Images
+        are re-encoded per env SCAN_IMAGE_* (see ImageEncoding.from_env).
+
+        Returns:
+            (payload, stats) where stats has pages, request_bytes,
+            prompt_tokens, completion_tokens.
+
+        Raises:
+            RuntimeError: If the VLM call fails
+        """
+        sources: List[bytes] = []
+        for page_num in batch_pages:
+            img = self._state_manager.load_page(page_num)
+            if img is not None:
+                sources.append(img)
+
+        if len(sources) != len(batch_pages):
+            logger.warning(
+                f"scan: expected {len(batch_pages)} images, got {len(sources)} "
+                f"for batch {batch_pages}"
+            )
+
+        prompt = self._scan_user_prompt(batch_pages)
+        blob_store: Optional[BlobStore] = getattr(
+            self._state_manager.storage, "blob_store", None
+        )
+        memo_key = (
+            self._scan_memo_key(len(batch_pages), sources)
+            if blob_store and len(sources) == len(batch_pages)
+            else None
+        )
+        memo = blob_store.get_memo(memo_key) if memo_key else None
+        if memo is not None:
+            # Same page images, at these or other page numbers, scanned before
+            response = {"text": memo.get("text"), "usage": {}, "request_bytes": 0}
+            logger.info(f"scan: batch {batch_pages} reused from blob store")
+        else:
+            images = [encode_image(img, self._scan_encoding)[0] for img in sources]
+            response = self._processor.vlm_agent.invoke_stateless(prompt, images)
+            if memo_key and response.get("text") is not None:
+                blob_store.put_memo(
+                    memo_key, {"text": response["text"], "pages": list(batch_pages)}
+                )
+        text = response.get("text")
+        if text is None:
+            error = response.get("error", "Unknown error")
+            logger.error(f"scan: VLM failed for batch {batch_pages}: {error}")
+            raise RuntimeError(f"scan failed for pages {batch_pages}: {error}")
+
+        usage = response.get("usage") or {}
+        stats = {
+            "pages": list(batch_pages),
+            "request_bytes": response.get("request_bytes", 0),
+            "prompt_tokens": usage.get("prompt_tokens"),
+            "completion_tokens": usage.get("completion_tokens"),
+            "cached": memo is not None,
+        }
+        logger.info(
+            f"scan: batch {batch_pages} request_bytes={stats['request_bytes']} "
+            f"prompt_tokens={stats['prompt_tokens']} "
+            f"completion_tokens={stats['completion_tokens']}"
+        )
+        payload = parse_scan_response(text)
+        memo_pages = memo.get("pages") if memo is not None else None
+        if isinstance(memo_pages, list) and memo_pages != list(batch_pages):
+            payload = _renumber_scan_payload(payload, dict(zip(memo_pages, batch_pages)))
+        return payload, stats
+
+    def _scan_memo_key(self, batch_len: int, sources: List[bytes]) -> str:
+        """Content key of a scan request.
+
+        Built from the model, system prompt, payload encoding, batch layout
+        (number of images) and the page images with their [G{N}] markers
+        blanked, so a page scanned at another page number or in another
+        document hits the same memo. Page numbers are mapped back by
+        position (see _renumber_scan_payload).
+        """
+        agent = self._processor.vlm_agent
+        model = getattr(getattr(getattr(agent, "vlm_client", None), "config", None), "model", "")
+        system = next(
+            (m.get("content") for m in getattr(agent, "messages", [])[:1] if m.get("role") == "system"),
+            "",
+        )
+        h = hashlib.sha256()
+        for part in ("scan-v2", str(model), str(system), repr(self._scan_encoding), str(batch_len)):
+            h.update(part.encode("utf-8") + b"\0")
+        for image in sources:
+            h.update(bytes.fromhex(page_content_digest(image)))
+        return h.hexdigest()
+
+    @staticmethod
+    def _scan_max_workers() -> int:
+        """Default scan concurrency: env VLM_SCAN_MAX_WORKERS or 1 (sequential)."""
+        raw = os.getenv("VLM_SCAN_MAX_WORKERS", "1").strip()
+        try:
+            value = int(raw)
+            return value if value > 0 else 1
+        except ValueError:
+            return 1
+
+    def _merge_scan_batch(
+        self,
+        batch_pages: List[int],
+        payload: ScanPayload,
+        stats: Dict[str, Any],
+        all_entries: List[OCRRegistryEntry],
+        all_text_chunks: List[str],
+        all_headers: List[dict],
+    ) -> None:
+        """Fold one batch result into the accumulators and mark its pages 'scan'."""
+        self.last_scan_stats.append(stats)
+        fallback_page = batch_pages[0] if len(batch_pages) == 1 else None
+        entries = normalize_scan_registry(
+            payload.get("ocr_registry") or [],
+            fallback_page=fallback_page,
+        )
+        all_entries.extend(entries)
+        chunk_text = payload.get("text") or ""
+        if chunk_text:
+            all_text_chunks.append(chunk_text)
+        structure = payload.get("structure") or {}
+        headers = structure.get("headers")
+        if isinstance(headers, list):
+            all_headers.extend(headers)
+
+        for page_num in batch_pages:
+            self._state_manager.set_page_resolution(page_num, "scan")
+
+    def scan(
+        self,
+        pages: Optional[Iterable[int]] = None,
+        max_workers: Optional[int] = None,
+    ) -> None:
         """Level 0: VLM-only scan. Reads pages via VLM, extracts text/structure, produces OCR Registry.
 
-        No OCR calls. Updates page_states to 'scan', upserts OCR Registry, saves for get_document_data().
+        No OCR calls. Every batch is an independent single-turn request
+        (system prompt + the batch's own images); no conversation history is
+        carried between batches. Per-batch request bytes and token usage are
+        logged and kept in `last_scan_stats`.
+
+        Batches run on a pool of `max_workers` threads. Results are merged
+        in batch (page) order, so the output is identical to a sequential run.
+
+        Defaults: max_workers from env VLM_SCAN_MAX_WORKERS or 1.
+
+        Updates page_states to 'scan', upserts OCR Registry, saves for get_document_data().
         """
         page_list = self._normalize_pages(pages)
-        self._ensure_pages_rendered()
         if not page_list:
             logger.warning("scan: no pages to process")
             return
+        self._ensure_pages_rendered(page_list)
 
-        page_to_image = {p.index: p.image for p in self._processor.pages}
         batch_size = self._scan_batch_size()
+        effective_workers = max_workers if max_workers and max_workers > 0 else self._scan_max_workers()
         all_entries: List[OCRRegistryEntry] = []
         all_text_chunks: List[str] = []
         all_headers: List[dict] = []
+        self.last_scan_stats = []
 
-        vlm_agent = self._processor.vlm_agent
-        vlm_agent.set_system_prompt(SCAN_PROMPT_TEXT)
-
-        for i in range(0, len(page_list), batch_size):
-            batch_pages = page_list[i:i + batch_size]
-            images: List[bytes] = []
-            for page_num in batch_pages:
-                img = page_to_image.get(page_num)
-                if img is not None:
-                    images.append(img)
-
-            if len(images) != len(batch_pages):
-                logger.warning(
-                    f"scan: expected {len(batch_pages)} images, got {len(images)} "
-                    f"for batch {batch_pages}"
-                )
+        self._processor.vlm_agent.set_system_prompt(SCAN_PROMPT_TEXT)
 
-            image_to_page = ", ".join(
-                f"изображение #{i + 1} — страница {p}"
-                for i, p in enumerate(batch_pages)
-            )
-            user_prompt = (
-                f"Тебе передано {len(batch_pages)} изображений в следующем порядке: "
-                f"{image_to_page}. Это и есть соответствие между позицией изображения "
-                "в запросе и номером страницы документа. Маркер [G{N}] в левом верхнем "
-                "углу каждой картинки — проверочный индикатор того же номера. "
-                "Для КАЖДОЙ записи в ocr_registry обязательно укажи page_num строго из "
-                f"списка {batch_pages}, соответствующий той картинке, на которой это "
-                "значение физически видно. Не приписывай сущности со второй картинки "
-                "первой и наоборот. Верни JSON в указанном формате."
-            )
-            response = vlm_agent.invoke_no_tools(user_prompt, images)
-            text = response.get("text")
-            if text is None:
-                error = response.get("error", "Unknown error")
-                logger.error(f"scan: VLM failed for batch {batch_pages}: {error}")
-                raise RuntimeError(f"scan failed for pages {batch_pages}: {error}")
-
-            payload = parse_scan_response(text)
-            fallback_page = batch_pages[0] if len(batch_pages) == 1 else None
-            entries = normalize_scan_registry(
-                payload.get("ocr_registry") or [],
-                fallback_page=fallback_page,
-            )
-            all_entries.extend(entries)
-            chunk_text = payload.get("text") or ""
-            if chunk_text:
-                all_text_chunks.append(chunk_text)
-            structure = payload.get("structure") or {}
-            headers = structure.get("headers")
-            if isinstance(headers, list):
-                all_headers.extend(headers)
+        batches = [
+            page_list[i:i + batch_size] for i in range(0, len(page_list), batch_size)
+        ]
 
-            for page_num in batch_pages:
-                self._state_manager.set_page_resolution(page_num, "scan")
+        def run_one(batch_pages: List[int]) -> Tuple[ScanPayload, Dict[str, Any]]:
+            return self._scan_batch(batch_pages)
 
-        if all_entries:
-            self._state_manager.upsert_ocr_entries(all_entries)
+        if effective_workers <= 1 or len(batches) <= 1:
+            iter_results = (run_one(b) for b in batches)
+            pool = None
+        else:
+            pool = ThreadPoolExecutor(max_workers=min(effective_workers, len(batches)))
+            # map() yields in submission order: merge stays page-ordered
+            iter_results = pool.map(run_one, batches)
+
+        # VLM calls run outside batch(): on SQLite it holds a write
+        # transaction, which must not span network-bound requests
+        done: List[Tuple[List[int], ScanPayload, Dict[str, Any]]] = []
+        completed = False
+        try:
+            for batch_pages, (payload, stats) in zip(batches, iter_results):
+                done.append((batch_pages, payload, stats))
+            completed = True
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+            # Page states of finished batches are written once, even on failure
+            with self._state_manager.batch():
+                for batch_pages, payload, stats in done:
+                    self._merge_scan_batch(
+                        batch_pages, payload, stats,
+                        all_entries, all_text_chunks, all_headers,
+                    )
+                if completed and all_entries:
+                    self._state_manager.upsert_ocr_entries(all_entries)
+        self._state_manager.compact()
 
         self._state_manager.save_operation_result(
             "full_description",
@@ -209,14 +497,16 @@ class DocumentReader:
                 "tables": [],
             },
         )
+        sizes = [s["request_bytes"] for s in self.last_scan_stats]
         logger.info(
             f"scan: {len(page_list)} pages, {len(all_entries)} registry entries, "
-            f"batch_size={batch_size}"
+            f"batch_size={batch_size}, workers={effective_workers}, batches={len(sizes)}, "
+            f"request_bytes max={max(sizes)} total={sum(sizes)}"
         )
 
     @staticmethod
     def _default_chunk_size() -> int:
-        """Default OCR chunk size: env OCR_CHUNK_SIZE or 5."""
+        """Default OCR chunk size: env OCR_CHUNK_SIZE or 5 ("auto" also gives 5)."""
         raw = os.getenv("OCR_CHUNK_SIZE", "5").strip()
         try:
             value = int(raw)
@@ -224,6 +514,21 @@ class DocumentReader:
         except ValueError:
             return 5
 
+    @staticmethod
+    def _adaptive_chunking() -> bool:
+        """True if env OCR_CHUNK_SIZE=auto (adaptive chunk sizing in resolve)."""
+        return os.getenv("OCR_CHUNK_SIZE", "").strip().lower() == "auto"
+
+    def _ocr_chunker(self, ocr_client: Any) -> AdaptiveChunker:
+        """AdaptiveChunker of this reader, persisted in the workspace root."""
+        if self._chunker is None:
+            model = getattr(getattr(ocr_client, "config", None), "model", "") or ""
+            path = self._workspace / TUNING_FILENAME if self._workspace is not None else None
+            self._chunker = AdaptiveChunker(
+                model=model, initial_size=self._default_chunk_size(), path=path
+            )
+        return self._chunker
+
     @staticmethod
     def _default_max_workers() -> int:
         """Default OCR concurrency: env OCR_MAX_WORKERS or 5."""
@@ -249,6 +554,9 @@ class DocumentReader:
 
         Defaults: chunk_size from env OCR_CHUNK_SIZE or 5;
                   max_workers from env OCR_MAX_WORKERS or 5.
+        With OCR_CHUNK_SIZE=auto (and no chunk_size argument) each page is
+        split by an AdaptiveChunker that learns from call latency and
+        missing blocks; its state persists in {workspace}/ocr_chunking.json.
         """
         ocr_tool = getattr(self._processor, "ocr_tool", None)
         if ocr_tool is None:
@@ -272,7 +580,12 @@ class DocumentReader:
 
         effective_chunk = chunk_size if chunk_size and chunk_size > 0 else self._default_chunk_size()
         effective_workers = max_workers if max_workers and max_workers > 0 else self._default_max_workers()
-        self._resolve_entities(pending, ocr_client, effective_chunk, effective_workers)
+        chunker = None
+        if not (chunk_size and chunk_size > 0) and self._adaptive_chunking():
+            chunker = self._ocr_chunker(ocr_client)
+        self._resolve_entities(
+            pending, ocr_client, effective_chunk, effective_workers, chunker=chunker
+        )
 
     def _ocr_pass(
         self,
@@ -281,9 +594,25 @@ class DocumentReader:
         chunk_size: int,
         max_workers: int,
         log_prefix: str = "ocr_pass",
+        use_cache: bool = True,
+        on_chunk: Optional[
+            Callable[[int, List[OCRRegistryEntry], Dict[str, Dict[str, Any]]], None]
+        ] = None,
+        chunker: Optional[AdaptiveChunker] = None,
     ) -> Dict[str, Dict[str, Any]]:
         """Run one OCR pass over entries, grouped by page in parallel chunks.
 
+        use_cache=False bypasses the client's response cache (OCR_CACHE_DIR).
+
+        Pages are split into chunks lazily, as worker slots free up. With a
+        `chunker` each page is split by its learned size (instead of the
+        fixed chunk_size) and every completed call is fed back to it.
+
+        Chunks are consumed in completion order. on_chunk(page_num, chunk,
+        chunk_results) is called (in the calling thread) as soon as each
+        chunk is done, with the usable ("ok"/"no_data") results of that
+        chunk, so callers can persist progress incrementally.
+
         Does NOT mutate state. Returns raw results keyed by entity_id:
           {entity_id: {"value": str, "context": Optional[str], "status": str}}
 
@@ -297,52 +626,74 @@ class DocumentReader:
         by_page = group_registry_by_page(entries)
         page_nums = sorted(by_page.keys())
 
-        tasks: List[Tuple[int, bytes, List[OCRRegistryEntry]]] = []
-        for page_num in page_nums:
-            page_entries = by_page[page_num]
-            image = self._state_manager.load_page(page_num)
-            if image is None:
-                logger.warning(f"{log_prefix}: page {page_num} not found, skipping")
-                continue
-            for start in range(0, len(page_entries), chunk_size):
-                tasks.append((page_num, image, page_entries[start:start + chunk_size]))
+        self._ensure_pages_rendered(page_nums)
+
+        def plan_tasks() -> Iterator[Tuple[int, bytes, List[OCRRegistryEntry]]]:
+            for page_num in page_nums:
+                page_entries = by_page[page_num]
+                image = self._state_manager.load_page(page_num)
+                if image is None:
+                    logger.warning(f"{log_prefix}: page {page_num} not found, skipping")
+                    continue
+                if chunker is not None:
+                    chunks = chunker.split(page_entries, [e.prompt for e in page_entries])
+                else:
+                    chunks = [
+                        page_entries[start:start + chunk_size]
+                        for start in range(0, len(page_entries), chunk_size)
+                    ]
+                for chunk in chunks:
+                    yield page_num, image, chunk
 
         results: Dict[str, Dict[str, Any]] = {
             e.entity_id: {"value": "", "context": None, "status": "error"}
             for e in entries
         }
-        if not tasks:
-            return results
+        limiter = getattr(ocr_client, "rate_limiter", None)
+        limiter_before = limiter.stats() if limiter is not None else None
 
         def run_one(
             task: Tuple[int, bytes, List[OCRRegistryEntry]],
-        ) -> Tuple[int, List[OCRRegistryEntry], Optional[List[Dict[str, Any]]], Optional[str]]:
+        ) -> Tuple[
+            int, List[OCRRegistryEntry], Optional[List[Dict[str, Any]]], Optional[str], float, bool
+        ]:
             page_num, image, chunk = task
             prompts = [e.prompt for e in chunk]
+            start = time.monotonic()
             try:
-                out = ocr_client.extract_batch(image, prompts, page_num)
-                return page_num, chunk, out, None
+                out = ocr_client.extract_batch(
+                    image, prompts, page_num, use_cache=use_cache
+                )
+                return page_num, chunk, out, None, time.monotonic() - start, False
             except QwenClientError as exc:
-                return page_num, chunk, None, f"QwenClientError: {exc}"
+                err, lost = f"QwenClientError: {exc}", _chunk_lost(exc)
             except Exception as exc:
-                return page_num, chunk, None, f"{type(exc).__name__}: {exc}"
+                err, lost = f"{type(exc).__name__}: {exc}", _chunk_lost(exc)
+            return page_num, chunk, None, err, time.monotonic() - start, lost
 
         if max_workers <= 1:
-            iter_results = (run_one(t) for t in tasks)
+            iter_results = (run_one(t) for t in plan_tasks())
             pool = None
         else:
             pool = ThreadPoolExecutor(max_workers=max_workers)
-            iter_results = pool.map(run_one, tasks)
+            # Completion order: a slow chunk does not hold back finished ones
+            iter_results = _completed_in_window(
+                pool, run_one, plan_tasks(), window=2 * max_workers
+            )
 
         total_calls = 0
+        completed = False
         try:
-            for page_num, chunk, chunk_results, err in iter_results:
+            for page_num, chunk, chunk_results, err, latency_s, lost in iter_results:
                 total_calls += 1
                 if err is not None:
                     logger.warning(
                         f"{log_prefix}: OCR error for page={page_num} "
                         f"chunk_size={len(chunk)}: {err}"
                     )
+                    if chunker is not None and lost:
+                        # A timeout or unparseable response lost the whole chunk
+                        chunker.observe([e.prompt for e in chunk], latency_s, len(chunk))
                     continue
 
                 if len(chunk_results) != len(chunk):
@@ -350,13 +701,22 @@ class DocumentReader:
                         f"{log_prefix}: result count mismatch for page={page_num} "
                         f"(got {len(chunk_results)}, expected {len(chunk)})"
                     )
+                from_cache = bool(chunk_results) and all(r.get("cached") for r in chunk_results)
+                if chunker is not None and not from_cache:
+                    # Blocks the model dropped, including ones the client re-asked
+                    missing = max(0, len(chunk) - len(chunk_results)) + sum(
+                        1 for res in chunk_results
+                        if res.get("repaired") or res.get("status") == "error"
+                    )
+                    chunker.observe([e.prompt for e in chunk], latency_s, missing)
 
+                chunk_done: Dict[str, Dict[str, Any]] = {}
                 for entry, res in zip(chunk, chunk_results):
                     status = res.get("status", "error")
                     value = res.get("value", "") or ""
                     context = res.get("context") or res.get("explanation") or ""
                     if status in ("ok", "no_data"):
-                        results[entry.entity_id] = {
+                        chunk_done[entry.entity_id] = {
                             "value": value,
                             "context": context,
                             "status": status,
@@ -366,14 +726,37 @@ class DocumentReader:
                             f"{log_prefix}: status={status} for entity {entry.entity_id} "
                             f"page={page_num}"
                         )
+                results.update(chunk_done)
+                if on_chunk is not None and chunk_done:
+                    on_chunk(page_num, chunk, chunk_done)
+            completed = True
         finally:
             if pool is not None:
-                pool.shutdown(wait=True)
+                # On error/Ctrl-C drop queued chunks instead of running them unobserved
+                pool.shutdown(wait=True, cancel_futures=not completed)
+            if chunker is not None:
+                chunker.save()
 
         logger.info(
             f"{log_prefix}: processed {len(page_nums)} pages in {total_calls} OCR calls "
-            f"(chunk_size={chunk_size}, max_workers={max_workers})"
+            f"(chunk_size={'adaptive' if chunker is not None else chunk_size}, "
+            f"max_workers={max_workers})"
         )
+        cache = getattr(ocr_client, "cache", None) if use_cache else None
+        if cache is not None:
+            stats = cache.stats()
+            logger.info(
+                f"{log_prefix}: OCR cache hits={stats['hits']} misses={stats['misses']} "
+                f"evictions={stats['evictions']}"
+            )
+        if limiter is not None:
+            after = limiter.stats()
+            logger.info(
+                f"{log_prefix}: rate limiter waits={after['waits'] - limiter_before['waits']} "
+                f"wait={after['wait_s'] - limiter_before['wait_s']:.1f}s "
+                f"throttled={after['throttled'] - limiter_before['throttled']} "
+                f"scale={after['scale']:.2f}"
+            )
         return results
 
     def _resolve_entities(
@@ -382,31 +765,47 @@ class DocumentReader:
         ocr_client: Any,
         chunk_size: int,
         max_workers: int,
+        chunker: Optional[AdaptiveChunker] = None,
     ) -> None:
-        """Execute OCR for pending entities via _ocr_pass and persist."""
-        results = self._ocr_pass(
-            pending, ocr_client, chunk_size, max_workers, log_prefix="resolve"
-        )
+        """Execute OCR for pending entities via _ocr_pass, persisting each chunk.
 
-        by_page = group_registry_by_page(pending)
-        for page_num, page_entries in sorted(by_page.items()):
-            updated: List[OCRRegistryEntry] = []
-            any_success = False
-            for entry in page_entries:
-                res = results.get(entry.entity_id)
-                if res is None or res["status"] not in ("ok", "no_data"):
-                    continue
-                updated.append(
-                    apply_ocr_result(
-                        entry, res["value"], res["context"], resolution=1
-                    )
+        Results are written (one journal append per chunk) as chunks
+        complete, so an interrupted resolve keeps everything done so far and
+        a rerun only sees the entities still pending.
+        """
+
+        def persist_chunk(
+            page_num: int,
+            chunk: List[OCRRegistryEntry],
+            chunk_results: Dict[str, Dict[str, Any]],
+        ) -> None:
+            updated = [
+                apply_ocr_result(
+                    entry,
+                    chunk_results[entry.entity_id]["value"],
+                    chunk_results[entry.entity_id]["context"],
+                    resolution=1,
                 )
-                any_success = True
-            if updated:
+                for entry in chunk
+                if entry.entity_id in chunk_results
+            ]
+            with self._state_manager.batch():
                 self._state_manager.upsert_ocr_entries(updated)
-            if any_success:
                 self._state_manager.set_page_resolution(page_num, "resolved")
 
+        try:
+            self._ocr_pass(
+                pending,
+                ocr_client,
+                chunk_size,
+                max_workers,
+                log_prefix="resolve",
+                on_chunk=persist_chunk,
+                chunker=chunker,
+            )
+        finally:
+            self._state_manager.compact()
+
     @staticmethod
     def _default_verify_axes() -> List[int]:
         """Default verify axes (chunk_size values): env OCR_VERIFY_AXES or '1,3,5'."""
@@ -462,8 +861,7 @@ class DocumentReader:
         effective_axes = [a for a in (axes or []) if a and a > 0] or self._default_verify_axes()
         effective_workers = max_workers if max_workers and max_workers > 0 else self._default_max_workers()
 
-        registry = self._state_manager.load_ocr_registry()
-        targets = [e for e in registry if e.page_num in page_list]
+        targets = self._state_manager.entries_for_pages(page_list)
         if not targets:
             logger.info(f"verify: no registry entries for pages {page_list}")
             return
@@ -482,6 +880,8 @@ class DocumentReader:
                 chunk_size=axis,
                 max_workers=effective_workers,
                 log_prefix=f"verify[chunk={axis}]",
+                # Voting needs independent samples, never cached answers
+                use_cache=False,
             )
             runs.append(results)
 
@@ -519,11 +919,13 @@ class DocumentReader:
             )
             page_any_success[entry.page_num] = True
 
-        if updated_entries:
-            self._state_manager.upsert_ocr_entries(updated_entries)
-        for page_num, ok in page_any_success.items():
-            if ok:
-                self._state_manager.set_page_resolution(page_num, "verified")
+        with self._state_manager.batch():
+            if updated_entries:
+                self._state_manager.upsert_ocr_entries(updated_entries)
+            for page_num, ok in page_any_success.items():
+                if ok:
+                    self._state_manager.set_page_resolution(page_num, "verified")
+        self._state_manager.compact()
 
         unanimous = sum(1 for e in updated_entries if e.verified)
         logger.info(
@@ -531,6 +933,16 @@ class DocumentReader:
             f"unanimous={unanimous}/{len(updated_entries)}"
         )
 
+    def close(self) -> None:
+        """Fold pending state journal records into state.json."""
+        self._state_manager.close()
+
+    def __enter__(self) -> "DocumentReader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
     def page_status(self) -> Dict[int, PageResolution]:
         """Return page resolution status from StateManager."""
         return self._state_manager.page_status()
@@ -0,0 +1,187 @@
+"""Codecs for operation results (`results/*` storage keys).
+
+Results such as full_description carry megabytes of text and thousands of
+headers; PyYAML's pure-Python dump/load of those takes seconds. A
+ResultsCodec picks the serialization ("json", "msgpack" or "yaml") and an
+optional compression ("gzip" or "zstd"); the file extension records both,
+e.g. full_description.json, full_description.msgpack.zst.
+
+Reads go by extension, so legacy .yaml results (and results written with
+another codec) load transparently. msgpack and zstandard are optional
+dependencies, needed only when selected.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, List, Optional
+
+import yaml
+
+try:
+    import msgpack
+except ImportError:  # optional
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+_FORMAT_EXTENSIONS = {"json": ".json", "msgpack": ".msgpack", "yaml": ".yaml"}
+_COMPRESSION_EXTENSIONS = {"gzip": ".gz", "zstd": ".zst"}
+
+# libyaml bindings when PyYAML was built with them
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+@dataclass(frozen=True)
+class ResultsCodec:
+    """Serialization + optional compression of operation results.
+
+    Args:
+        format: "json" (compact, default), "msgpack" or "yaml"
+        compression: None, "gzip" or "zstd"
+        level: Compression level (None = library default)
+    """
+
+    format: str = "json"
+    compression: Optional[str] = None
+    level: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if self.format not in _FORMAT_EXTENSIONS:
+            raise ValueError(
+                f"Unknown results format '{self.format}', expected one of {sorted(_FORMAT_EXTENSIONS)}"
+            )
+        if self.compression is not None and self.compression not in _COMPRESSION_EXTENSIONS:
+            raise ValueError(
+                f"Unknown results compression '{self.compression}', "
+                f"expected one of {sorted(_COMPRESSION_EXTENSIONS)}"
+            )
+        if self.format == "msgpack" and msgpack is None:
+            raise ImportError("msgpack is required for the msgpack results codec (pip install msgpack)")
+        if self.compression == "zstd" and zstandard is None:
+            raise ImportError("zstandard is required for zstd results compression (pip install zstandard)")
+
+    @property
+    def extension(self) -> str:
+        ext = _FORMAT_EXTENSIONS[self.format]
+        if self.compression:
+            ext += _COMPRESSION_EXTENSIONS[self.compression]
+        return ext
+
+    @classmethod
+    def parse(cls, spec: str) -> "ResultsCodec":
+        """Build from "format[+compression]", e.g. "json", "msgpack+zstd"."""
+        fmt, _, compression = spec.strip().lower().partition("+")
+        return cls(format=fmt or "json", compression=compression or None)
+
+    @classmethod
+    def from_env(cls, default: str = "json") -> "ResultsCodec":
+        """Codec from RESULTS_CODEC; invalid or unavailable values fall back to `default`."""
+        spec = os.environ.get("RESULTS_CODEC", "").strip() or default
+        try:
+            return cls.parse(spec)
+        except (ValueError, ImportError) as e:
+            logger.warning(f"Invalid RESULTS_CODEC '{spec}' ({e}), using {default}")
+            return cls.parse(default)
+
+    @classmethod
+    def for_path(cls, path: Path) -> "ResultsCodec":
+        """Codec that wrote `path`, inferred from its extension."""
+        suffixes = path.suffixes[-2:]
+        compression = None
+        if suffixes and suffixes[-1] in _COMPRESSION_EXTENSIONS.values():
+            compression = next(
+                k for k, v in _COMPRESSION_EXTENSIONS.items() if v == suffixes[-1]
+            )
+            suffixes = suffixes[:-1]
+        ext = suffixes[-1] if suffixes else ""
+        for fmt, fmt_ext in _FORMAT_EXTENSIONS.items():
+            if ext == fmt_ext:
+                return cls(format=fmt, compression=compression)
+        raise ValueError(f"Unknown results file extension: {path.name}")
+
+    def dumps(self, value: Any) -> bytes:
+        if self.format == "json":
+            data = json.dumps(
+                value, ensure_ascii=False, separators=(",", ":"), default=str
+            ).encode("utf-8")
+        elif self.format == "msgpack":
+            data = msgpack.packb(value, use_bin_type=True, default=str)
+        else:
+            data = yaml.dump(
+                value, Dumper=_YAML_DUMPER, allow_unicode=True, default_flow_style=False
+            ).encode("utf-8")
+        if self.compression == "gzip":
+            return gzip.compress(data, compresslevel=6 if self.level is None else self.level)
+        if self.compression == "zstd":
+            return zstandard.ZstdCompressor(level=3 if self.level is None else self.level).compress(data)
+        return data
+
+    def loads(self, data: bytes) -> Any:
+        if self.compression == "gzip":
+            data = gzip.decompress(data)
+        elif self.compression == "zstd":
+            data = zstandard.ZstdDecompressor().decompress(data)
+        if self.format == "json":
+            return json.loads(data)
+        if self.format == "msgpack":
+            return msgpack.unpackb(data, raw=False, strict_map_key=False)
+        return yaml.load(data, Loader=_YAML_LOADER)
+
+
+def _candidate_extensions(codec: ResultsCodec) -> List[str]:
+    """Extensions to probe for a result: the codec's own first, then all others."""
+    exts = [codec.extension]
+    for fmt_ext in _FORMAT_EXTENSIONS.values():
+        for comp_ext in ("", *_COMPRESSION_EXTENSIONS.values()):
+            if fmt_ext + comp_ext not in exts:
+                exts.append(fmt_ext + comp_ext)
+    return exts
+
+
+def find_result_file(base: Path, codec: ResultsCodec) -> Optional[Path]:
+    """Existing file for result `base` (path without extension), or None."""
+    for ext in _candidate_extensions(codec):
+        path = base.with_name(base.name + ext)
+        if path.exists():
+            return path
+    return None
+
+
+def write_result(base: Path, value: Any, codec: ResultsCodec) -> Path:
+    """Write result with `codec`, replacing files left by other codecs."""
+    path = base.with_name(base.name + codec.extension)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(codec.dumps(value))
+    tmp.replace(path)
+    for ext in _candidate_extensions(codec)[1:]:
+        base.with_name(base.name + ext).unlink(missing_ok=True)
+    return path
+
+
+def read_result(base: Path, codec: ResultsCodec, default: Any = None) -> Any:
+    """Load result `base` in whatever codec it was written with."""
+    path = find_result_file(base, codec)
+    if path is None:
+        return default
+    return ResultsCodec.for_path(path).loads(path.read_bytes())
+
+
+__all__ = [
+    "ResultsCodec",
+    "find_result_file",
+    "read_result",
+    "write_result",
+]
@@ -0,0 +1,204 @@
+"""Retry policy and circuit breaker shared by the DashScope clients.
+
+Both clients used to sleep a deterministic `backoff_base ** (attempt - 1)`
+between attempts, so workers that failed together retried together, and a
+degraded endpoint kept receiving every attempt of every chunk.
+
+- RetryPolicy draws "decorrelated jitter" delays (each delay is uniform
+  between `base_s` and `factor` x the previous one, capped) and never retries
+  sooner than the server's Retry-After.
+- CircuitBreaker (one per API key, shared by VLM and OCR clients) opens after
+  `failure_threshold` consecutive 5xx/network failures. While open, requests
+  either fail fast (CircuitOpenError) or wait ("park") until the reset
+  timeout; then a single probe request decides whether it closes again.
+
+Breaker settings come from env CIRCUIT_BREAKER (fail | wait | off, default
+fail), CIRCUIT_FAILURES (default 5) and CIRCUIT_RESET_S (default 30).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+BREAKER_MODES = ("fail", "wait", "off")
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending a request while the circuit is open."""
+
+
+@dataclass
+class RetryPolicy:
+    """Jittered backoff between attempts of one request.
+
+    Attributes:
+        base_s: Smallest delay in seconds
+        factor: Upper bound of a delay relative to the previous one
+        cap_s: Largest jittered delay in seconds
+        max_retry_after_s: Largest Retry-After that is honoured
+    """
+
+    base_s: float = 1.0
+    factor: float = 1.5
+    cap_s: float = 30.0
+    max_retry_after_s: float = 60.0
+
+    def next_delay(self, prev: Optional[float], retry_after: Optional[float] = None) -> float:
+        """Delay before the next attempt, given the previous delay (None on the first retry)."""
+        upper = max(self.base_s, (prev or self.base_s) * self.factor)
+        delay = min(self.cap_s, random.uniform(self.base_s, upper))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_retry_after_s))
+        return delay
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker (thread-safe).
+
+    Every request calls before_request() and then exactly one of
+    record_success() (any response below 500, including 4xx/429: the
+    endpoint answered) or record_failure() (5xx, network error).
+
+    Args:
+        failure_threshold: Consecutive failures that open the circuit
+        reset_timeout_s: Seconds the circuit stays open before a probe
+        mode: "fail" raises CircuitOpenError while open, "wait" parks the
+            caller until the probe succeeds, "off" disables the breaker
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout_s: float = 30.0,
+        mode: str = "fail",
+    ) -> None:
+        if mode not in BREAKER_MODES:
+            raise ValueError(f"Unknown circuit breaker mode: {mode!r}")
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout_s = reset_timeout_s
+        self.mode = mode
+        self._failures = 0
+        self._open_until: Optional[float] = None  # None = closed
+        self._probe_since: Optional[float] = None
+        self._cond = threading.Condition()
+        self._stats = {"opened": 0, "rejected": 0, "parked_s": 0.0}
+
+    @property
+    def state(self) -> str:
+        with self._cond:
+            if self._open_until is None:
+                return "closed"
+            return "open" if time.monotonic() < self._open_until else "half_open"
+
+    def before_request(self) -> float:
+        """Admit one request. Returns seconds parked.
+
+        Raises:
+            CircuitOpenError: In "fail" mode while open (or while the probe runs)
+        """
+        if self.mode == "off":
+            return 0.0
+        start = time.monotonic()
+        parked = 0.0
+        with self._cond:
+            while self._open_until is not None:
+                now = time.monotonic()
+                # A probe that never reported back does not block forever
+                probe_lost = (
+                    self._probe_since is not None
+                    and now - self._probe_since >= self.reset_timeout_s
+                )
+                if now >= self._open_until and (self._probe_since is None or probe_lost):
+                    self._probe_since = now
+                    logger.info("Circuit breaker: half-open, sending probe request")
+                    break
+                if self.mode == "fail":
+                    self._stats["rejected"] += 1
+                    raise CircuitOpenError(
+                        f"circuit open after {self._failures} consecutive failures, "
+                        f"retry in {max(0.0, self._open_until - now):.0f}s"
+                    )
+                self._cond.wait(timeout=max(0.01, self._open_until - now))
+                parked = time.monotonic() - start
+            self._stats["parked_s"] += parked
+        return parked
+
+    def record_success(self) -> None:
+        if self.mode == "off":
+            return
+        with self._cond:
+            if self._open_until is not None:
+                logger.info("Circuit breaker: closed")
+            self._failures = 0
+            self._open_until = None
+            self._probe_since = None
+            self._cond.notify_all()
+
+    def record_failure(self) -> None:
+        if self.mode == "off":
+            return
+        with self._cond:
+            self._failures += 1
+            probing = self._probe_since is not None
+            if probing or (self._open_until is None and self._failures >= self.failure_threshold):
+                self._open_until = time.monotonic() + self.reset_timeout_s
+                self._probe_since = None
+                self._stats["opened"] += 1
+                logger.warning(
+                    f"Circuit breaker: open for {self.reset_timeout_s:.0f}s after "
+                    f"{self._failures} consecutive failures"
+                )
+                self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = dict(self._stats)
+        return {**stats, "state": self.state}
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def _env_number(name: str, default: float) -> float:
+    raw = os.getenv(name, "").strip()
+    try:
+        value = float(raw) if raw else default
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """Return the process-wide breaker for `name` (e.g. one per API key).
+
+    Created on first use from env CIRCUIT_BREAKER / CIRCUIT_FAILURES /
+    CIRCUIT_RESET_S (invalid values fall back to the defaults).
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            mode = os.getenv("CIRCUIT_BREAKER", "fail").strip().lower()
+            breaker = CircuitBreaker(
+                failure_threshold=int(_env_number("CIRCUIT_FAILURES", 5)),
+                reset_timeout_s=_env_number("CIRCUIT_RESET_S", 30.0),
+                mode=mode if mode in BREAKER_MODES else "fail",
+            )
+            _breakers[name] = breaker
+        return breaker
+
+
+__all__ = [
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "RetryPolicy",
+    "get_circuit_breaker",
+]
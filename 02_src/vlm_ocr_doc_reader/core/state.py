@@ -3,13 +3,36 @@
 import hashlib
 import json
 import logging
+import os
 import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from contextlib import contextmanager, nullcontext
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Literal, Optional, Protocol, TypedDict
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Protocol,
+    Set,
+    Tuple,
+    TypedDict,
+)
 
-import yaml
+from .blob_store import BlobStore
+from .file_lock import FileLock
+from .page_pack import PagePack
+from .results_codec import ResultsCodec, find_result_file, read_result, write_result
 
 logger = logging.getLogger(__name__)
 
@@ -217,30 +240,263 @@ def _resolution_state_from_dict(data: dict) -> ResolutionDocumentState:
     )
 
 
+# --- State journal ---
+
+# Append-only JSONL write-ahead log of registry upserts and page-state
+# changes. Replayed on top of state.json on load, folded into it by
+# StateManager.compact().
+_JOURNAL_KEY = "state_journal/journal"
+_JOURNAL_FILENAME = "state.journal.jsonl"
+_BLOB_REFS_FILENAME = "blob_refs.jsonl"
+_LOCK_FILENAME = "state.lock"
+
+
+def _write_jsonl(path: Path, records: List[dict], mode: str = "w") -> None:
+    """Write records as one JSON object per line ("w" replaces, "a" appends)."""
+    with path.open(mode, encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+            f.write("\n")
+        f.flush()
+
+
+def _read_jsonl(path: Path) -> List[dict]:
+    """Read JSONL records. A torn last line (crash mid-append) is skipped."""
+    records: List[dict] = []
+    with path.open("r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping unreadable journal line {lineno} in {path}")
+    return records
+
+
+def _apply_state_records(
+    state: ResolutionDocumentState,
+    records: Iterable[dict],
+) -> None:
+    """Apply change records ("upsert" / "page") to `state` in place, in order."""
+    by_id = {e.entity_id: i for i, e in enumerate(state.ocr_registry)}
+    for record in records:
+        op = record.get("op")
+        if op == "upsert":
+            for entry in _registry_from_dict(record.get("entries") or []):
+                if entry.entity_id in by_id:
+                    state.ocr_registry[by_id[entry.entity_id]] = entry
+                else:
+                    by_id[entry.entity_id] = len(state.ocr_registry)
+                    state.ocr_registry.append(entry)
+        elif op == "page":
+            status = _validate_page_resolution(record.get("status"))
+            try:
+                page_num = int(record.get("page_num", 0))
+            except (TypeError, ValueError):
+                page_num = 0
+            if status is not None and page_num >= 1:
+                state.page_states[page_num] = status
+        else:
+            logger.warning(f"Skipping unknown state record op={op!r}")
+
+
+def _merge_missing_state(
+    state: ResolutionDocumentState,
+    other: ResolutionDocumentState,
+) -> int:
+    """Add to `state` the page states and registry entries only `other` has.
+
+    Merge-on-write for snapshots: whatever another process stored that this
+    one never saw is kept; values present in `state` win. Returns the
+    number of page states and entries added.
+    """
+    added = 0
+    for page_num, status in other.page_states.items():
+        if page_num not in state.page_states:
+            state.page_states[page_num] = status
+            added += 1
+    known = {e.entity_id for e in state.ocr_registry}
+    for entry in other.ocr_registry:
+        if entry.entity_id not in known:
+            state.ocr_registry.append(entry)
+            added += 1
+    return added
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of `path`, or None if it does not exist."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class _RegistryIndex:
+    """Positions of registry entries by entity_id, page and resolution.
+
+    Wraps the registry list and keeps the maps in step with upsert(), so
+    lookups and pending/page selections do not scan the whole registry.
+    Keys are recorded per position, so entries mutated in place by callers
+    cannot leave stale index sets behind.
+    """
+
+    def __init__(self, registry: List[OCRRegistryEntry]) -> None:
+        self.registry = registry
+        self.by_id: Dict[str, int] = {}
+        self.by_page: Dict[int, Set[int]] = {}
+        self.by_resolution: Dict[int, Set[int]] = {}
+        self._keys: List[Tuple[int, int]] = []
+        for i, entry in enumerate(registry):
+            self._keys.append((entry.page_num, entry.resolution))
+            self._add(i, entry)
+
+    def _add(self, i: int, entry: OCRRegistryEntry) -> None:
+        self.by_id[entry.entity_id] = i
+        self.by_page.setdefault(entry.page_num, set()).add(i)
+        self.by_resolution.setdefault(entry.resolution, set()).add(i)
+
+    def upsert(self, entry: OCRRegistryEntry) -> None:
+        i = self.by_id.get(entry.entity_id)
+        if i is None:
+            self.registry.append(entry)
+            self._keys.append((entry.page_num, entry.resolution))
+            self._add(len(self.registry) - 1, entry)
+            return
+        page_num, resolution = self._keys[i]
+        self.by_page[page_num].discard(i)
+        self.by_resolution[resolution].discard(i)
+        self.registry[i] = entry
+        self._keys[i] = (entry.page_num, entry.resolution)
+        self._add(i, entry)
+
+    def get(self, entity_id: str) -> Optional[OCRRegistryEntry]:
+        i = self.by_id.get(entity_id)
+        return None if i is None else self.registry[i]
+
+    def select(
+        self,
+        page_nums: Optional[Iterable[int]] = None,
+        max_resolution: Optional[int] = None,
+    ) -> List[OCRRegistryEntry]:
+        """Entries filtered by page and/or resolution, in registry order."""
+        positions: Optional[Set[int]] = None
+        if page_nums is not None:
+            positions = set()
+            for page_num in set(page_nums):
+                positions |= self.by_page.get(page_num, set())
+        if max_resolution is not None:
+            matching: Set[int] = set()
+            for resolution, idxs in self.by_resolution.items():
+                if resolution <= max_resolution:
+                    matching |= idxs
+            positions = matching if positions is None else positions & matching
+        if positions is None:
+            return list(self.registry)
+        return [self.registry[i] for i in sorted(positions)]
+
+
 # --- Workspace (ADR-001) ---
 
-_CHUNK_SIZE = 65536  # 64KB for hashing large files
+_CHUNK_SIZE = 1 << 20  # 1MB reads for hashing large files
+
+HASH_ALGORITHMS = ("sha256", "blake2b")
+_HASH_CACHE_FILENAME = "content_hashes.json"
+_HASH_CACHE_MAX_ENTRIES = 4096
+_hash_cache_lock = threading.Lock()
 
 
-def compute_content_hash(pdf_path: Path) -> str:
-    """Compute SHA256 hex digest of file content.
+def compute_content_hash(pdf_path: Path, algorithm: str = "sha256") -> str:
+    """Compute hex digest of file content.
 
-    Reads file in 64KB chunks for memory efficiency with large PDFs.
+    Reads file in 1MB chunks for memory efficiency with large PDFs.
     Supports empty files (returns hash of b"").
 
     Args:
         pdf_path: Path to PDF file
+        algorithm: "sha256" (default, ADR-001 workspace names) or "blake2b"
+            (256-bit digest; faster on CPUs without SHA extensions)
 
     Returns:
-        64-character hex string (full SHA256 digest)
+        64-character hex string (full digest)
     """
-    hash_obj = hashlib.sha256()
-    with pdf_path.open("rb") as f:
+    if algorithm == "sha256":
+        hash_obj = hashlib.sha256()
+    elif algorithm == "blake2b":
+        hash_obj = hashlib.blake2b(digest_size=32)
+    else:
+        raise ValueError(f"Unknown hash algorithm '{algorithm}', expected one of {HASH_ALGORITHMS}")
+    with Path(pdf_path).open("rb") as f:
         while chunk := f.read(_CHUNK_SIZE):
             hash_obj.update(chunk)
     return hash_obj.hexdigest()
 
 
+def _file_stamp(path: Path) -> List[int]:
+    st = path.stat()
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+
+def _load_hash_cache(cache_path: Path) -> Dict[str, dict]:
+    try:
+        with cache_path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    entries = data.get("entries") if isinstance(data, dict) else None
+    return entries if isinstance(entries, dict) else {}
+
+
+def cached_content_hash(
+    pdf_path: Path,
+    workspace: Path,
+    algorithm: str = "sha256",
+) -> str:
+    """compute_content_hash() memoized in {workspace}/content_hashes.json.
+
+    Entries are keyed by (absolute path, algorithm) and valid while the file's
+    (size, mtime_ns, inode) are unchanged, so reopening an unchanged PDF skips
+    reading it. The cache is only written if the workspace root exists.
+
+    Args:
+        pdf_path: Path to PDF file
+        workspace: Workspace root directory
+        algorithm: See compute_content_hash()
+
+    Returns:
+        64-character hex string (full digest)
+    """
+    path = Path(pdf_path).resolve()
+    cache_path = Path(workspace) / _HASH_CACHE_FILENAME
+    key = f"{algorithm}:{path}"
+    stamp = _file_stamp(path)
+    with _hash_cache_lock:
+        hit = _load_hash_cache(cache_path).get(key)
+    if isinstance(hit, dict) and hit.get("stat") == stamp and hit.get("digest"):
+        return hit["digest"]
+
+    digest = compute_content_hash(path, algorithm)
+    if _file_stamp(path) != stamp or not cache_path.parent.is_dir():
+        # Changed while hashing, or no workspace yet: do not cache
+        return digest
+    with _hash_cache_lock:
+        entries = _load_hash_cache(cache_path)
+        entries.pop(key, None)
+        entries[key] = {"stat": stamp, "digest": digest}
+        while len(entries) > _HASH_CACHE_MAX_ENTRIES:
+            entries.pop(next(iter(entries)))
+        tmp = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            with tmp.open("w", encoding="utf-8") as f:
+                json.dump({"version": 1, "entries": entries}, f, ensure_ascii=False)
+            tmp.replace(cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write content hash cache {cache_path}: {e}")
+    return digest
+
+
 def build_document_subdir_name(pdf_path: Path, content_hash: str) -> str:
     """Build document subdirectory name: stem_hash6.
 
@@ -248,7 +504,7 @@ def build_document_subdir_name(pdf_path: Path, content_hash: str) -> str:
 
     Args:
         pdf_path: Path to PDF file
-        content_hash: Full SHA256 hex digest (64 chars)
+        content_hash: Full hex digest (64 chars)
 
     Returns:
         {stem}_{hash6} where hash6 is first 6 chars of content_hash
@@ -280,12 +536,31 @@ class WorkspaceStorage:
         self._paths = paths
 
     @classmethod
-    def from_pdf(cls, pdf_path: Path, workspace: Path) -> "WorkspaceStorage":
+    def from_pdf(
+        cls,
+        pdf_path: Path,
+        workspace: Path,
+        hash_algorithm: Optional[str] = None,
+    ) -> "WorkspaceStorage":
         """Create WorkspaceStorage from PDF path and workspace root.
 
-        Computes content_hash, builds document subdir. Does not create directories.
+        Computes content_hash (via the workspace hash cache), builds document
+        subdir. Does not create directories.
+
+        Args:
+            pdf_path: Path to PDF file
+            workspace: Workspace root directory
+            hash_algorithm: "sha256" or "blake2b"; None reads WORKSPACE_HASH
+                (default sha256). Documents hashed with another algorithm get
+                a different subdir.
         """
-        content_hash = compute_content_hash(pdf_path)
+        algorithm = hash_algorithm
+        if algorithm is None:
+            algorithm = (os.environ.get("WORKSPACE_HASH") or "sha256").strip().lower()
+            if algorithm not in HASH_ALGORITHMS:
+                logger.warning(f"Unknown WORKSPACE_HASH '{algorithm}', using sha256")
+                algorithm = "sha256"
+        content_hash = cached_content_hash(pdf_path, Path(workspace), algorithm)
         subdir_name = build_document_subdir_name(pdf_path, content_hash)
         document_dir = Path(workspace) / subdir_name
         paths = WorkspacePaths(
@@ -301,14 +576,19 @@ class WorkspaceStorage:
     def paths(self) -> WorkspacePaths:
         return self._paths
 
-    def ensure_initialized(self) -> None:
-        """Create document_dir, pages/, vlm_responses/, results/. Create empty state.json and registry.json if missing."""
+    def ensure_initialized(self, create_state_files: bool = True) -> None:
+        """Create document_dir, pages/, vlm_responses/, results/. Create empty state.json and registry.json if missing.
+
+        create_state_files=False skips the JSON state files (SQLite backend).
+        """
         doc_dir = self._paths.document_dir
         doc_dir.mkdir(parents=True, exist_ok=True)
         self._paths.pages_dir.mkdir(parents=True, exist_ok=True)
         (doc_dir / "vlm_responses").mkdir(parents=True, exist_ok=True)
         (doc_dir / "results").mkdir(parents=True, exist_ok=True)
 
+        if not create_state_files:
+            return
         if not self._paths.state_json.exists():
             empty_state = {
                 "page_states": {},
@@ -352,11 +632,124 @@ class WorkspaceStorage:
 
 
 class WorkspaceBackend:
-    """StorageBackend implementation for workspace (ADR-001)."""
+    """StorageBackend implementation for workspace (ADR-001).
+
+    `results/*` keys are written with `results_codec` (default: RESULTS_CODEC,
+    else compact JSON); results in any other codec, including legacy YAML,
+    are still read.
+
+    With page_store="pack" (or PAGE_STORE=pack, or an existing pack in
+    pages/) page images go to a single PagePack and load() returns
+    memoryview slices of its mmap; pages stored as page_NNN.png by older
+    runs are still read.
+
+    With blobs="pages" or "all" (or WORKSPACE_BLOBS) page images, and with
+    "all" also VLM responses, are saved once per workspace in the shared
+    BlobStore ({workspace}/blobs); the document keeps key -> digest refs in
+    blob_refs.jsonl. Refs are always honoured on read; refs appended by
+    other processes are picked up as the file grows.
+
+    lock() is an inter-process FileLock on the document (state.lock) that
+    StateManager holds around read-modify-write of shared state; pack
+    appends take it too.
+    """
 
-    def __init__(self, workspace_storage: WorkspaceStorage) -> None:
+    def __init__(
+        self,
+        workspace_storage: WorkspaceStorage,
+        results_codec: Optional[ResultsCodec] = None,
+        page_store: Optional[str] = None,
+        blobs: Optional[str] = None,
+    ) -> None:
         self._ws = workspace_storage
         self._paths = workspace_storage.paths
+        self.results_codec = results_codec or ResultsCodec.from_env("json")
+        store = (page_store or os.environ.get("PAGE_STORE") or "files").strip().lower()
+        if store not in ("files", "pack"):
+            logger.warning(f"Unknown page store '{store}', using files")
+            store = "files"
+        if PagePack.exists_in(self._paths.pages_dir):
+            store = "pack"
+        self.page_pack: Optional[PagePack] = (
+            PagePack(self._paths.pages_dir) if store == "pack" else None
+        )
+        mode = (blobs or os.environ.get("WORKSPACE_BLOBS") or "off").strip().lower()
+        if mode not in ("off", "pages", "all"):
+            logger.warning(f"Unknown WORKSPACE_BLOBS mode '{mode}', using off")
+            mode = "off"
+        self._blob_key_types: Tuple[str, ...] = {
+            "off": (), "pages": ("pages",), "all": ("pages", "vlm_responses"),
+        }[mode]
+        self._blob_refs_path = self._paths.document_dir / _BLOB_REFS_FILENAME
+        self._blob_refs: Dict[str, str] = {}
+        self._blob_refs_pos = 0  # bytes of blob_refs.jsonl already parsed
+        self._blob_lock = threading.Lock()
+        self._blob_store: Optional[BlobStore] = (
+            BlobStore.for_workspace(self._paths.workspace_root) if mode != "off" else None
+        )
+        self._file_lock = FileLock(self._paths.document_dir / _LOCK_FILENAME)
+
+    def lock(self) -> FileLock:
+        """Inter-process lock of this document (reentrant context manager)."""
+        return self._file_lock
+
+    @property
+    def blob_store(self) -> Optional[BlobStore]:
+        """Shared blob store if enabled, or if this document already has refs."""
+        if self._blob_store is None and self._blob_refs_path.exists():
+            self._blob_store = BlobStore.for_workspace(self._paths.workspace_root)
+        return self._blob_store
+
+    def _load_blob_refs(self) -> Dict[str, str]:
+        """Ref map, first extended by complete lines appended since the last read."""
+        try:
+            size = self._blob_refs_path.stat().st_size
+        except FileNotFoundError:
+            return self._blob_refs
+        if size < self._blob_refs_pos:  # replaced: start over
+            self._blob_refs, self._blob_refs_pos = {}, 0
+        if size == self._blob_refs_pos:
+            return self._blob_refs
+        with self._blob_refs_path.open("rb") as f:
+            f.seek(self._blob_refs_pos)
+            data = f.read(size - self._blob_refs_pos)
+        end = data.rfind(b"\n") + 1  # a torn last line is read next time
+        for line in data[:end].splitlines():
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(rec, dict) and rec.get("key") and rec.get("digest"):
+                self._blob_refs[rec["key"]] = rec["digest"]
+        self._blob_refs_pos += end
+        return self._blob_refs
+
+    def _has_blob_ref(self, key: str) -> bool:
+        if self._blob_store is None and not self._blob_refs_path.exists():
+            return False
+        with self._blob_lock:
+            return key in self._load_blob_refs()
+
+    def _save_blob(self, key: str, data: bytes) -> None:
+        digest = self.blob_store.put(data)
+        with self._blob_lock:
+            refs = self._load_blob_refs()
+            if refs.get(key) != digest:
+                self._blob_refs_path.parent.mkdir(parents=True, exist_ok=True)
+                _write_jsonl(self._blob_refs_path, [{"key": key, "digest": digest}], mode="a")
+                refs[key] = digest
+
+    def _load_blob(self, key: str) -> Optional[bytes]:
+        if self._blob_store is None and not self._blob_refs_path.exists():
+            return None
+        with self._blob_lock:
+            digest = self._load_blob_refs().get(key)
+        if digest is None:
+            return None
+        data = self.blob_store.get(digest)
+        if data is None:
+            logger.warning(f"WorkspaceBackend: blob {digest[:12]} for '{key}' is missing")
+        return data
 
     def _get_file_path(self, key: str) -> tuple[Path, str]:
         """Map storage key to file path and format. Sanitizes name to prevent path traversal."""
@@ -378,27 +771,58 @@ class WorkspaceBackend:
             return self._paths.registry_json, "json"
         elif key_type == "pages":
             return self._paths.pages_dir / f"page_{_safe_name(name)}.png", "binary"
+        elif key_type == "page_manifest":
+            return self._paths.pages_dir / "manifest.json", "json"
+        elif key_type == "state_journal":
+            return self._paths.document_dir / _JOURNAL_FILENAME, "jsonl"
         elif key_type == "vlm_responses":
             return self._paths.document_dir / "vlm_responses" / f"response_{_safe_name(name)}.json", "json"
         elif key_type == "results":
-            return self._paths.document_dir / "results" / f"{_safe_name(name)}.yaml", "yaml"
+            # Extension added by the results codec
+            return self._paths.document_dir / "results" / _safe_name(name), "results"
         else:
             raise ValueError(f"Unknown key type: '{key_type}'")
 
+    def _page_num(self, key: str) -> Optional[int]:
+        """Page number of a "pages/NNN" key when the pack store is active."""
+        if self.page_pack is None or not key.startswith("pages/"):
+            return None
+        try:
+            return int(key.split("/", 1)[1])
+        except ValueError:
+            return None
+
     def save(self, key: str, value: Any) -> None:
         file_path, format_type = self._get_file_path(key)
+        if key.split("/", 1)[0] in self._blob_key_types or self._has_blob_ref(key):
+            if format_type == "binary":
+                if not isinstance(value, (bytes, bytearray, memoryview)):
+                    raise TypeError(f"Binary save requires bytes, got {type(value)}")
+                self._save_blob(key, bytes(value))
+            else:
+                data = json.dumps(value, ensure_ascii=False, sort_keys=True)
+                self._save_blob(key, data.encode("utf-8"))
+            return
+        page_num = self._page_num(key)
+        if page_num is not None:
+            if not isinstance(value, (bytes, bytearray, memoryview)):
+                raise TypeError(f"Binary save requires bytes, got {type(value)}")
+            with self._file_lock:
+                self.page_pack.append(page_num, value)
+            return
         file_path.parent.mkdir(parents=True, exist_ok=True)
         try:
             if format_type == "binary":
-                if not isinstance(value, bytes):
+                if not isinstance(value, (bytes, bytearray, memoryview)):
                     raise TypeError(f"Binary save requires bytes, got {type(value)}")
                 file_path.write_bytes(value)
             elif format_type == "json":
                 with file_path.open("w", encoding="utf-8") as f:
                     json.dump(value, f, ensure_ascii=False, indent=2)
-            elif format_type == "yaml":
-                with file_path.open("w", encoding="utf-8") as f:
-                    yaml.dump(value, f, allow_unicode=True, default_flow_style=False)
+            elif format_type == "results":
+                file_path = write_result(file_path, value, self.results_codec)
+            elif format_type == "jsonl":
+                _write_jsonl(file_path, list(value))
             logger.debug(f"WorkspaceBackend: saved key '{key}' to {file_path}")
         except Exception as e:
             logger.error(f"WorkspaceBackend: failed to save key '{key}': {e}")
@@ -406,6 +830,20 @@ class WorkspaceBackend:
 
     def load(self, key: str, default: Any = None) -> Any:
         file_path, format_type = self._get_file_path(key)
+        if format_type == "results":
+            try:
+                return read_result(file_path, self.results_codec, default)
+            except Exception as e:
+                logger.error(f"WorkspaceBackend: failed to load key '{key}': {e}")
+                raise
+        blob = self._load_blob(key)
+        if blob is not None:
+            return blob if format_type == "binary" else json.loads(blob)
+        page_num = self._page_num(key)
+        if page_num is not None:
+            view = self.page_pack.read(page_num)
+            if view is not None:
+                return view
         if not file_path.exists():
             return default
         try:
@@ -414,17 +852,328 @@ class WorkspaceBackend:
             elif format_type == "json":
                 with file_path.open("r", encoding="utf-8") as f:
                     return json.load(f)
-            elif format_type == "yaml":
-                with file_path.open("r", encoding="utf-8") as f:
-                    return yaml.safe_load(f)
+            elif format_type == "jsonl":
+                return _read_jsonl(file_path)
         except Exception as e:
             logger.error(f"WorkspaceBackend: failed to load key '{key}': {e}")
             raise
 
+    def append(self, key: str, records: List[dict]) -> None:
+        """Append records to a JSONL key (e.g. the state journal)."""
+        file_path, format_type = self._get_file_path(key)
+        if format_type != "jsonl":
+            raise ValueError(f"append() requires a JSONL key, got '{key}'")
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        _write_jsonl(file_path, records, mode="a")
+
     def exists(self, key: str) -> bool:
-        file_path, _ = self._get_file_path(key)
+        file_path, format_type = self._get_file_path(key)
+        if format_type == "results":
+            return find_result_file(file_path, self.results_codec) is not None
+        if self._has_blob_ref(key):
+            return True
+        page_num = self._page_num(key)
+        if page_num is not None and page_num in self.page_pack:
+            return True
         return file_path.exists()
 
+    def stat(self, key: str) -> Optional[Tuple[int, int]]:
+        """Change token of a key: (mtime_ns, size), or None if missing."""
+        file_path, format_type = self._get_file_path(key)
+        if format_type == "results":
+            file_path = find_result_file(file_path, self.results_codec)
+            if file_path is None:
+                return None
+        return _file_signature(file_path)
+
+    def close(self) -> None:
+        if self.page_pack is not None:
+            self.page_pack.close()
+
+
+_SQLITE_FILENAME = "state.sqlite3"
+
+_SQLITE_SCHEMA = (
+    # seq keeps registry rows in insertion order (same as the JSON array)
+    "CREATE TABLE IF NOT EXISTS registry ("
+    " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+    " entity_id TEXT NOT NULL,"
+    " page_num INTEGER NOT NULL,"
+    " prompt TEXT NOT NULL,"
+    " resolution INTEGER NOT NULL DEFAULT 0,"
+    " value TEXT,"
+    " context TEXT,"
+    " verified INTEGER NOT NULL DEFAULT 0,"
+    " confidence TEXT)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS registry_entity_id ON registry(entity_id)",
+    "CREATE INDEX IF NOT EXISTS registry_page_num ON registry(page_num)",
+    "CREATE INDEX IF NOT EXISTS registry_resolution ON registry(resolution, page_num)",
+    "CREATE INDEX IF NOT EXISTS registry_verified ON registry(verified)",
+    "CREATE TABLE IF NOT EXISTS page_states ("
+    " page_num INTEGER PRIMARY KEY,"
+    " status TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+)
+
+_REGISTRY_COLUMNS = (
+    "page_num", "entity_id", "prompt", "resolution",
+    "value", "context", "verified", "confidence",
+)
+
+
+class SQLiteWorkspaceBackend(WorkspaceBackend):
+    """WorkspaceBackend that keeps page states and the OCR registry in SQLite.
+
+    Pages, VLM responses and results stay files as in WorkspaceBackend. The
+    "document_state" and "ocr_registry" keys map to tables in
+    {document_dir}/state.sqlite3, indexed on entity_id, page_num, resolution
+    and verified, so StateManager can upsert and query entries without
+    loading the whole registry (see indexed_registry).
+
+    On first open an existing state.json (plus a pending state journal) is
+    migrated into the database; the JSON files are renamed to *.migrated.
+    """
+
+    indexed_registry = True
+
+    def __init__(self, workspace_storage: WorkspaceStorage) -> None:
+        super().__init__(workspace_storage)
+        self.db_path = self._paths.document_dir / _SQLITE_FILENAME
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._tx_depth = 0
+        # Autocommit mode: transactions are opened explicitly in _tx()
+        # timeout: wait out other processes' write transactions
+        self._conn = sqlite3.connect(
+            str(self.db_path), check_same_thread=False, isolation_level=None, timeout=30.0
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SQLITE_SCHEMA:
+            self._conn.execute(statement)
+        self._migrate_from_json()
+
+    # --- transactions ---
+
+    @contextmanager
+    def _tx(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in a transaction (joins an open transaction())."""
+        with self._lock:
+            if self._tx_depth:
+                yield self._conn
+                return
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    @contextmanager
+    def transaction(self, rollback_on_error: bool = False) -> Iterator[None]:
+        """Group writes into one transaction; nested calls join the outer one.
+
+        On an exception the work done so far is committed (partial flush),
+        or rolled back with rollback_on_error=True.
+        """
+        with self._lock:
+            if self._tx_depth:
+                self._tx_depth += 1
+                try:
+                    yield
+                finally:
+                    self._tx_depth -= 1
+                return
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._tx_depth = 1
+            try:
+                yield
+            except BaseException:
+                self._tx_depth = 0
+                self._conn.execute("ROLLBACK" if rollback_on_error else "COMMIT")
+                raise
+            self._tx_depth = 0
+            self._conn.execute("COMMIT")
+
+    # --- migration ---
+
+    def _migrate_from_json(self) -> None:
+        with self._tx() as conn:
+            done = conn.execute(
+                "SELECT value FROM meta WHERE key = 'migrated_from_json'"
+            ).fetchone()
+            if done is not None:
+                return
+            state_json = self._paths.state_json
+            data = super().load("document_state/state", default=None)
+            journal = super().load(_JOURNAL_KEY, default=None) or []
+            if data is None and self._paths.registry_json.exists():
+                data = {"ocr_registry": super().load("ocr_registry/registry", default=[])}
+            if data is not None or journal:
+                state = _resolution_state_from_dict(data or {})
+                _apply_state_records(state, journal)
+                self._write_state(conn, _resolution_state_to_dict(state))
+                logger.info(
+                    f"SQLiteWorkspaceBackend: migrated {len(state.ocr_registry)} registry "
+                    f"entries from {state_json.name}"
+                )
+            conn.execute(
+                "INSERT INTO meta(key, value) VALUES ('migrated_from_json', ?)",
+                (datetime.now(timezone.utc).isoformat(),),
+            )
+        for path in (
+            self._paths.state_json,
+            self._paths.registry_json,
+            self._paths.document_dir / _JOURNAL_FILENAME,
+        ):
+            if path.exists():
+                path.replace(path.with_name(path.name + ".migrated"))
+
+    # --- row helpers ---
+
+    @staticmethod
+    def _row_params(entry: dict) -> tuple:
+        return (
+            entry.get("page_num"),
+            entry.get("entity_id", ""),
+            entry.get("prompt", ""),
+            _validate_resolution(entry.get("resolution", 0)),
+            entry.get("value"),
+            entry.get("context"),
+            1 if entry.get("verified") else 0,
+            entry.get("confidence"),
+        )
+
+    @staticmethod
+    def _row_to_dict(row: tuple) -> dict:
+        d = dict(zip(_REGISTRY_COLUMNS, row))
+        d["verified"] = bool(d["verified"])
+        return d
+
+    def _upsert_rows(self, conn: sqlite3.Connection, entries: Iterable[dict]) -> None:
+        conn.executemany(
+            f"INSERT INTO registry({', '.join(_REGISTRY_COLUMNS)}) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(entity_id) DO UPDATE SET "
+            + ", ".join(f"{c} = excluded.{c}" for c in _REGISTRY_COLUMNS if c != "entity_id"),
+            [self._row_params(e) for e in entries],
+        )
+
+    def _write_registry(self, conn: sqlite3.Connection, entries: List[dict]) -> None:
+        conn.execute("DELETE FROM registry")
+        self._upsert_rows(conn, entries)
+
+    def _write_state(self, conn: sqlite3.Connection, data: dict) -> None:
+        conn.execute("DELETE FROM page_states")
+        conn.executemany(
+            "INSERT INTO page_states(page_num, status) VALUES (?, ?)",
+            [(int(k), v) for k, v in (data.get("page_states") or {}).items()],
+        )
+        self._write_registry(conn, list(data.get("ocr_registry") or []))
+        conn.execute(
+            "INSERT OR REPLACE INTO meta(key, value) VALUES ('metadata', ?)",
+            (json.dumps(data.get("metadata") or {}, ensure_ascii=False),),
+        )
+
+    def _read_registry(self, where: str = "", params: tuple = ()) -> List[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_REGISTRY_COLUMNS)} FROM registry {where} ORDER BY seq",
+                params,
+            ).fetchall()
+        return [self._row_to_dict(r) for r in rows]
+
+    # --- StorageBackend ---
+
+    def save(self, key: str, value: Any) -> None:
+        key_type = key.split("/", 1)[0]
+        if key_type == "document_state":
+            with self._tx() as conn:
+                self._write_state(conn, value or {})
+        elif key_type == "ocr_registry":
+            with self._tx() as conn:
+                self._write_registry(conn, list(value or []))
+        else:
+            super().save(key, value)
+
+    def load(self, key: str, default: Any = None) -> Any:
+        key_type = key.split("/", 1)[0]
+        if key_type == "document_state":
+            with self._lock:
+                meta = self._conn.execute(
+                    "SELECT value FROM meta WHERE key = 'metadata'"
+                ).fetchone()
+            return {
+                "page_states": {str(k): v for k, v in self.load_page_states().items()},
+                "ocr_registry": self._read_registry(),
+                "metadata": json.loads(meta[0]) if meta else {},
+            }
+        if key_type == "ocr_registry":
+            return self._read_registry()
+        return super().load(key, default)
+
+    def exists(self, key: str) -> bool:
+        if key.split("/", 1)[0] in ("document_state", "ocr_registry"):
+            return True
+        return super().exists(key)
+
+    # --- indexed operations (used by StateManager) ---
+
+    def apply_state_changes(self, records: List[dict]) -> None:
+        """Apply "upsert" / "page" change records in one transaction."""
+        with self._tx() as conn:
+            for record in records:
+                op = record.get("op")
+                if op == "upsert":
+                    self._upsert_rows(conn, record.get("entries") or [])
+                elif op == "page":
+                    conn.execute(
+                        "INSERT OR REPLACE INTO page_states(page_num, status) VALUES (?, ?)",
+                        (int(record["page_num"]), record["status"]),
+                    )
+                else:
+                    logger.warning(f"Skipping unknown state record op={op!r}")
+
+    def query_registry(
+        self,
+        page_nums: Optional[Iterable[int]] = None,
+        max_resolution: Optional[int] = None,
+        entity_ids: Optional[Iterable[str]] = None,
+    ) -> List[dict]:
+        """Registry rows filtered by page, resolution and/or id, in insertion order."""
+        clauses: List[str] = []
+        params: List[Any] = []
+        if entity_ids is not None:
+            ids = list(dict.fromkeys(entity_ids))
+            if not ids:
+                return []
+            clauses.append(f"entity_id IN ({', '.join('?' * len(ids))})")
+            params.extend(ids)
+        if page_nums is not None:
+            pages = sorted({int(p) for p in page_nums})
+            if not pages:
+                return []
+            clauses.append(f"page_num IN ({', '.join('?' * len(pages))})")
+            params.extend(pages)
+        if max_resolution is not None:
+            clauses.append("resolution <= ?")
+            params.append(int(max_resolution))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._read_registry(where, tuple(params))
+
+    def load_page_states(self) -> Dict[int, str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT page_num, status FROM page_states ORDER BY page_num"
+            ).fetchall()
+        return {int(p): status for p, status in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+        super().close()
+
 
 class StorageBackend(Protocol):
     """Protocol for state storage backends."""
@@ -468,11 +1217,13 @@ class MemoryStorage:
     def __init__(self) -> None:
         """Initialize in-memory storage."""
         self._data: Dict[str, Any] = {}
+        self._versions: Dict[str, int] = {}
         logger.info("Initialized MemoryStorage backend")
 
     def save(self, key: str, value: Any) -> None:
         """Save value to in-memory dict."""
         self._data[key] = value
+        self._versions[key] = self._versions.get(key, 0) + 1
         logger.debug(f"MemoryStorage: saved key '{key}'")
 
     def load(self, key: str, default: Any = None) -> Any:
@@ -485,17 +1236,28 @@ class MemoryStorage:
         """Check if key exists in in-memory dict."""
         return key in self._data
 
+    def stat(self, key: str) -> Optional[int]:
+        """Change token of a key: its save counter, or None if missing."""
+        return self._versions.get(key) if key in self._data else None
+
 
 class DiskStorage:
     """File-based storage backend with JSON/YAML support."""
 
-    def __init__(self, state_dir: Path) -> None:
+    def __init__(
+        self,
+        state_dir: Path,
+        results_codec: Optional[ResultsCodec] = None,
+    ) -> None:
         """Initialize disk storage with directory structure.
 
         Args:
             state_dir: Root directory for state storage
+            results_codec: Codec for results/* (default: RESULTS_CODEC, else
+                human-readable YAML); results in other codecs are still read
         """
         self.state_dir = Path(state_dir)
+        self.results_codec = results_codec or ResultsCodec.from_env("yaml")
         self.cache_dir = self.state_dir / "cache"
         self.pages_dir = self.cache_dir / "pages"
         self.vlm_responses_dir = self.cache_dir / "vlm_responses"
@@ -527,7 +1289,8 @@ class DiskStorage:
                         "results/clustering")
 
         Returns:
-            Tuple of (file_path, format) where format is "binary", "json", or "yaml"
+            Tuple of (file_path, format) where format is "binary", "json",
+            "jsonl", or "results" (path without extension, see results_codec)
         """
         parts = key.split("/", 1)
 
@@ -549,15 +1312,22 @@ class DiskStorage:
             filename = f"page_{name}.png"
             return self.pages_dir / filename, "binary"
 
+        elif key_type == "page_manifest":
+            # Render parameters of each stored page (render cache)
+            return self.pages_dir / "manifest.json", "json"
+
+        elif key_type == "state_journal":
+            # Append-only JSONL journal of state changes (next to state.json)
+            return self.state_dir / _JOURNAL_FILENAME, "jsonl"
+
         elif key_type == "vlm_responses":
             # JSON for VLM responses
             filename = f"response_{name}.json"
             return self.vlm_responses_dir / filename, "json"
 
         elif key_type == "results":
-            # YAML for operation results (human-readable)
-            filename = f"{name}.yaml"
-            return self.results_dir / filename, "yaml"
+            # Operation results; extension added by the results codec
+            return self.results_dir / name, "results"
 
         else:
             raise ValueError(f"Unknown key type: '{key_type}'")
@@ -567,7 +1337,7 @@ class DiskStorage:
 
         Args:
             key: Storage key
-            value: Value to save (bytes for binary, dict for json/yaml)
+            value: Value to save (bytes for binary, dict for json/results)
         """
         file_path, format_type = self._get_file_path(key)
 
@@ -581,9 +1351,11 @@ class DiskStorage:
                 with file_path.open("w", encoding="utf-8") as f:
                     json.dump(value, f, ensure_ascii=False, indent=2)
 
-            elif format_type == "yaml":
-                with file_path.open("w", encoding="utf-8") as f:
-                    yaml.dump(value, f, allow_unicode=True, default_flow_style=False)
+            elif format_type == "results":
+                file_path = write_result(file_path, value, self.results_codec)
+
+            elif format_type == "jsonl":
+                _write_jsonl(file_path, list(value))
 
             logger.info(f"DiskStorage: saved key '{key}' to {file_path}")
 
@@ -603,6 +1375,13 @@ class DiskStorage:
         """
         file_path, format_type = self._get_file_path(key)
 
+        if format_type == "results":
+            found = find_result_file(file_path, self.results_codec)
+            if found is None:
+                logger.debug(f"DiskStorage: key '{key}' not found, returning default")
+                return default
+            file_path = found
+
         if not file_path.exists():
             logger.debug(f"DiskStorage: key '{key}' not found, returning default")
             return default
@@ -615,9 +1394,11 @@ class DiskStorage:
                 with file_path.open("r", encoding="utf-8") as f:
                     value = json.load(f)
 
-            elif format_type == "yaml":
-                with file_path.open("r", encoding="utf-8") as f:
-                    value = yaml.safe_load(f)
+            elif format_type == "results":
+                value = ResultsCodec.for_path(file_path).loads(file_path.read_bytes())
+
+            elif format_type == "jsonl":
+                value = _read_jsonl(file_path)
 
             logger.debug(f"DiskStorage: loaded key '{key}' from {file_path}")
             return value
@@ -626,6 +1407,18 @@ class DiskStorage:
             logger.error(f"DiskStorage: failed to load key '{key}': {e}")
             raise
 
+    def append(self, key: str, records: List[dict]) -> None:
+        """Append records to a JSONL key (e.g. the state journal).
+
+        Args:
+            key: Storage key of JSONL type
+            records: JSON-serializable dicts, one line each
+        """
+        file_path, format_type = self._get_file_path(key)
+        if format_type != "jsonl":
+            raise ValueError(f"append() requires a JSONL key, got '{key}'")
+        _write_jsonl(file_path, records, mode="a")
+
     def exists(self, key: str) -> bool:
         """Check if file exists for given key.
 
@@ -635,9 +1428,20 @@ class DiskStorage:
         Returns:
             True if file exists, False otherwise
         """
-        file_path, _ = self._get_file_path(key)
+        file_path, format_type = self._get_file_path(key)
+        if format_type == "results":
+            return find_result_file(file_path, self.results_codec) is not None
         return file_path.exists()
 
+    def stat(self, key: str) -> Optional[Tuple[int, int]]:
+        """Change token of a key: (mtime_ns, size), or None if missing."""
+        file_path, format_type = self._get_file_path(key)
+        if format_type == "results":
+            file_path = find_result_file(file_path, self.results_codec)
+            if file_path is None:
+                return None
+        return _file_signature(file_path)
+
 
 @dataclass
 class DocumentState:
@@ -654,18 +1458,141 @@ class DocumentState:
     operation_results: Dict[str, Any] = field(default_factory=dict)
 
 
+_DEFAULT_PAGE_CACHE_MB = 64
+
+
+class PageImageCache(MutableMapping):
+    """Thread-safe {page_num: image} LRU bounded by total image bytes.
+
+    Used as StateManager.state.pages: the storage backend owns page images,
+    this keeps only the most recently used ones in memory. An image larger
+    than the whole budget is not cached.
+
+    Args:
+        max_bytes: Byte budget (0 disables caching)
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max(0, int(max_bytes))
+        self.nbytes = 0
+        self._items: "OrderedDict[int, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getitem__(self, page_num: int) -> bytes:
+        with self._lock:
+            image = self._items[page_num]
+            self._items.move_to_end(page_num)
+            return image
+
+    def __setitem__(self, page_num: int, image: bytes) -> None:
+        with self._lock:
+            self._pop(page_num)
+            size = len(image)
+            if size > self.max_bytes:
+                return
+            self._items[page_num] = image
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.nbytes -= len(evicted)
+
+    def _pop(self, page_num: int) -> None:
+        old = self._items.pop(page_num, None)
+        if old is not None:
+            self.nbytes -= len(old)
+
+    def __delitem__(self, page_num: int) -> None:
+        with self._lock:
+            if page_num not in self._items:
+                raise KeyError(page_num)
+            self._pop(page_num)
+
+    def __contains__(self, page_num: object) -> bool:
+        with self._lock:
+            return page_num in self._items
+
+    def __iter__(self) -> Iterator[int]:
+        with self._lock:
+            return iter(list(self._items))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+
+def _page_cache_bytes_from_env() -> int:
+    raw = os.getenv("PAGE_CACHE_MB", str(_DEFAULT_PAGE_CACHE_MB)).strip()
+    try:
+        value = int(raw)
+    except ValueError:
+        value = _DEFAULT_PAGE_CACHE_MB
+    return max(0, value) * 1024 * 1024
+
+
 class StateManager:
-    """Manager for document state with pluggable storage backend."""
+    """Manager for document state with pluggable storage backend.
+
+    The storage backend is the single owner of page images; state.pages is
+    a PageImageCache holding at most `page_cache_bytes` of recently used
+    pages, so memory stays flat regardless of page count.
+
+    On backends that support append() (WorkspaceBackend, DiskStorage),
+    registry upserts and page-state changes are appended to a JSONL journal
+    instead of rewriting state.json, so write cost follows the size of the
+    change. The journal is replayed on load and folded into state.json by
+    compact() — every `journal_compact_every` records and on close().
+
+    Backends with `indexed_registry = True` (SQLiteWorkspaceBackend) own the
+    registry and page states: changes go straight to the backend via
+    apply_state_changes() and queries use its indexes, without holding the
+    whole registry in memory.
+
+    Otherwise the registry is held in memory with live indexes by entity_id,
+    page and resolution (updated on each upsert), and reloads from storage
+    are skipped while the stored state's change token (mtime and size, see
+    the backends' stat()) is the one last loaded or written by this manager.
+
+    Backends with lock() (WorkspaceBackend) may be shared by several
+    processes, e.g. resolve runs on disjoint page ranges. Journal appends,
+    reloads and snapshots then run under that inter-process lock, compact()
+    first folds in records other processes appended, and a snapshot keeps
+    stored page states and entries this process never saw (merge-on-write).
+
+    Registry and page-state writes, batch() and compact() are thread-safe:
+    they share one re-entrant write lock per manager.
+    """
 
-    def __init__(self, storage: StorageBackend) -> None:
+    def __init__(
+        self,
+        storage: StorageBackend,
+        journal_compact_every: int = 1000,
+        page_cache_bytes: Optional[int] = None,
+    ) -> None:
         """Initialize state manager with storage backend.
 
         Args:
             storage: Storage backend (MemoryStorage or DiskStorage)
+            journal_compact_every: Journal records between automatic compactions
+            page_cache_bytes: Budget of the in-memory page image LRU (env
+                PAGE_CACHE_MB, default 64 MB; 0 disables it)
         """
         self.storage = storage
+        self._indexed = bool(getattr(storage, "indexed_registry", False))
+        self._shared = callable(getattr(storage, "lock", None)) and not self._indexed
+        self._journal_enabled = (
+            callable(getattr(storage, "append", None)) and not self._indexed
+        )
+        self._journal_compact_every = max(1, journal_compact_every)
+        self._journal_records = 0
+        # batch(): buffered change records and nesting depth
+        self._batch_depth = 0
+        self._batch_records: List[dict] = []
+        # Serializes registry/page-state writes and batches across threads
+        self._write_lock = threading.RLock()
+        if page_cache_bytes is None:
+            page_cache_bytes = _page_cache_bytes_from_env()
         self.state = DocumentState(
-            pages={},
+            pages=PageImageCache(page_cache_bytes),
             vlm_responses={},
             operation_results={},
         )
@@ -674,8 +1601,79 @@ class StateManager:
             ocr_registry=[],
             metadata=DocumentMetadata(),
         )
+        self._index = _RegistryIndex(self._resolution_state.ocr_registry)
+        # Change token of state.json + journal when memory was last in sync;
+        # None = not loaded yet (or the backend has no stat())
+        self._state_token: Optional[tuple] = None
+        self._page_source: Optional[Callable[[int], Optional[bytes]]] = None
+        self._render_info: Optional[Dict[str, Any]] = None
+        self._page_manifest: Optional[Dict[int, Dict[str, Any]]] = None
         logger.info(f"Initialized StateManager with {type(storage).__name__}")
 
+    def set_page_source(
+        self,
+        source: Optional[Callable[[int], Optional[bytes]]],
+        render_info: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Register fallback used by load_page() when a page is not in storage.
+
+        DocumentProcessor registers its lazy renderer here, so every consumer
+        of load_page() (resolve, verify, OCRTool) renders on first access.
+
+        With `render_info` (e.g. {"dpi": 150, "format": "PNG", "renderer": 1})
+        the page manifest acts as a render cache: a stored page counts only if
+        its manifest entry equals render_info, otherwise it is re-rendered.
+
+        Args:
+            source: Callable page_num -> image bytes (or None), or None to clear
+            render_info: Render parameters of pages produced by `source`
+        """
+        self._page_source = source
+        self._render_info = dict(render_info) if render_info else None
+
+    def _read_page_manifest(self) -> Dict[int, Dict[str, Any]]:
+        raw = self.storage.load("page_manifest/manifest", default=None) or {}
+        manifest: Dict[int, Dict[str, Any]] = {}
+        for k, v in (raw.get("pages") or {}).items():
+            try:
+                manifest[int(k)] = v
+            except (TypeError, ValueError):
+                continue
+        return manifest
+
+    def _load_page_manifest(self) -> Dict[int, Dict[str, Any]]:
+        """Load {page_num: render_info} from storage once, then keep in memory."""
+        if self._page_manifest is None:
+            with self._storage_lock():
+                self._page_manifest = self._read_page_manifest()
+        return self._page_manifest
+
+    def _save_page_manifest(self) -> None:
+        manifest = self._load_page_manifest()
+        with self._storage_lock():
+            if self._shared:
+                # Keep pages other processes rendered since we loaded it
+                for page_num, info in self._read_page_manifest().items():
+                    manifest.setdefault(page_num, info)
+            self.storage.save(
+                "page_manifest/manifest",
+                {"pages": {str(k): manifest[k] for k in sorted(manifest)}},
+            )
+
+    def _page_is_current(self, page_num: int) -> bool:
+        """True if no render cache is configured or the stored page matches it."""
+        if self._render_info is None:
+            return True
+        return self._load_page_manifest().get(page_num) == self._render_info
+
+    def has_page(self, page_num: int) -> bool:
+        """Check whether an up-to-date rendered page is stored (no rendering)."""
+        if not self._page_is_current(page_num):
+            return False
+        if page_num in self.state.pages:
+            return True
+        return self.storage.exists(f"pages/{page_num:03d}")
+
     def save_page(self, page_num: int, image: bytes) -> None:
         """Save rendered page.
 
@@ -686,22 +1684,63 @@ class StateManager:
         key = f"pages/{page_num:03d}"
         self.storage.save(key, image)
         self.state.pages[page_num] = image
+        if self._render_info is not None:
+            self._load_page_manifest()[page_num] = dict(self._render_info)
+            self._save_page_manifest()
         logger.debug(f"Saved page {page_num} ({len(image)} bytes)")
 
+    def save_pages(self, pages: Iterable[Tuple[int, bytes]]) -> int:
+        """Save rendered pages, writing the render manifest once at the end.
+
+        Pages are persisted as they arrive from the iterable, so a streaming
+        renderer keeps memory flat. The manifest is written even if the
+        iterable raises, covering the pages that were saved.
+
+        Args:
+            pages: Iterable of (page_num, image bytes)
+
+        Returns:
+            Number of pages saved
+        """
+        count = 0
+        try:
+            for page_num, image in pages:
+                self.storage.save(f"pages/{page_num:03d}", image)
+                self.state.pages[page_num] = image
+                if self._render_info is not None:
+                    self._load_page_manifest()[page_num] = dict(self._render_info)
+                count += 1
+        finally:
+            if count and self._render_info is not None:
+                self._save_page_manifest()
+        logger.debug(f"Saved {count} pages")
+        return count
+
     def load_page(self, page_num: int) -> Optional[bytes]:
-        """Load rendered page.
+        """Load rendered page, falling back to the registered page source.
 
         Args:
             page_num: 1-based page number
 
+        Recently used pages are served from the bounded state.pages cache.
+
         Returns:
             PNG image bytes or None if not found
         """
         key = f"pages/{page_num:03d}"
-        image = self.storage.load(key, default=None)
+        image = None
+        if self._page_is_current(page_num):
+            image = self.state.pages.get(page_num)
+            if image is not None:
+                return image
+            image = self.storage.load(key, default=None)
 
         if image is not None:
             self.state.pages[page_num] = image
+        elif self._page_source is not None:
+            image = self._page_source(page_num)
+            if image is not None:
+                self.save_page(page_num, image)
 
         return image
 
@@ -745,46 +1784,238 @@ class StateManager:
     # --- Resolution Levels API (ADR-001) ---
 
     def save_document_state(self, state: ResolutionDocumentState) -> None:
-        """Save resolution document state.
+        """Save resolution document state (full snapshot, clears the journal).
+
+        On a shared backend, page states and entries that another process
+        stored since this one last loaded are merged into `state` first.
 
         Args:
             state: ResolutionDocumentState to persist
         """
-        self._resolution_state = state
-        data = _resolution_state_to_dict(state)
-        self.storage.save("document_state/state", data)
+        with self._storage_lock():
+            if (
+                self._shared
+                and self._stored_state_token() != self._state_token
+                and self.storage.exists("document_state/state")
+            ):
+                added = _merge_missing_state(state, self._read_stored_state())
+                if added:
+                    self._index = _RegistryIndex(state.ocr_registry)
+                    logger.debug(f"Merged {added} stored state items written elsewhere")
+            self._resolution_state = state
+            data = _resolution_state_to_dict(state)
+            self.storage.save("document_state/state", data)
+            if self._journal_enabled and (
+                self._journal_records or self.storage.exists(_JOURNAL_KEY)
+            ):
+                # Snapshot is written first: a crash before truncation only
+                # replays idempotent records on top of an up-to-date state.json
+                self.storage.save(_JOURNAL_KEY, [])
+            self._journal_records = 0
+            self._state_token = self._stored_state_token()
         logger.debug("Saved resolution document state")
 
     def load_document_state(self) -> ResolutionDocumentState:
-        """Load resolution document state. Returns empty state if not found."""
+        """Load resolution document state, replaying the journal on top.
+
+        Returns the in-memory state without re-reading storage when the
+        stored state is unchanged since it was last loaded or written here
+        (and always inside batch(), to keep buffered changes).
+        Returns empty state if nothing was saved.
+        """
+        token = self._stored_state_token()
+        if token is not None and (
+            token == self._state_token
+            or (self._batch_depth and self._state_token is not None)
+        ):
+            return self._resolution_state
+        with self._storage_lock():
+            if self._shared:
+                token = self._stored_state_token()
+            self._resolution_state = self._read_stored_state()
+            self._state_token = token
+        return self._resolution_state
+
+    def _read_stored_state(self) -> ResolutionDocumentState:
+        """Stored snapshot with the journal replayed on top."""
         data = self.storage.load("document_state/state", default=None)
         if data is None:
-            self._resolution_state = ResolutionDocumentState(
+            state = ResolutionDocumentState(
                 page_states={},
                 ocr_registry=[],
                 metadata=DocumentMetadata(),
             )
-            return self._resolution_state
-        self._resolution_state = _resolution_state_from_dict(data)
-        return self._resolution_state
+        else:
+            state = _resolution_state_from_dict(data)
+        self._replay_journal(state)
+        return state
+
+    def _storage_lock(self) -> ContextManager:
+        """Inter-process lock of a shared backend, or a no-op."""
+        return self.storage.lock() if self._shared else nullcontext()
+
+    def _stored_state_token(self) -> Optional[tuple]:
+        """Change token of the stored state (+ journal); None without stat().
+
+        Indexed backends write rows, not the state file, so its stat() does
+        not change on writes: they get no token and are always re-read.
+        """
+        stat = getattr(self.storage, "stat", None)
+        if not callable(stat) or self._indexed:
+            return None
+        journal = stat(_JOURNAL_KEY) if self._journal_enabled else None
+        return (stat("document_state/state"), journal)
+
+    def _ensure_registry_loaded(self) -> None:
+        """Bring the in-memory state up to date with storage (if it changed)."""
+        if self.storage.exists("document_state/state"):
+            self.load_document_state()
+        elif not self._resolution_state.ocr_registry and self.storage.exists(
+            "ocr_registry/registry"
+        ):
+            self.load_ocr_registry()
+
+    def _registry_index(self) -> _RegistryIndex:
+        """Index over the current registry list, rebuilt if the list was replaced."""
+        if self._index.registry is not self._resolution_state.ocr_registry:
+            self._index = _RegistryIndex(self._resolution_state.ocr_registry)
+        return self._index
+
+    def _replay_journal(self, state: ResolutionDocumentState) -> None:
+        """Apply journal records (in order) to `state` in place."""
+        if not self._journal_enabled:
+            return
+        records = self.storage.load(_JOURNAL_KEY, default=None) or []
+        _apply_state_records(state, records)
+        self._journal_records = len(records)
+        if records:
+            logger.debug(f"Replayed {len(records)} journal records")
+
+    def _record_change(self, record: dict) -> None:
+        """Persist one state change: buffered in batch(), else journal/snapshot."""
+        if self._indexed:
+            # Applied at once; batch() groups it into a backend transaction
+            self.storage.apply_state_changes([record])
+            return
+        if self._batch_depth:
+            self._batch_records.append(record)
+            return
+        self._persist_changes([record])
+
+    def _persist_changes(self, records: List[dict]) -> None:
+        """Write change records with one journal append, or one snapshot."""
+        if not records:
+            return
+        if self._journal_enabled:
+            with self._storage_lock():
+                in_sync = self._stored_state_token() == self._state_token
+                self.storage.append(_JOURNAL_KEY, records)
+                self._journal_records += len(records)
+                # If another process wrote meanwhile, reload on next access
+                self._state_token = self._stored_state_token() if in_sync else None
+                if self._journal_records >= self._journal_compact_every:
+                    self.compact()
+        elif any(r["op"] == "upsert" for r in records):
+            self.save_ocr_registry(self._resolution_state.ocr_registry)
+        else:
+            self.save_document_state(self._resolution_state)
+
+    @contextmanager
+    def batch(self, rollback_on_error: bool = False) -> Iterator["StateManager"]:
+        """Collect registry and page-state changes and write them once on exit.
+
+        Inside the block upsert_ocr_entries/set_page_resolution update memory
+        only; on exit all changes go to storage in a single journal append
+        (or a single snapshot on backends without a journal). Nested batches
+        join the outermost one.
+
+        On an exception the changes made so far are flushed (partial flush),
+        or with rollback_on_error=True discarded and the in-memory state
+        restored to what it was on entry. On indexed backends the block runs
+        in one backend transaction, committed or rolled back the same way.
+
+        The block holds the manager's write lock: batches and writes from
+        other threads wait for it to finish.
+        """
+        with self._write_lock:
+            if self._indexed:
+                with self.storage.transaction(rollback_on_error=rollback_on_error):
+                    yield self
+                return
+
+            if self._batch_depth:
+                self._batch_depth += 1
+                try:
+                    yield self
+                finally:
+                    self._batch_depth -= 1
+                return
+
+            saved_registry = list(self._resolution_state.ocr_registry)
+            saved_pages = dict(self._resolution_state.page_states)
+            self._batch_depth = 1
+            self._batch_records = []
+            try:
+                yield self
+            except BaseException:
+                records, self._batch_records = self._batch_records, []
+                self._batch_depth = 0
+                if rollback_on_error:
+                    self._resolution_state.ocr_registry = saved_registry
+                    self._resolution_state.page_states = saved_pages
+                    logger.warning(f"State batch rolled back ({len(records)} changes)")
+                else:
+                    self._persist_changes(records)
+                    logger.warning(f"State batch failed, flushed {len(records)} changes")
+                raise
+            records, self._batch_records = self._batch_records, []
+            self._batch_depth = 0
+            self._persist_changes(records)
+            logger.debug(f"State batch flushed {len(records)} changes")
+
+    def compact(self) -> None:
+        """Fold the journal into state.json/registry.json and truncate it."""
+        with self._write_lock:
+            if not self._journal_enabled or not self._journal_records:
+                return
+            with self._storage_lock():
+                if self._shared and not self._batch_depth:
+                    # Fold in records other processes appended since our last read
+                    self.load_document_state()
+                    if not self._journal_records:
+                        return  # compacted by another process
+                logger.debug(f"Compacting {self._journal_records} journal records")
+                self.save_ocr_registry(self._resolution_state.ocr_registry)
+
+    def close(self) -> None:
+        """Flush pending journal records into the state snapshot."""
+        self.compact()
+        close = getattr(self.storage, "close", None)
+        if callable(close):
+            close()
 
     def save_ocr_registry(self, entries: List[OCRRegistryEntry]) -> None:
         """Save entire OCR registry. Syncs state.json (single source of truth)."""
-        self._resolution_state.ocr_registry = list(entries)
-        # C1: state.json is source of truth — always persist full state
-        self.save_document_state(self._resolution_state)
-        # Keep registry.json in sync for consistency
-        data = _registry_to_dict(entries)
-        self.storage.save("ocr_registry/registry", data)
+        if self._indexed:
+            self.storage.save("ocr_registry/registry", _registry_to_dict(entries))
+            logger.debug(f"Saved OCR registry ({len(entries)} entries)")
+            return
+        if entries is not self._resolution_state.ocr_registry:
+            self._resolution_state.ocr_registry = list(entries)
+        with self._storage_lock():
+            # C1: state.json is source of truth — always persist full state
+            self.save_document_state(self._resolution_state)
+            # Keep registry.json in sync for consistency (incl. merged entries)
+            entries = self._resolution_state.ocr_registry
+            data = _registry_to_dict(entries)
+            self.storage.save("ocr_registry/registry", data)
         logger.debug(f"Saved OCR registry ({len(entries)} entries)")
 
     def load_ocr_registry(self) -> List[OCRRegistryEntry]:
         """Load OCR registry. Prefer state.json (source of truth), fallback to registry.json."""
         # C1: state.json is source of truth — load from it when available
-        state_data = self.storage.load("document_state/state", default=None)
-        if state_data is not None:
-            self._resolution_state = _resolution_state_from_dict(state_data)
-            return list(self._resolution_state.ocr_registry)
+        if self.storage.exists("document_state/state"):
+            return list(self.load_document_state().ocr_registry)
         data = self.storage.load("ocr_registry/registry", default=None)
         if data is None:
             return []
@@ -794,66 +2025,78 @@ class StateManager:
 
     def upsert_ocr_entries(self, entries: List[OCRRegistryEntry]) -> int:
         """Merge entries by entity_id. Update if exists, append if new. Skips empty entity_id (H2). Returns count of changed/added."""
-        # Ensure we have loaded state
-        if not self._resolution_state.ocr_registry and self.storage.exists(
-            "document_state/state"
-        ):
-            self.load_document_state()
-        elif not self._resolution_state.ocr_registry and self.storage.exists(
-            "ocr_registry/registry"
-        ):
-            self.load_ocr_registry()
-        registry = self._resolution_state.ocr_registry
-        by_id: Dict[str, int] = {e.entity_id: i for i, e in enumerate(registry)}
-        count = 0
-        for entry in entries:
-            if not entry.entity_id:
-                logger.warning("Skipping upsert for entry with empty entity_id")
-                continue
-            if entry.entity_id in by_id:
-                idx = by_id[entry.entity_id]
-                registry[idx] = entry
-                count += 1
-            else:
-                registry.append(entry)
-                by_id[entry.entity_id] = len(registry) - 1
-                count += 1
-        self.save_ocr_registry(registry)
-        return count
+        with self._write_lock:
+            if self._indexed:
+                changed = [e for e in entries if e.entity_id]
+                if len(changed) != len(entries):
+                    logger.warning("Skipping upsert for entry with empty entity_id")
+                if changed:
+                    self._record_change(
+                        {"op": "upsert", "entries": _registry_to_dict(changed)}
+                    )
+                return len(changed)
+            self._ensure_registry_loaded()
+            index = self._registry_index()
+            changed: List[OCRRegistryEntry] = []
+            for entry in entries:
+                if not entry.entity_id:
+                    logger.warning("Skipping upsert for entry with empty entity_id")
+                    continue
+                index.upsert(entry)
+                changed.append(entry)
+            if changed or not self._journal_enabled:
+                self._record_change(
+                    {"op": "upsert", "entries": _registry_to_dict(changed)}
+                )
+            return len(changed)
 
     def pending_entities(
         self, page_num: Optional[int] = None
     ) -> List[OCRRegistryEntry]:
         """Return entities with resolution < 1 (not yet resolved). Optionally filter by page_num."""
-        if not self._resolution_state.ocr_registry and self.storage.exists(
-            "document_state/state"
-        ):
-            self.load_document_state()
-        elif not self._resolution_state.ocr_registry and self.storage.exists(
-            "ocr_registry/registry"
-        ):
-            self.load_ocr_registry()
-        registry = self._resolution_state.ocr_registry
-        result = [e for e in registry if e.resolution < 1]
-        if page_num is not None:
-            result = [e for e in result if e.page_num == page_num]
-        return list(result)
+        if self._indexed:
+            rows = self.storage.query_registry(
+                page_nums=None if page_num is None else [page_num],
+                max_resolution=0,
+            )
+            return _registry_from_dict(rows)
+        self._ensure_registry_loaded()
+        return self._registry_index().select(
+            page_nums=None if page_num is None else [page_num], max_resolution=0
+        )
+
+    def entries_for_pages(self, page_nums: Iterable[int]) -> List[OCRRegistryEntry]:
+        """Return registry entries on the given pages (any resolution)."""
+        if self._indexed:
+            return _registry_from_dict(self.storage.query_registry(page_nums=page_nums))
+        self._ensure_registry_loaded()
+        return self._registry_index().select(page_nums=page_nums)
+
+    def get_ocr_entry(self, entity_id: str) -> Optional[OCRRegistryEntry]:
+        """Return the registry entry with `entity_id`, or None."""
+        if self._indexed:
+            rows = self.storage.query_registry(entity_ids=[entity_id])
+            return _registry_from_dict(rows)[0] if rows else None
+        self._ensure_registry_loaded()
+        return self._registry_index().get(entity_id)
 
     def set_page_resolution(self, page_num: int, status: PageResolution) -> None:
-        """Update page_states[page_num] and persist."""
-        if not self._resolution_state.page_states and self.storage.exists(
-            "document_state/state"
-        ):
-            self.load_document_state()
-        self._resolution_state.page_states[page_num] = status
-        self.save_document_state(self._resolution_state)
-        logger.debug(f"Set page {page_num} resolution to {status}")
+        """Update page_states[page_num] and persist (journal line or snapshot)."""
+        with self._write_lock:
+            if self._indexed:
+                self._record_change({"op": "page", "page_num": page_num, "status": status})
+                return
+            if self.storage.exists("document_state/state"):
+                self.load_document_state()
+            self._resolution_state.page_states[page_num] = status
+            self._record_change({"op": "page", "page_num": page_num, "status": status})
+            logger.debug(f"Set page {page_num} resolution to {status}")
 
     def page_status(self) -> Dict[int, PageResolution]:
         """Return copy of page_states."""
-        if not self._resolution_state.page_states and self.storage.exists(
-            "document_state/state"
-        ):
+        if self._indexed:
+            return self.storage.load_page_states()
+        if self.storage.exists("document_state/state"):
             self.load_document_state()
         return dict(self._resolution_state.page_states)
 
@@ -883,22 +2126,37 @@ class StateManager:
 def open_document(
     pdf_path: Path,
     workspace: Optional[Path],
+    backend: Optional[str] = None,
 ) -> tuple[StateManager, bool]:
     """Open document and return StateManager with appropriate backend.
 
     Args:
         pdf_path: Path to PDF file
         workspace: Workspace root directory, or None for memory-only
+        backend: "json" or "sqlite"; None reads WORKSPACE_BACKEND (default json).
+            A document that already has state.sqlite3 always opens with sqlite.
 
     Returns:
         (state_manager, loaded_existing_state) where loaded_existing_state is True
-        if document_dir and state.json existed before initialization
+        if document_dir and state.json (or state.sqlite3) existed before initialization
     """
     if workspace is None:
         return StateManager(MemoryStorage()), False
 
     ws = WorkspaceStorage.from_pdf(pdf_path, Path(workspace))
-    loaded_existing = ws.paths.document_dir.exists() and ws.paths.state_json.exists()
+    sqlite_path = ws.paths.document_dir / _SQLITE_FILENAME
+    kind = (backend or os.environ.get("WORKSPACE_BACKEND") or "json").strip().lower()
+    if sqlite_path.exists():
+        kind = "sqlite"
+    if kind not in ("json", "sqlite"):
+        logger.warning(f"Unknown workspace backend '{kind}', using json")
+        kind = "json"
+
+    loaded_existing = ws.paths.document_dir.exists() and (
+        ws.paths.state_json.exists() or sqlite_path.exists()
+    )
+    if kind == "sqlite":
+        ws.ensure_initialized(create_state_files=False)
+        return StateManager(SQLiteWorkspaceBackend(ws)), loaded_existing
     ws.ensure_initialized()
-    backend = WorkspaceBackend(ws)
-    return StateManager(backend), loaded_existing
+    return StateManager(WorkspaceBackend(ws)), loaded_existing
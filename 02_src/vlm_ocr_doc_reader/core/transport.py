@@ -0,0 +1,176 @@
+"""Pooled keep-alive HTTP transport shared by the DashScope clients.
+
+QwenOCRClient and QwenVLMClient used to call the module-level
+`requests.post`, which opens a new TCP+TLS connection for every request.
+HTTPTransport wraps one `requests.Session` whose urllib3 pool keeps
+connections alive across OCR chunks, scan batches and tool calls.
+
+The session only ever sends stateless POSTs with per-call headers and
+rejects cookies, so concurrent use from worker threads does not share any
+mutable request state beyond the (thread-safe) connection pool.
+
+The process-wide transport is sized once, when it is created, from the
+configured worker counts (env VLM_SCAN_MAX_WORKERS, OCR_MAX_WORKERS); a pass
+run with more workers than that still works, the extra connections are just
+not kept alive. ensure_pool_size() never swaps the adapter under requests
+in flight: a growth requested while busy is applied once the transport is idle.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+Timeout = Union[float, Tuple[float, float]]
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_CONNECT_TIMEOUT_SEC = 10.0
+
+# Env knobs whose worker counts the process-wide pool must cover
+_WORKER_ENV_VARS = ("VLM_SCAN_MAX_WORKERS", "OCR_MAX_WORKERS")
+
+
+class HTTPTransport:
+    """Thread-safe keep-alive POST transport over one requests.Session.
+
+    Args:
+        pool_size: Max idle keep-alive connections kept per host; should be
+            at least the number of threads issuing requests concurrently
+        connect_timeout_sec: Default TCP/TLS connect timeout for post()
+    """
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        connect_timeout_sec: float = DEFAULT_CONNECT_TIMEOUT_SEC,
+    ) -> None:
+        self.connect_timeout_sec = connect_timeout_sec
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+        self._session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        self.pool_size = 0
+        self._in_flight = 0
+        self._pending_pool_size = 0
+        self._mount(max(1, int(pool_size)))
+
+    def _mount(self, pool_size: int) -> None:
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self.pool_size = pool_size
+
+    def _grow(self, pool_size: int) -> None:
+        """Remount with a larger pool. Caller holds _lock and nothing is in flight."""
+        logger.debug(f"HTTP pool: {self.pool_size} -> {pool_size} connections")
+        self._mount(pool_size)
+
+    def ensure_pool_size(self, workers: int) -> None:
+        """Grow the connection pool to at least `workers` (never shrinks).
+
+        Replacing the adapter drops its connections, so while requests are
+        in flight the growth is deferred until the last of them finishes.
+        """
+        with self._lock:
+            if workers <= max(self.pool_size, self._pending_pool_size):
+                return
+            if self._in_flight:
+                self._pending_pool_size = workers
+            else:
+                self._grow(workers)
+
+    @contextmanager
+    def _request(self) -> Iterator[None]:
+        """Count a request in flight; apply a deferred pool growth when idle."""
+        with self._lock:
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                if not self._in_flight and self._pending_pool_size > self.pool_size:
+                    self._grow(self._pending_pool_size)
+
+    def post(
+        self,
+        url: str,
+        json: Any,
+        headers: Dict[str, str],
+        timeout: Timeout,
+    ) -> requests.Response:
+        """POST over the pooled session.
+
+        `timeout` is either (connect, read) seconds or a read timeout, in
+        which case connect_timeout_sec is used for the connect phase.
+        """
+        if not isinstance(timeout, tuple):
+            timeout = (self.connect_timeout_sec, timeout)
+        with self._request():
+            return self._session.post(url, json=json, headers=headers, timeout=timeout)
+
+    def preconnect(self, url: str) -> bool:
+        """Open a keep-alive connection to the host of `url` ahead of time.
+
+        Sends a HEAD to the origin; any HTTP status counts as connected.
+        Returns False on network errors (logged, never raised).
+        """
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}/"
+        try:
+            with self._request():
+                self._session.head(
+                    origin,
+                    timeout=(self.connect_timeout_sec, self.connect_timeout_sec),
+                    allow_redirects=False,
+                ).close()
+            logger.debug(f"HTTP preconnect: {origin} ok")
+            return True
+        except requests.RequestException as e:
+            logger.debug(f"HTTP preconnect: {origin} failed: {e}")
+            return False
+
+    def close(self) -> None:
+        self._session.close()
+
+
+_transport: Optional[HTTPTransport] = None
+_transport_lock = threading.Lock()
+
+
+def _pool_size_from_env() -> int:
+    """DEFAULT_POOL_SIZE, or the largest configured worker count if larger.
+
+    Invalid or non-positive env values are ignored.
+    """
+    size = DEFAULT_POOL_SIZE
+    for name in _WORKER_ENV_VARS:
+        try:
+            size = max(size, int(os.getenv(name, "").strip()))
+        except ValueError:
+            continue
+    return size
+
+
+def get_transport() -> HTTPTransport:
+    """Return the process-wide transport shared by all clients.
+
+    Created on first use with a pool covering the configured workers.
+    """
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = HTTPTransport(pool_size=_pool_size_from_env())
+        return _transport
+
+
+__all__ = ["HTTPTransport", "get_transport", "DEFAULT_CONNECT_TIMEOUT_SEC"]
@@ -11,6 +11,7 @@ import logging
 from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from ..preprocessing.encoding import image_mime
 from .vlm_client import BaseVLMClient
 
 logger = logging.getLogger(__name__)
@@ -23,12 +24,32 @@ def _user_parts(prompt: str, images: List[bytes]) -> List[Dict[str, Any]]:
         parts.append(
             {
                 "type": "image_url",
-                "image_url": {"url": f"data:image/png;base64,{b64}"},
+                "image_url": {"url": f"data:{image_mime(img)};base64,{b64}"},
             }
         )
     return parts
 
 
+def _content_bytes(messages: List[Dict[str, Any]]) -> int:
+    """Bytes of the text parts and image data URLs of `messages`.
+
+    Approximates the request body size (JSON framing is not counted)
+    without serializing the base64 images a second time.
+    """
+    total = 0
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, str):
+            total += len(content.encode("utf-8"))
+            continue
+        for part in content or []:
+            if part.get("type") == "image_url":
+                total += len(part["image_url"]["url"])  # base64 data URL is ASCII
+            else:
+                total += len((part.get("text") or "").encode("utf-8"))
+    return total
+
+
 class VLMAgent:
     """Conversation-aware VLM agent with tool-calling loop."""
 
@@ -66,13 +87,17 @@ class VLMAgent:
         self.messages = [{"role": "system", "content": prompt}]
         logger.debug("System prompt set")
 
-    def _append_user(self, prompt: str, images: List[bytes]) -> None:
+    @staticmethod
+    def _user_message(prompt: str, images: List[bytes]) -> Dict[str, Any]:
         content: Any
         if images:
             content = _user_parts(prompt, images)
         else:
             content = prompt
-        self.messages.append({"role": "user", "content": content})
+        return {"role": "user", "content": content}
+
+    def _append_user(self, prompt: str, images: List[bytes]) -> None:
+        self.messages.append(self._user_message(prompt, images))
 
     def invoke(self, prompt: str, images: List[bytes]) -> Dict[str, Any]:
         """Tool-calling loop until model returns text (final answer) or limit hit."""
@@ -166,6 +191,35 @@ class VLMAgent:
             logger.error(f"VLM invoke_no_tools failed: {e}")
             return {"text": None, "error": str(e)}
 
+    def invoke_stateless(self, prompt: str, images: List[bytes]) -> Dict[str, Any]:
+        """Single-turn call without tools that does NOT touch history.
+
+        Sends only the system prompt (if set) plus this user turn, so request
+        size stays flat no matter how many calls came before. Safe to call
+        from several threads once the system prompt is set.
+
+        Returns:
+            {"text": str | None, "usage": dict | None, "request_bytes": int,
+             "error": str (only on failure)}; request_bytes counts prompt
+            text and image data URLs, not JSON framing
+        """
+        messages: List[Dict[str, Any]] = [
+            m for m in self.messages[:1] if m.get("role") == "system"
+        ]
+        messages.append(self._user_message(prompt, images))
+        request_bytes = _content_bytes(messages)
+        try:
+            response = self.vlm_client.invoke(messages=messages, tools=None)
+        except Exception as e:
+            logger.error(f"VLM invoke_stateless failed: {e}")
+            return {"text": None, "error": str(e), "request_bytes": request_bytes}
+        msg = response.get("message") or {}
+        return {
+            "text": msg.get("content") or "",
+            "usage": response.get("usage"),
+            "request_bytes": request_bytes,
+        }
+
     @staticmethod
     def _parse_args(raw: str) -> Dict[str, Any]:
         if not raw:
@@ -1,5 +1,14 @@
 """Preprocessing module for document rendering and page preparation."""
 
-from .renderer import PDFRenderer, RenderConfig
+from .encoding import ImageEncoding, encode_image, image_mime
+from .renderer import RENDERER_VERSION, PDFRenderer, RenderConfig, page_content_digest
 
-__all__ = ["PDFRenderer", "RenderConfig"]
+__all__ = [
+    "PDFRenderer",
+    "RenderConfig",
+    "RENDERER_VERSION",
+    "page_content_digest",
+    "ImageEncoding",
+    "encode_image",
+    "image_mime",
+]
@@ -0,0 +1,139 @@
+"""Payload image encodings for VLM/OCR requests.
+
+Pages are stored as lossless PNG (the render master). Before a page is sent
+to an API it can be re-encoded to a more compact form: JPEG or WebP with a
+quality setting, grayscale, or PNG with a chosen compression level.
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Optional, Tuple
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+
+_MIME_BY_FORMAT = {
+    "PNG": "image/png",
+    "JPEG": "image/jpeg",
+    "WEBP": "image/webp",
+}
+
+
+@dataclass
+class ImageEncoding:
+    """Output encoding for page images sent to an API.
+
+    Attributes:
+        format: "PNG", "JPEG" or "WEBP" (case-insensitive, "JPG" accepted)
+        quality: JPEG/WebP quality 1-100 (ignored for PNG)
+        grayscale: Convert to 8-bit grayscale before encoding
+        png_compress_level: zlib level 0-9 for PNG (None: keep source bytes
+            when nothing else changes, else Pillow default 6)
+    """
+    format: str = "PNG"
+    quality: int = 85
+    grayscale: bool = False
+    png_compress_level: Optional[int] = None
+
+    def __post_init__(self):
+        fmt = self.format.strip().upper()
+        if fmt == "JPG":
+            fmt = "JPEG"
+        if fmt not in _MIME_BY_FORMAT:
+            raise ValueError(
+                f"Unsupported image format {self.format!r}; "
+                f"expected one of {sorted(_MIME_BY_FORMAT)}"
+            )
+        self.format = fmt
+        if not 1 <= self.quality <= 100:
+            raise ValueError(f"quality must be in 1..100, got {self.quality}")
+        if self.png_compress_level is not None and not 0 <= self.png_compress_level <= 9:
+            raise ValueError(
+                f"png_compress_level must be in 0..9, got {self.png_compress_level}"
+            )
+
+    @property
+    def mime(self) -> str:
+        return _MIME_BY_FORMAT[self.format]
+
+    @property
+    def is_passthrough(self) -> bool:
+        """True if PNG input can be sent as is."""
+        return (
+            self.format == "PNG"
+            and not self.grayscale
+            and self.png_compress_level is None
+        )
+
+    @classmethod
+    def from_env(cls, prefix: str) -> Optional["ImageEncoding"]:
+        """Build from env {prefix}_FORMAT/_QUALITY/_GRAYSCALE/_PNG_LEVEL.
+
+        Returns None when none of the variables is set (keep PNG as is).
+        Invalid values are logged and replaced by defaults.
+        """
+        fmt = os.getenv(f"{prefix}_FORMAT", "").strip()
+        quality = os.getenv(f"{prefix}_QUALITY", "").strip()
+        grayscale = os.getenv(f"{prefix}_GRAYSCALE", "").strip()
+        png_level = os.getenv(f"{prefix}_PNG_LEVEL", "").strip()
+        if not (fmt or quality or grayscale or png_level):
+            return None
+
+        kwargs = {"grayscale": grayscale.lower() in ("1", "true", "yes", "on")}
+        if fmt:
+            kwargs["format"] = fmt
+        try:
+            if quality:
+                kwargs["quality"] = int(quality)
+            if png_level:
+                kwargs["png_compress_level"] = int(png_level)
+            return cls(**kwargs)
+        except ValueError as e:
+            logger.warning(f"Invalid {prefix}_* image encoding ({e}), using PNG")
+            return None
+
+
+def image_mime(image: bytes) -> str:
+    """Detect MIME type of encoded image bytes by magic number (default PNG)."""
+    if image[:3] == b"\xff\xd8\xff":
+        return "image/jpeg"
+    if image[:4] == b"RIFF" and image[8:12] == b"WEBP":
+        return "image/webp"
+    return "image/png"
+
+
+def encode_image(
+    image: bytes,
+    encoding: Optional[ImageEncoding],
+) -> Tuple[bytes, str]:
+    """Re-encode stored page image bytes for an API payload.
+
+    Args:
+        image: Encoded source image (normally the stored PNG)
+        encoding: Target encoding, or None to send the source bytes unchanged
+
+    Returns:
+        (encoded_bytes, mime_type)
+    """
+    if encoding is None or (encoding.is_passthrough and image_mime(image) == "image/png"):
+        return image, image_mime(image)
+
+    img = Image.open(BytesIO(image))
+    if encoding.grayscale:
+        img = img.convert("L")
+    elif img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+
+    buf = BytesIO()
+    if encoding.format == "JPEG":
+        img.save(buf, format="JPEG", quality=encoding.quality, optimize=True)
+    elif encoding.format == "WEBP":
+        img.save(buf, format="WEBP", quality=encoding.quality)
+    else:
+        level = 6 if encoding.png_compress_level is None else encoding.png_compress_level
+        img.save(buf, format="PNG", compress_level=level)
+    return buf.getvalue(), encoding.mime
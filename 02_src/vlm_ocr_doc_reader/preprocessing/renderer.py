@@ -1,10 +1,13 @@
 """PDF Renderer for converting PDF pages to PNG images."""
 
-import io
+import hashlib
 import logging
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Deque, Iterator, List, Optional, Tuple
 
 import fitz  # pymupdf
 from PIL import Image, ImageDraw, ImageFont
@@ -12,13 +15,112 @@ from PIL import Image, ImageDraw, ImageFont
 logger = logging.getLogger(__name__)
 
 
+# Bump when rasterization, stamping or encoding changes the output bytes:
+# pages cached in a workspace under an older version are re-rendered.
+RENDERER_VERSION = 2
+
+
 @dataclass
 class RenderConfig:
     """Configuration for PDF rendering."""
 
     dpi: int = 150
-    quality: int = 85  # Not used for PNG, kept for compatibility
+    quality: int = 85  # Stored pages are PNG; payload quality: ImageEncoding
     format: str = "PNG"
+    workers: int = 1  # >1: render_pdf uses a process pool
+
+
+# Pages per task sent to a worker process. Small enough to keep all workers
+# busy and stream results early, large enough to amortize fitz.open().
+_PAGES_PER_TASK = 4
+
+# Widest marker label: page_content_digest blanks its tile on every page
+_MARKER_MASK_LABEL = "[G999999]"
+
+
+@lru_cache(maxsize=None)
+def _marker_font(size: int = 24) -> ImageFont.ImageFont:
+    """Load the page-marker font once per process (arial → DejaVu → default)."""
+    try:
+        return ImageFont.truetype("arial.ttf", size)
+    except OSError:
+        try:
+            return ImageFont.truetype(
+                "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", size
+            )
+        except OSError:
+            return ImageFont.load_default()
+
+
+def _marker_tile_size(label: str, width: int, height: int) -> Tuple[int, int]:
+    """Size of the top-left tile that holds the stamped `label` and its border."""
+    left, top, right, bottom = _marker_font().getbbox(label)
+    # Marker is drawn at (6, 6) with 4px padding; keep a margin for the border
+    tile_w = min(width, 6 + max(right, right - left) + 8)
+    tile_h = min(height, 6 + max(bottom, bottom - top) + 8)
+    return tile_w, tile_h
+
+
+def page_content_digest(image: bytes) -> str:
+    """Digest of a rendered page with its [G{N}] marker corner blanked.
+
+    The same page gets the same digest whatever page number it was stamped
+    with, in this or another document. Images fitz cannot decode are hashed
+    as is.
+    """
+    try:
+        pix = fitz.Pixmap(bytes(image))
+    except Exception:
+        return hashlib.sha256(image).hexdigest()
+    tile_w, tile_h = _marker_tile_size(_MARKER_MASK_LABEL, pix.width, pix.height)
+    pix.set_rect(fitz.IRect(0, 0, tile_w, tile_h), (255,) * pix.n)
+    h = hashlib.sha256(f"{pix.width}x{pix.height}x{pix.n}".encode("ascii"))
+    h.update(pix.samples_mv)
+    return h.hexdigest()
+
+
+def _stamp_pixmap(pix: "fitz.Pixmap", page_num: int, total_pages: int) -> None:
+    """Stamp [G{page_num}] onto an RGB pixmap in place.
+
+    Only the small top-left tile under the marker is copied out of the
+    pixmap (via the zero-copy samples_mv view), drawn with PIL and copied
+    back, so the full page never round-trips through PIL.
+    """
+    tile_w, tile_h = _marker_tile_size(f"[G{page_num}]", pix.width, pix.height)
+
+    n, stride, mv = pix.n, pix.stride, pix.samples_mv
+    rows = [mv[r * stride:r * stride + tile_w * n] for r in range(tile_h)]
+    tile = Image.frombytes("RGB", (tile_w, tile_h), b"".join(rows))
+
+    PDFRenderer._stamp_page_number(tile, page_num, total_pages)
+
+    stamped = fitz.Pixmap(fitz.csRGB, tile_w, tile_h, tile.tobytes(), False)
+    pix.copy(stamped, stamped.irect)
+
+
+def _render_doc_page(doc: "fitz.Document", idx: int, dpi: int) -> bytes:
+    """Rasterize, stamp and PNG-encode page `idx` (0-based) of an open document.
+
+    Stays on the fitz pixmap end to end: stamping touches only the marker
+    tile and PNG encoding is done by fitz.
+    """
+    page = doc.load_page(idx)
+    pix = page.get_pixmap(dpi=dpi, alpha=False)
+    _stamp_pixmap(pix, idx + 1, len(doc))
+    return pix.tobytes("png")
+
+
+def _render_range_worker(
+    pdf_path: str,
+    page_indices: List[int],
+    dpi: int,
+) -> List[Tuple[int, bytes]]:
+    """Process-pool task: open own fitz document, render a disjoint page range."""
+    doc = fitz.open(pdf_path)
+    try:
+        return [(idx + 1, _render_doc_page(doc, idx, dpi)) for idx in page_indices]
+    finally:
+        doc.close()
 
 
 class PDFRenderer:
@@ -32,6 +134,30 @@ class PDFRenderer:
         """
         self.config = config
 
+    def render_info(self) -> dict:
+        """Parameters that determine output bytes, used as the render cache key."""
+        return {
+            "dpi": self.config.dpi,
+            "format": self.config.format,
+            "renderer": RENDERER_VERSION,
+        }
+
+    @staticmethod
+    def page_count(pdf_path: Path) -> int:
+        """Return number of pages without rendering anything.
+
+        Args:
+            pdf_path: Path to PDF file
+
+        Returns:
+            Total page count
+        """
+        doc = fitz.open(pdf_path)
+        try:
+            return len(doc)
+        finally:
+            doc.close()
+
     def render_pdf(
         self,
         pdf_path: Path,
@@ -47,53 +173,84 @@ class PDFRenderer:
             List of (page_num, image_bytes) tuples
             page_num is 1-based for user convenience
         """
-        doc = fitz.open(pdf_path)
-        try:
-            total_pages = len(doc)
-
-            if page_indices is None:
-                page_indices = list(range(total_pages))
-
-            logger.info(
-                f"Rendering {len(page_indices)} pages from {pdf_path} "
-                f"(Total pages: {total_pages}, DPI: {self.config.dpi})"
-            )
-
-            results: List[Tuple[int, bytes]] = []
-
-            for idx in page_indices:
-                if idx < 0 or idx >= total_pages:
-                    logger.warning(f"Invalid page index {idx}, skipping")
-                    continue
-
-                page = doc.load_page(idx)
-                pix = page.get_pixmap(dpi=self.config.dpi)
-
-                # Determine image mode based on alpha channel
-                mode = "RGB" if pix.alpha == 0 else "RGBA"
-                img = Image.frombytes(mode, [pix.width, pix.height], pix.samples)
+        results = list(self.iter_render_pdf(pdf_path, page_indices))
+        logger.info(f"Successfully rendered {len(results)} pages")
+        return results
 
-                # Convert RGBA to RGB for consistency
-                if mode == "RGBA":
-                    img = img.convert("RGB")
-
-                # Stamp page number onto image
-                page_num = idx + 1
-                self._stamp_page_number(img, page_num, total_pages)
+    def iter_render_pdf(
+        self,
+        pdf_path: Path,
+        page_indices: Optional[List[int]] = None,
+    ) -> Iterator[Tuple[int, bytes]]:
+        """Render PDF pages, yielding (page_num, image_bytes) in page order.
 
-                # Save as PNG bytes
-                buf = io.BytesIO()
-                img.save(buf, format="PNG")
-                image_bytes = buf.getvalue()
+        With config.workers > 1 pages are split into disjoint ranges rendered
+        by worker processes, each with its own fitz document. Results are
+        still yielded in the order of `page_indices` as soon as the head
+        range is done. At most 2 x workers ranges are in flight, so a slow
+        consumer does not make the whole document pile up in memory; closing
+        the generator early cancels the ranges not yet started.
 
-                # Return 1-based page number for user convenience
-                results.append((page_num, image_bytes))
+        Args:
+            pdf_path: Path to PDF file
+            page_indices: List of page indices (0-based), None = all pages
 
-            logger.info(f"Successfully rendered {len(results)} pages")
-            return results
+        Yields:
+            (page_num, image_bytes) with 1-based page_num
+        """
+        total_pages = self.page_count(pdf_path)
+        if page_indices is None:
+            page_indices = list(range(total_pages))
+
+        valid: List[int] = []
+        for idx in page_indices:
+            if idx < 0 or idx >= total_pages:
+                logger.warning(f"Invalid page index {idx}, skipping")
+                continue
+            valid.append(idx)
+
+        workers = min(max(1, self.config.workers), len(valid))
+        logger.info(
+            f"Rendering {len(valid)} pages from {pdf_path} "
+            f"(Total pages: {total_pages}, DPI: {self.config.dpi}, workers: {workers})"
+        )
 
+        if workers <= 1:
+            doc = fitz.open(pdf_path)
+            try:
+                for idx in valid:
+                    # Return 1-based page number for user convenience
+                    yield idx + 1, _render_doc_page(doc, idx, self.config.dpi)
+            finally:
+                doc.close()
+            return
+
+        ranges = [
+            valid[i:i + _PAGES_PER_TASK] for i in range(0, len(valid), _PAGES_PER_TASK)
+        ]
+        pending = iter(ranges)
+        window = 2 * workers
+        pool = ProcessPoolExecutor(max_workers=workers)
+        try:
+            in_flight: Deque[Future] = deque()
+            for rng in pending:
+                in_flight.append(
+                    pool.submit(_render_range_worker, str(pdf_path), rng, self.config.dpi)
+                )
+                if len(in_flight) >= window:
+                    break
+            while in_flight:
+                # Drop the head future before yielding so its pages can be freed
+                pages = in_flight.popleft().result()
+                rng = next(pending, None)
+                if rng is not None:
+                    in_flight.append(
+                        pool.submit(_render_range_worker, str(pdf_path), rng, self.config.dpi)
+                    )
+                yield from pages
+                del pages
         finally:
-            doc.close()
+            pool.shutdown(wait=True, cancel_futures=True)
 
     def render_page(
         self,
@@ -134,21 +291,7 @@ class PDFRenderer:
                 f"(DPI: {render_dpi})"
             )
 
-            page = doc.load_page(page_idx)
-            pix = page.get_pixmap(dpi=render_dpi)
-
-            mode = "RGB" if pix.alpha == 0 else "RGBA"
-            img = Image.frombytes(mode, [pix.width, pix.height], pix.samples)
-
-            if mode == "RGBA":
-                img = img.convert("RGB")
-
-            # Stamp page number onto image
-            self._stamp_page_number(img, page_num, total_pages)
-
-            buf = io.BytesIO()
-            img.save(buf, format="PNG")
-            image_bytes = buf.getvalue()
+            image_bytes = _render_doc_page(doc, page_idx, render_dpi)
 
             logger.info(
                 f"Successfully rendered page {page_num} "
@@ -175,16 +318,7 @@ class PDFRenderer:
         label = f"[G{page_num}]"
 
         draw = ImageDraw.Draw(img)
-
-        try:
-            font = ImageFont.truetype("arial.ttf", 24)
-        except OSError:
-            try:
-                font = ImageFont.truetype(
-                    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 24
-                )
-            except OSError:
-                font = ImageFont.load_default()
+        font = _marker_font()
 
         # Measure text
         bbox = draw.textbbox((0, 0), label, font=font)
@@ -1,7 +1,7 @@
 """Data schemas for VLM OCR Document Reader."""
 
 from .document import DocumentData, HeaderInfo, TableInfo
-from .common import PageInfo, ClusterInfo, TriageResult
+from .common import PageInfo, LazyPageInfo, ClusterInfo, TriageResult
 from .config import VLMConfig, ProcessorConfig, OCRConfig
 
 __all__ = [
@@ -9,6 +9,7 @@ __all__ = [
     "HeaderInfo",
     "TableInfo",
     "PageInfo",
+    "LazyPageInfo",
     "ClusterInfo",
     "TriageResult",
     "VLMConfig",
@@ -1,7 +1,7 @@
 """Common data schemas."""
 
-from dataclasses import dataclass
-from typing import List, Dict, Any
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Callable, Optional
 
 
 @dataclass
@@ -13,7 +13,36 @@ class PageInfo:
         image: Page image as PNG bytes
     """
     index: int
-    image: bytes
+    image: bytes = field(repr=False)
+
+
+class LazyPageInfo(PageInfo):
+    """PageInfo whose image is fetched from storage on each access (not kept).
+
+    Page lists handed out for storage-backed documents stay small; the
+    storage backend remains the single owner of page images. Comparing or
+    printing a LazyPageInfo never loads the image.
+
+    Args:
+        index: Page number (1-based)
+        loader: Callable page_num -> image bytes (e.g. StateManager.load_page)
+    """
+
+    def __init__(self, index: int, loader: Callable[[int], Optional[bytes]]) -> None:
+        self.index = index
+        self.loader = loader
+
+    @property
+    def image(self) -> Optional[bytes]:
+        return self.loader(self.index)
+
+    def __repr__(self) -> str:
+        return f"LazyPageInfo(index={self.index})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, LazyPageInfo):
+            return NotImplemented
+        return (self.index, self.loader) == (other.index, other.loader)
 
 
 @dataclass
@@ -6,6 +6,7 @@ from typing import Optional
 
 # Import OCRConfig from ocr_client module
 from ..core.ocr_client import OCRConfig
+from ..core.transport import DEFAULT_CONNECT_TIMEOUT_SEC
 
 
 @dataclass
@@ -15,14 +16,16 @@ class VLMConfig:
     Attributes:
         api_key: DashScope API key (Qwen VLM)
         model: Model name (default: qwen3-vl-flash)
-        timeout_sec: Request timeout in seconds
+        timeout_sec: Read timeout in seconds
+        connect_timeout_sec: TCP/TLS connect timeout in seconds
         max_retries: Maximum number of retry attempts
-        backoff_base: Base for exponential backoff calculation
+        backoff_base: Growth factor of the jittered backoff (see RetryPolicy)
         min_interval_s: Minimum interval between requests (throttling)
     """
     api_key: str
     model: str = "qwen3-vl-flash"
     timeout_sec: int = 120
+    connect_timeout_sec: float = DEFAULT_CONNECT_TIMEOUT_SEC
     max_retries: int = 3
     backoff_base: float = 1.5
     min_interval_s: float = 0.6
@@ -36,11 +39,13 @@ class ProcessorConfig:
         state_dir: Directory for state persistence (optional)
         auto_save: Automatically save state after operations
         render_dpi: DPI for PDF rendering (default: 150)
+        render_workers: Worker processes for PDF rendering (default: 1)
         log_level: Logging level (default: INFO)
     """
     state_dir: Optional[Path] = None
     auto_save: bool = True
     render_dpi: int = 150
+    render_workers: int = 1
     log_level: str = "INFO"
     max_tool_workers: int = 5
     max_iterations: int = 100
@@ -0,0 +1,84 @@
+"""Benchmark PDFRenderer throughput: pages/sec for different worker counts.
+
+Renders the same PDF with RenderConfig(workers=N) for each N and prints a
+markdown-ish summary. Without --pdf a synthetic text-dense document is
+generated so runs are comparable across machines.
+
+Usage:
+  python scripts/bench_render.py --pages 100 --workers 1,2,4
+  python scripts/bench_render.py --pdf contract.pdf --workers 1,4 --dpi 150
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "02_src"))
+
+import fitz  # noqa: E402
+
+from vlm_ocr_doc_reader.preprocessing.renderer import PDFRenderer, RenderConfig  # noqa: E402
+
+
+def make_synthetic_pdf(path: Path, pages: int) -> None:
+    """A4 pages filled with small text lines, roughly like a scanned contract."""
+    doc = fitz.open()
+    for n in range(pages):
+        page = doc.new_page(width=595, height=842)
+        for line in range(60):
+            page.insert_text(
+                (40, 40 + line * 13),
+                f"Страница {n + 1}, строка {line + 1}: ИНН 7704123456, "
+                f"ОГРН 1027700132195, https://example.com/doc/{n}/{line}",
+                fontsize=8,
+                fontname="helv",
+            )
+    doc.save(path)
+    doc.close()
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pdf", type=Path, default=None, help="PDF to render (default: synthetic)")
+    ap.add_argument("--pages", type=int, default=100, help="synthetic document size")
+    ap.add_argument("--dpi", type=int, default=150)
+    ap.add_argument("--workers", type=str, default="1,2,4", help="comma-separated worker counts")
+    args = ap.parse_args()
+
+    workers_list = [int(w) for w in args.workers.split(",") if w.strip()]
+    if not workers_list:
+        print("Empty workers list", file=sys.stderr)
+        return 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = args.pdf
+        if pdf_path is None:
+            pdf_path = Path(tmp) / "synthetic.pdf"
+            make_synthetic_pdf(pdf_path, args.pages)
+        total = PDFRenderer.page_count(pdf_path)
+        print(f"pdf={pdf_path.name} pages={total} dpi={args.dpi} cpus={os.cpu_count()}")
+
+        rows = []
+        for w in workers_list:
+            renderer = PDFRenderer(RenderConfig(dpi=args.dpi, workers=w))
+            t0 = time.perf_counter()
+            n = sum(1 for _ in renderer.iter_render_pdf(pdf_path))
+            dt = time.perf_counter() - t0
+            rows.append((w, n, dt))
+            print(f"  workers={w}: {n} pages in {dt:.2f}s", flush=True)
+
+    base = rows[0][2]
+    print(f"\n{'workers':>8} {'time_s':>8} {'pages/s':>8} {'speedup':>8}")
+    for w, n, dt in rows:
+        print(f"{w:>8} {dt:>8.2f} {n / dt:>8.1f} {base / dt:>7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""Benchmark page rendering paths: legacy PIL round trip vs pixmap fast path.
+
+  legacy  — pix.samples -> PIL image, ImageDraw marker with the font resolved
+            from disk on every page, PIL PNG encode (the pre-fast-path code)
+  pixmap  — PDFRenderer: marker drawn on a small tile of the pixmap, font
+            loaded once, PNG encoded by fitz
+
+Each path runs in a fresh subprocess so peak RSS (ru_maxrss) is not shared.
+Without --pdf a synthetic text-dense document of --pages pages is used.
+
+Usage:
+  python scripts/bench_render_paths.py --pages 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "02_src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import fitz  # noqa: E402
+from PIL import Image, ImageDraw, ImageFont  # noqa: E402
+
+
+def legacy_render(doc: "fitz.Document", idx: int, dpi: int) -> bytes:
+    """Pre-fast-path rendering, kept here only as the benchmark baseline."""
+    pix = doc.load_page(idx).get_pixmap(dpi=dpi)
+    img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+    label = f"[G{idx + 1}]"
+    draw = ImageDraw.Draw(img)
+    try:
+        font = ImageFont.truetype("arial.ttf", 24)
+    except OSError:
+        try:
+            font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 24)
+        except OSError:
+            font = ImageFont.load_default()
+    bbox = draw.textbbox((0, 0), label, font=font)
+    x, y, padding = 6, 6, 4
+    draw.rectangle(
+        [x - padding, y - padding, x + bbox[2] - bbox[0] + padding, y + bbox[3] - bbox[1] + padding],
+        fill="white", outline="black", width=1,
+    )
+    draw.text((x, y), label, fill="black", font=font)
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def run_path(path: str, pdf: str, dpi: int) -> dict:
+    from vlm_ocr_doc_reader.preprocessing.renderer import _render_doc_page
+
+    render = legacy_render if path == "legacy" else _render_doc_page
+    doc = fitz.open(pdf)
+    try:
+        t0 = time.perf_counter()
+        total_bytes = sum(len(render(doc, i, dpi)) for i in range(len(doc)))
+        dt = time.perf_counter() - t0
+        pages = len(doc)
+    finally:
+        doc.close()
+    return {
+        "path": path,
+        "pages": pages,
+        "ms_per_page": dt * 1000 / pages,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "avg_png_kb": total_bytes / pages / 1024,
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pdf", type=Path, default=None, help="PDF to render (default: synthetic)")
+    ap.add_argument("--pages", type=int, default=100, help="synthetic document size")
+    ap.add_argument("--dpi", type=int, default=150)
+    ap.add_argument("--child", type=str, default=None, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        print(json.dumps(run_path(args.child, str(args.pdf), args.dpi)))
+        return 0
+
+    from bench_render import make_synthetic_pdf
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = args.pdf
+        if pdf_path is None:
+            pdf_path = Path(tmp) / "synthetic.pdf"
+            make_synthetic_pdf(pdf_path, args.pages)
+
+        rows = []
+        for path in ("legacy", "pixmap"):
+            out = subprocess.run(
+                [sys.executable, __file__, "--pdf", str(pdf_path),
+                 "--dpi", str(args.dpi), "--child", path],
+                check=True, capture_output=True, text=True,
+            )
+            rows.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    print(f"pages={rows[0]['pages']} dpi={args.dpi}")
+    print(f"{'path':>8} {'ms/page':>8} {'peak_rss_mb':>12} {'avg_png_kb':>11}")
+    for r in rows:
+        print(
+            f"{r['path']:>8} {r['ms_per_page']:>8.1f} "
+            f"{r['peak_rss_mb']:>12.1f} {r['avg_png_kb']:>11.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
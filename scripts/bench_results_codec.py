@@ -0,0 +1,117 @@
+"""Benchmark results codecs: save/load time and file size of a large result.
+
+Builds a synthetic full_description result (text + headers + tables, sized
+like a scanned document of --pages pages) and writes/reads it through
+DiskStorage with each available codec. "yaml (legacy)" is the previous
+pure-Python yaml.dump / yaml.safe_load path for reference.
+
+Usage:
+  python scripts/bench_results_codec.py --pages 1000
+  python scripts/bench_results_codec.py --pages 1000 --codecs json,msgpack+zstd
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "02_src"))
+
+import yaml  # noqa: E402
+
+from vlm_ocr_doc_reader.core.results_codec import ResultsCodec  # noqa: E402
+from vlm_ocr_doc_reader.core.state import DiskStorage  # noqa: E402
+
+ALL_CODECS = "json,json+gzip,json+zstd,msgpack,msgpack+gzip,msgpack+zstd,yaml"
+
+
+def make_result(pages: int) -> dict:
+    """About 3KB of text and 3 headers per page, one small table every 10 pages."""
+    text_chunks = []
+    headers = []
+    tables = []
+    for n in range(1, pages + 1):
+        text_chunks.append(
+            "\n".join(
+                f"Страница {n}, абзац {p}: Поставщик обязуется передать товар "
+                f"по договору № {n}-{p} от 01.02.2024, ИНН 7704123456, сумма {n * p * 1000} руб."
+                for p in range(1, 25)
+            )
+        )
+        for level in (1, 2, 2):
+            headers.append({"level": level, "title": f"Раздел {n}.{level}", "page": n})
+        if n % 10 == 0:
+            tables.append(
+                {"page": n, "rows": [[f"r{r}c{c}" for c in range(6)] for r in range(12)]}
+            )
+    return {"text": "\n\n".join(text_chunks), "structure": {"headers": headers}, "tables": tables}
+
+
+def bench_legacy_yaml(root: Path, result: dict, repeat: int) -> tuple[float, float, int]:
+    path = root / "legacy.yaml"
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        with path.open("w", encoding="utf-8") as f:
+            yaml.dump(result, f, allow_unicode=True, default_flow_style=False)
+    save_s = (time.perf_counter() - t0) / repeat
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        with path.open("r", encoding="utf-8") as f:
+            assert yaml.safe_load(f) == result
+    load_s = (time.perf_counter() - t0) / repeat
+    return save_s, load_s, path.stat().st_size
+
+
+def bench_codec(root: Path, codec: ResultsCodec, result: dict, repeat: int) -> tuple[float, float, int]:
+    storage = DiskStorage(root / codec.extension.strip("."), results_codec=codec)
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        storage.save("results/full_description", result)
+    save_s = (time.perf_counter() - t0) / repeat
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        assert storage.load("results/full_description") == result
+    load_s = (time.perf_counter() - t0) / repeat
+    size = (storage.results_dir / f"full_description{codec.extension}").stat().st_size
+    return save_s, load_s, size
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", type=int, default=1000, help="synthetic document size")
+    ap.add_argument("--codecs", type=str, default=ALL_CODECS, help="comma-separated codec specs")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    result = make_result(args.pages)
+    print(
+        f"pages={args.pages} text={len(result['text']) / 1e6:.1f}M chars "
+        f"headers={len(result['structure']['headers'])} tables={len(result['tables'])}"
+    )
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        rows.append(("yaml (legacy)", *bench_legacy_yaml(root, result, args.repeat)))
+        print(f"  yaml (legacy): done", flush=True)
+        for spec in [s.strip() for s in args.codecs.split(",") if s.strip()]:
+            try:
+                codec = ResultsCodec.parse(spec)
+            except ImportError as e:
+                print(f"  {spec}: skipped ({e})")
+                continue
+            rows.append((spec, *bench_codec(root, codec, result, args.repeat)))
+            print(f"  {spec}: done", flush=True)
+
+    print(f"\n{'codec':>14} {'save_s':>8} {'load_s':>8} {'size_kb':>9}")
+    for name, save_s, load_s, size in rows:
+        print(f"{name:>14} {save_s:>8.3f} {load_s:>8.3f} {size / 1024:>9.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -39,6 +39,8 @@ def reset_registry(state_path: Path) -> None:
     state_path.write_text(
         json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8"
     )
+    # Pending journal records would be replayed over the reset state
+    state_path.with_name("state.journal.jsonl").unlink(missing_ok=True)
 
 
 def snapshot(state_path: Path) -> dict: